@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Vectorized Monte Carlo battle simulator
+Reproduces scripts/simulation/battle_simulator.gd (_apply_battle_variations, _simulate_round and
+the best-of rounds loop) for N fights at once with NumPy.
+Run: python battle_sim.py [--fights N] [--seed S] [--f1 power,technique,defense,speed] [--f2 ...]
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ NumPy is required for the battle simulator: pip install numpy")
+    raise
+
+FINISHING_MOVES = ("combo", "special", "super", "throw", "counter")
+# Fights per RNG stream; each block draws from its own stream so fight i gets the same
+# random numbers whatever N is or how the work is split
+BLOCK_SIZE = 1 << 16
+STAT_NAMES = ("power", "technique", "defense", "speed")
+DAMAGE_BINS = 64
+ROUND_TIME_BINS = 30
+
+
+def _block_generator(seed, block):
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(block,))))
+
+
+def _stat_arrays(stats, n):
+    """Broadcast a fighter's stats (scalars or per-fight arrays) to int64 arrays of length n"""
+    missing = [name for name in STAT_NAMES if name not in stats]
+    if missing:
+        raise ValueError(f"fighter stats missing {', '.join(missing)}")
+    return {name: np.broadcast_to(np.asarray(stats[name], dtype=np.float64), (n,)) for name in STAT_NAMES}
+
+
+def _simulate_block(f1, f2, rng, size, rounds_to_win, max_rounds):
+    """Simulate `size` fights with draws from `rng`; f1/f2 are stat arrays of length size"""
+    # _apply_battle_variations: one condition multiplier per fighter per battle, int() truncation
+    f1_condition = rng.uniform(0.85, 1.15, size)
+    f2_condition = rng.uniform(0.85, 1.15, size)
+    f1s = {name: np.trunc(f1[name] * f1_condition).astype(np.int64) for name in STAT_NAMES}
+    f2s = {name: np.trunc(f2[name] * f2_condition).astype(np.int64) for name in STAT_NAMES}
+    f1_power = f1s["power"] + f1s["technique"]
+    f2_power = f2s["power"] + f2s["technique"]
+    f1_defense = f1s["defense"] + f1s["speed"]
+    f2_defense = f2s["defense"] + f2s["speed"]
+
+    # Every round has a winner, so no battle lasts more than 2 * rounds_to_win - 1 rounds
+    rounds = max(1, min(max_rounds, 2 * rounds_to_win - 1))
+    shape = (rounds, size)
+    f1_advantage = f1_power + rng.integers(-20, 21, shape, dtype=np.int16) \
+        - (f2_defense + rng.integers(-15, 16, shape, dtype=np.int16))
+    f2_advantage = f2_power + rng.integers(-20, 21, shape, dtype=np.int16) \
+        - (f1_defense + rng.integers(-15, 16, shape, dtype=np.int16))
+    round_time = rng.uniform(15.0, 45.0, shape)
+    finishing_move = rng.integers(0, len(FINISHING_MOVES), shape, dtype=np.int8)
+
+    f1_round_win = f1_advantage > f2_advantage  # Ties go to fighter 2, as in GDScript
+    damage = np.abs(np.maximum(f1_advantage, f2_advantage))
+
+    f1_wins = np.cumsum(f1_round_win, axis=0)
+    f2_wins = np.arange(1, rounds + 1)[:, None] - f1_wins
+    finished = (f1_wins >= rounds_to_win) | (f2_wins >= rounds_to_win)
+    finished[-1] = True  # current_round >= max_rounds
+    last_round = np.argmax(finished, axis=0)
+    played = np.arange(rounds)[:, None] <= last_round
+
+    columns = np.arange(size)
+    return {
+        "f1_rounds": f1_wins[last_round, columns],
+        "f2_rounds": f2_wins[last_round, columns],
+        "rounds": last_round + 1,
+        "played": played,
+        "round_time": round_time,
+        "damage": damage,
+        "finishing_move": finishing_move,
+    }
+
+
+class BattleResults:
+    """Aggregated outcome of a batch of simulated battles"""
+    def __init__(self, fights, f1_wins, rounds_played, f1_round_wins, total_rounds, score_lines,
+                 damage, round_time, finishing_moves, fight_winners=None):
+        self.fights = fights
+        self.f1_wins = f1_wins
+        self.rounds_played = rounds_played
+        self.f1_round_wins = f1_round_wins
+        self.total_rounds = total_rounds  # {rounds in battle: count}
+        self.score_lines = score_lines  # {(winner rounds, loser rounds): count}
+        self.damage = damage  # Per-round damage_dealt values
+        self.round_time = round_time  # Per-round round_time values (seconds)
+        self.finishing_moves = finishing_moves  # {move name: count}
+        self.fight_winners = fight_winners  # Optional per-fight bool array (True = fighter 1)
+
+    @property
+    def f1_win_rate(self):
+        return self.f1_wins / self.fights if self.fights else 0.0
+
+    @property
+    def f1_round_win_rate(self):
+        return self.f1_round_wins / self.rounds_played if self.rounds_played else 0.0
+
+    def damage_percentiles(self, percentiles=(5, 25, 50, 75, 95)):
+        return dict(zip(percentiles, np.percentile(self.damage, percentiles).tolist()))
+
+    def round_time_percentiles(self, percentiles=(5, 25, 50, 75, 95)):
+        return dict(zip(percentiles, np.percentile(self.round_time, percentiles).tolist()))
+
+    def damage_histogram(self, bins=DAMAGE_BINS):
+        return np.histogram(self.damage, bins=bins)
+
+    def round_time_histogram(self, bins=ROUND_TIME_BINS):
+        return np.histogram(self.round_time, bins=bins, range=(15.0, 45.0))
+
+    def report(self):
+        lines = [
+            f"Fights: {self.fights:,}  rounds: {self.rounds_played:,}",
+            f"Fighter 1 win rate: {self.f1_win_rate:.4f} (rounds {self.f1_round_win_rate:.4f})",
+            "Battle length: " + ", ".join(f"{rounds} rounds {count / self.fights:.3f}"
+                                          for rounds, count in sorted(self.total_rounds.items())),
+            "Score lines: " + ", ".join(f"{w}-{l} {count / self.fights:.3f}"
+                                        for (w, l), count in sorted(self.score_lines.items())),
+            "Damage p5/p50/p95: " + "/".join(f"{value:.0f}" for value in
+                                              self.damage_percentiles((5, 50, 95)).values())
+            + f"  mean {self.damage.mean():.1f}",
+            f"Round time mean: {self.round_time.mean():.2f}s",
+            "Finishing moves: " + ", ".join(f"{move} {count / self.rounds_played:.3f}"
+                                            for move, count in self.finishing_moves.items()),
+        ]
+        return "\n".join(lines)
+
+
+def simulate_battles(fighter1_stats, fighter2_stats, fights, seed=0, rounds_to_win=2, max_rounds=5,
+                     keep_winners=False):
+    """Simulate `fights` battles between two fighters
+
+    Stats are dicts with power/technique/defense/speed, each a scalar or an array with one
+    value per fight (to sweep matchups in one call). Results are identical for the same
+    seed regardless of how many fights are requested alongside.
+    """
+    f1 = _stat_arrays(fighter1_stats, fights)
+    f2 = _stat_arrays(fighter2_stats, fights)
+
+    f1_wins = rounds_played = f1_round_wins = 0
+    total_rounds = np.zeros(max(max_rounds, 1) + 1, dtype=np.int64)
+    score_counts = {}
+    damage_parts, time_parts = [], []
+    move_counts = np.zeros(len(FINISHING_MOVES), dtype=np.int64)
+    winners = np.empty(fights, dtype=bool) if keep_winners else None
+
+    for block, start in enumerate(range(0, fights, BLOCK_SIZE)):
+        end = min(start + BLOCK_SIZE, fights)
+        size = end - start
+        rng = _block_generator(seed, block)
+        # Always draw a full block so fight i's numbers never depend on the batch size
+        pad = BLOCK_SIZE - size
+        f1_block = {name: np.pad(values[start:end], (0, pad), mode='edge') for name, values in f1.items()}
+        f2_block = {name: np.pad(values[start:end], (0, pad), mode='edge') for name, values in f2.items()}
+        result = _simulate_block(f1_block, f2_block, rng, BLOCK_SIZE, rounds_to_win, max_rounds)
+        played = result["played"][:, :size]
+        f1_rounds, f2_rounds = result["f1_rounds"][:size], result["f2_rounds"][:size]
+        f1_won = f1_rounds > f2_rounds
+
+        f1_wins += int(np.count_nonzero(f1_won))
+        rounds_played += int(np.count_nonzero(played))
+        f1_round_wins += int(f1_rounds.sum())
+        total_rounds += np.bincount(result["rounds"][:size], minlength=len(total_rounds))[:len(total_rounds)]
+        winner_rounds = np.maximum(f1_rounds, f2_rounds)
+        loser_rounds = np.minimum(f1_rounds, f2_rounds)
+        keys, counts = np.unique(winner_rounds * 16 + loser_rounds, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            score_counts[(key // 16, key % 16)] = score_counts.get((key // 16, key % 16), 0) + count
+        damage_parts.append(result["damage"][:, :size][played])
+        time_parts.append(result["round_time"][:, :size][played])
+        move_counts += np.bincount(result["finishing_move"][:, :size][played], minlength=len(FINISHING_MOVES))
+        if winners is not None:
+            winners[start:end] = f1_won
+
+    return BattleResults(
+        fights=fights,
+        f1_wins=f1_wins,
+        rounds_played=rounds_played,
+        f1_round_wins=f1_round_wins,
+        total_rounds={rounds: int(count) for rounds, count in enumerate(total_rounds) if count},
+        score_lines=score_counts,
+        damage=np.concatenate(damage_parts) if damage_parts else np.zeros(0, dtype=np.int64),
+        round_time=np.concatenate(time_parts) if time_parts else np.zeros(0),
+        finishing_moves=dict(zip(FINISHING_MOVES, move_counts.tolist())),
+        fight_winners=winners,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    def parse_stats(text):
+        values = [float(part) for part in text.split(',')]
+        if len(values) != len(STAT_NAMES):
+            raise argparse.ArgumentTypeError(f"expected {len(STAT_NAMES)} comma separated values")
+        return dict(zip(STAT_NAMES, values))
+
+    arg_parser = argparse.ArgumentParser(description="Monte Carlo BattleSimulator model")
+    arg_parser.add_argument('--fights', type=int, default=1_000_000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--f1', type=parse_stats, default=parse_stats("60,55,50,45"),
+                            help="power,technique,defense,speed")
+    arg_parser.add_argument('--f2', type=parse_stats, default=parse_stats("55,50,55,50"))
+    arg_parser.add_argument('--rounds-to-win', type=int, default=2)
+    arg_parser.add_argument('--max-rounds', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    results = simulate_battles(args.f1, args.f2, args.fights, args.seed, args.rounds_to_win, args.max_rounds)
+    elapsed = time.perf_counter() - start
+    print(results.report())
+    print(f"⏱️ {args.fights:,} fights / {results.rounds_played:,} rounds in {elapsed:.2f}s "
+          f"({results.rounds_played / elapsed:,.0f} rounds/s)")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Economics projection engine
+Reproduces the money rules of scripts/management/economics_manager.gd (sponsorship offers and
+contracts, calculate_monthly_sponsorship_income, pay_monthly_expenses, _process_monthly_finances,
+sponsorship expiry, training costs, entry fees, win bonuses and the manager's prize cut) for many
+careers at once, one vectorized step per game month, and reports cashflow percentiles.
+Run: python economics_sim.py [--careers N] [--years Y] [--seed S]
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ NumPy is required for the economics projection: pip install numpy")
+    raise
+
+LOCAL_BUSINESS, REGIONAL_COMPANY, NATIONAL_BRAND, INTERNATIONAL_CORPORATION, EXCLUSIVE_PARTNERSHIP = range(5)
+TIER_NAMES = ("Local business", "Regional company", "National brand", "International corporation",
+              "Exclusive partnership")
+TIER_PAYMENT = np.array([200, 600, 2000, 5000, 10000])  # _get_base_payment_for_tier
+TIER_BONUS = np.array([50, 150, 500, 1000, 2000])  # _get_base_bonus_for_tier
+
+STARTING_MONEY = 1000
+BASE_LIVING_EXPENSES = 500
+MANAGER_CUT = 0.15  # award_prize_money
+TRAINING_COST_PER_HOUR = 25  # calculate_training_cost
+TRAINING_TYPE_MULTIPLIER = (1.0, 1.0, 1.0, 1.0, 1.0, 1.5, 2.0, 1.3)
+MAX_OFFERS = 4  # _calculate_sponsorship_offer_count
+MIN_DURATION, MAX_DURATION = 6, 24  # _create_sponsorship_offer
+# Offers arrive during a month and contracts end duration * 30 days later, so the monthly
+# check pays a contract duration + EXTRA_PAYMENTS times before _check_expired_sponsorships drops it
+EXTRA_PAYMENTS = 1
+# Contract slots per career: a ring that is never overwritten while its contract is live
+CONTRACT_SLOTS = MAX_OFFERS * (MAX_DURATION + EXTRA_PAYMENTS)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def offer_counts(rating, rng):
+    """Vectorized _calculate_sponsorship_offer_count"""
+    counts = np.zeros(rating.shape, dtype=np.int64)
+    counts[(rating >= 30) & (rating < 50)] = 1
+    mid = (rating >= 50) & (rating < 70)
+    counts[mid] = rng.integers(1, 3, int(mid.sum()))
+    high = rating >= 70
+    counts[high] = rng.integers(2, 5, int(high.sum()))
+    return counts
+
+
+def sponsor_tiers(rating):
+    """Tier choice from _generate_random_sponsor"""
+    return np.select([rating > 80, rating > 65, rating > 45],
+                     [INTERNATIONAL_CORPORATION, NATIONAL_BRAND, REGIONAL_COMPANY], LOCAL_BUSINESS)
+
+
+def training_cost(hours, training_type=0, level=0):
+    """Vectorized calculate_training_cost"""
+    return np.trunc(TRAINING_COST_PER_HOUR * hours * np.asarray(TRAINING_TYPE_MULTIPLIER)[training_type]
+                    * (1.0 + np.asarray(level) * 0.2)).astype(np.int64)
+
+
+def rating_paths(careers, months, rng, start=40.0, growth=0.3, volatility=2.0):
+    """Default best-fighter rating per career and month: a clipped random walk with drift"""
+    steps = rng.normal(growth, volatility, (careers, months))
+    steps[:, 0] = 0.0
+    return np.clip(start + np.cumsum(steps, axis=1), 0.0, 100.0)
+
+
+def _percentiles(values, percentiles=PERCENTILES):
+    """np.percentile across careers; NaN when there are none"""
+    if values.size == 0:
+        return np.full(len(percentiles), np.nan)
+    return np.percentile(values, percentiles)
+
+
+class CareerProjection:
+    """Per-month cashflow percentiles across all simulated careers"""
+
+    def __init__(self, careers, months, money, sponsorship, net, contracts, bankrupt_months, final):
+        self.careers = careers
+        self.months = months
+        self.money = money  # (months, len(PERCENTILES)) balance after month-end processing
+        self.sponsorship = sponsorship  # Monthly sponsorship income percentiles
+        self.net = net  # Monthly net change percentiles
+        self.contracts = contracts  # Mean active contracts per month
+        self.bankrupt_months = bankrupt_months  # Per-career count of months expenses went unpaid
+        self.final = final  # {'money', 'earned', 'spent'} per-career totals
+
+    @property
+    def bankruptcy_rate(self):
+        return float(np.count_nonzero(self.bankrupt_months)) / self.careers if self.careers else 0.0
+
+    def report(self, every=12):
+        header = "/".join(f"p{p}" for p in PERCENTILES)
+        lines = [f"Careers: {self.careers:,}  months: {self.months}  "
+                 f"ever bankrupt: {self.bankruptcy_rate:.3f}",
+                 f"{'month':>5} {'money ' + header:>44} {'sponsorship p50':>16} {'net p50':>9} {'contracts':>9}"]
+        for month in list(range(every - 1, self.months, every)) or [self.months - 1]:
+            money = "/".join(f"{value:,.0f}" for value in self.money[month])
+            lines.append(f"{month + 1:>5} {money:>44} {self.sponsorship[month][2]:>16,.0f} "
+                         f"{self.net[month][2]:>9,.0f} {self.contracts[month]:>9.1f}")
+        if self.careers:
+            lines.append("Final money p5/p50/p95: " + "/".join(
+                f"{value:,.0f}" for value in _percentiles(self.final['money'], (5, 50, 95))))
+            lines.append(f"Earned mean {self.final['earned'].mean():,.0f}, "
+                         f"spent mean {self.final['spent'].mean():,.0f}")
+        return "\n".join(lines)
+
+
+def project_careers(careers, years=10, seed=0, ratings=None, accept_rate=1.0, fights_per_month=4,
+                    win_rate=0.5, tournaments_per_month=4, entry_fee=25, titles_per_month=0.5,
+                    prize_per_title=1600, training_hours_per_month=16, training_type=0, fighter_level=0):
+    """Project `careers` independent careers for `years` years of monthly steps
+
+    ratings is the best fighter's get_fighter_rating per career and month (shape (months,) or
+    (careers, months)); by default a drifting random walk. Every other input is a scalar or a
+    per-career array. Offers are accepted with probability accept_rate unless they conflict
+    with an exclusive contract (_has_sponsorship_conflict).
+    """
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+    months = years * 12
+    if ratings is None:
+        ratings = rating_paths(careers, months, rng)
+    ratings = np.broadcast_to(np.asarray(ratings, dtype=np.float64), (careers, months))
+
+    def per_career(value, dtype=np.float64):
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (careers,))
+
+    fights = per_career(fights_per_month, np.int64)
+    win_rate = per_career(win_rate)
+    tournaments = per_career(tournaments_per_month, np.int64)
+    entry_fee = per_career(entry_fee, np.int64)
+    titles_per_month = per_career(titles_per_month)
+    prize_cut = np.trunc(per_career(prize_per_title) * MANAGER_CUT).astype(np.int64)
+    monthly_training = training_cost(per_career(training_hours_per_month, np.int64), training_type,
+                                     per_career(fighter_level))
+
+    money = np.full(careers, STARTING_MONEY, dtype=np.int64)
+    earned = np.zeros(careers, dtype=np.int64)
+    spent = np.zeros(careers, dtype=np.int64)
+    payment = np.zeros((careers, CONTRACT_SLOTS), dtype=np.int64)
+    win_bonus = np.zeros((careers, CONTRACT_SLOTS), dtype=np.int64)
+    remaining = np.zeros((careers, CONTRACT_SLOTS), dtype=np.int16)  # Payments left; 0 = free slot
+    exclusive = np.zeros((careers, CONTRACT_SLOTS), dtype=bool)
+    bankrupt_months = np.zeros(careers, dtype=np.int32)
+
+    money_pct = np.empty((months, len(PERCENTILES)))
+    sponsorship_pct = np.empty((months, len(PERCENTILES)))
+    net_pct = np.empty((months, len(PERCENTILES)))
+    contracts_mean = np.empty(months)
+
+    def earn(amount):
+        money[:] += amount
+        earned[:] += amount
+
+    def spend(amount):
+        """spend_money: only where affordable; returns the mask of careers that paid"""
+        paid = money >= amount
+        charged = np.where(paid, amount, 0)
+        money[:] -= charged
+        spent[:] += charged
+        return paid
+
+    for month in range(months):
+        start_money = money.copy()
+        rating = np.trunc(ratings[:, month])
+
+        # generate_sponsorship_offers + accept_sponsorship
+        counts = offer_counts(rating, rng)
+        tier = sponsor_tiers(rating)
+        for offer in range(MAX_OFFERS):
+            has_offer = counts > offer
+            offer_payment = np.trunc(TIER_PAYMENT[tier] * rng.uniform(0.8, 1.3, careers)).astype(np.int64)
+            offer_bonus = np.trunc(TIER_BONUS[tier] * rng.uniform(0.7, 1.5, careers)).astype(np.int64)
+            duration = rng.integers(MIN_DURATION, MAX_DURATION + 1, careers)
+            signing_bonus = np.trunc(offer_payment * rng.uniform(0.5, 2.0, careers)).astype(np.int64)
+            offer_exclusive = tier >= NATIONAL_BRAND
+            accepted = has_offer & (rng.random(careers) < accept_rate)
+            accepted &= ~(offer_exclusive & (exclusive & (remaining > 0)).any(axis=1))
+            slot = (month * MAX_OFFERS + offer) % CONTRACT_SLOTS
+            payment[accepted, slot] = offer_payment[accepted]
+            win_bonus[accepted, slot] = offer_bonus[accepted]
+            remaining[accepted, slot] = duration[accepted] + EXTRA_PAYMENTS
+            exclusive[accepted, slot] = offer_exclusive[accepted]
+            earn(np.where(accepted, signing_bonus, 0))
+
+        # Month activity: entry fees, training, fights with win bonuses, prize money.
+        # pay_tournament_entry/pay_training_cost buy nothing when unaffordable, so fights and
+        # titles only come from the paid share of entries, and none without paid training
+        entries_paid = np.zeros(careers, dtype=np.int64)
+        for entry in range(int(tournaments.max(initial=0))):
+            entered = tournaments > entry
+            entries_paid += spend(np.where(entered, entry_fee, 0)) & entered
+        trained = spend(monthly_training)
+        share = np.where(tournaments > 0, entries_paid / np.maximum(tournaments, 1), 1.0) * trained
+        active = remaining > 0
+        wins = rng.binomial(np.trunc(fights * share).astype(np.int64), win_rate)
+        earn(wins * np.where(active, win_bonus, 0).sum(axis=1))
+        earn(rng.poisson(titles_per_month * share) * prize_cut)
+
+        # _process_monthly_finances
+        sponsorship = np.where(active, payment, 0).sum(axis=1)
+        earn(sponsorship)
+        paid = spend(np.full(careers, BASE_LIVING_EXPENSES, dtype=np.int64))
+        bankrupt_months += ~paid
+        money[~paid] = 0  # _handle_bankruptcy
+        remaining[active] -= 1
+
+        money_pct[month] = _percentiles(money)
+        sponsorship_pct[month] = _percentiles(sponsorship)
+        net_pct[month] = _percentiles(money - start_money)
+        contracts_mean[month] = active.sum() / careers if careers else 0.0
+
+    return CareerProjection(careers, months, money_pct, sponsorship_pct, net_pct, contracts_mean,
+                            bankrupt_months, {'money': money, 'earned': earned, 'spent': spent})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Monte Carlo EconomicsManager career projection")
+    arg_parser.add_argument('--careers', type=int, default=10_000)
+    arg_parser.add_argument('--years', type=int, default=10)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--accept-rate', type=float, default=1.0, help="Chance each sponsorship offer is taken")
+    arg_parser.add_argument('--win-rate', type=float, default=0.5)
+    arg_parser.add_argument('--titles', type=float, default=0.5, help="Mean tournament titles per month")
+    arg_parser.add_argument('--training-hours', type=int, default=16, help="Training hours paid per month")
+    args = arg_parser.parse_args()
+
+    start = time.perf_counter()
+    projection = project_careers(args.careers, args.years, args.seed, accept_rate=args.accept_rate,
+                                 win_rate=args.win_rate, titles_per_month=args.titles,
+                                 training_hours_per_month=args.training_hours)
+    elapsed = time.perf_counter() - start
+    print(projection.report())
+    print(f"⏱️ {args.careers:,} careers x {projection.months} months in {elapsed:.2f}s "
+          f"({args.careers * projection.months / elapsed:,.0f} career-months/s)")
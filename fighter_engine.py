@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Columnar fighter progression engine
+Reproduces scripts/management/fighter_manager.gd (get_fighter_rating, _calculate_training_benefits,
+_calculate_training_cost, _calculate_level, _apply_level_up_bonuses and the hourly condition
+updates) over NumPy columns, so a whole league advances one game hour per vectorized step.
+Run: python fighter_engine.py [--fighters N] [--hours H] [--seed S]
+"""
+
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ NumPy is required for the fighter engine: pip install numpy")
+    raise
+
+from season_sim import ATTRIBUTES, FATIGUE_RECOVERY_RATE, LEVEL_NAMES, LEVEL_THRESHOLDS, MOTIVATION_DECAY_RATE
+
+(STRENGTH, SPEED, TECHNIQUE, DEFENSE, STAMINA, MENTAL, SPARRING, COMBO_PRACTICE) = range(8)
+TRAINING_NAMES = ("STRENGTH", "SPEED", "TECHNIQUE", "DEFENSE", "STAMINA", "MENTAL", "SPARRING", "COMBO_PRACTICE")
+NOT_TRAINING = -1
+
+BASE_TRAINING_COST = 100
+DEFAULT_TRAINING_HOURS = 4
+
+# _calculate_training_benefits as tables indexed by TrainingType:
+# attribute share of base_improvement (single-attribute types also get a U(0.8, 1.2) factor),
+# experience per hour, fatigue multiplier, cost multiplier (_calculate_training_cost)
+ATTRIBUTE_GAIN = np.zeros((len(TRAINING_NAMES), len(ATTRIBUTES)))
+for _type in range(MENTAL + 1):
+    ATTRIBUTE_GAIN[_type, _type] = 1.0
+ATTRIBUTE_GAIN[SPARRING, [TECHNIQUE, SPEED, MENTAL]] = (0.4, 0.3, 0.3)
+ATTRIBUTE_GAIN[COMBO_PRACTICE, [TECHNIQUE, MENTAL]] = (0.6, 0.4)
+RANDOM_GAIN = np.arange(len(TRAINING_NAMES)) <= MENTAL
+EXPERIENCE_PER_HOUR = np.array([20, 20, 25, 20, 15, 30, 40, 35])
+FATIGUE_MULTIPLIER = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.5, 1.0])
+COST_MULTIPLIER = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.3, 1.5, 1.2])
+# get_fighter_rating weights, in ATTRIBUTES order
+RATING_WEIGHTS = np.array([0.2, 0.2, 0.2, 0.15, 0.15, 0.1])
+
+
+def training_cost(level, training_type, duration):
+    """Vectorized _calculate_training_cost"""
+    return np.trunc(BASE_TRAINING_COST * (duration / 4.0) * (1.0 + level * 0.2)
+                    * COST_MULTIPLIER[training_type]).astype(np.int64)
+
+
+def calculate_levels(experience):
+    """Vectorized _calculate_level"""
+    return np.searchsorted(np.asarray(LEVEL_THRESHOLDS), experience, side='right').astype(np.int8)
+
+
+class FighterTable:
+    """A roster stored column-wise: one array per FighterData field"""
+
+    def __init__(self, count, seed=0):
+        self.rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+        self.count = count
+        self.hour = 0
+        # create_fighter
+        self.attributes = self.rng.uniform(20, 40, (count, len(ATTRIBUTES)))
+        self.health = np.full(count, 100.0)
+        self.motivation = self.rng.uniform(70, 90, count)
+        self.fatigue = self.rng.uniform(0, 20, count)
+        self.confidence = np.full(count, 50.0)
+        self.level = np.zeros(count, dtype=np.int8)
+        self.experience = np.zeros(count, dtype=np.int64)
+        # current_training: type, duration and the hour it completes
+        self.training_type = np.full(count, NOT_TRAINING, dtype=np.int8)
+        self.training_hours = np.zeros(count, dtype=np.int16)
+        self.training_done_at = np.zeros(count, dtype=np.int64)
+        self.training_sessions = np.zeros(count, dtype=np.int32)
+        self.training_spend = np.zeros(count, dtype=np.int64)
+        self.level_ups = 0
+
+    def overall_rating(self):
+        """FighterData.get_overall_rating"""
+        return np.trunc(self.attributes.mean(axis=1)).astype(np.int64)
+
+    def fighter_rating(self):
+        """FighterManager.get_fighter_rating"""
+        total = self.attributes @ RATING_WEIGHTS + self.level * 5
+        condition_modifier = (self.health + self.motivation - self.fatigue) / 200.0
+        return np.trunc(np.trunc(total) * (1.0 + condition_modifier)).astype(np.int64)
+
+    def can_train(self):
+        """_can_fighter_train"""
+        return (self.training_type == NOT_TRAINING) & (self.health >= 30) & (self.fatigue <= 80)
+
+    def start_training(self, training_type, duration=DEFAULT_TRAINING_HOURS, mask=None):
+        """start_training for every fighter in `mask` that can train; returns how many started
+
+        training_type/duration are scalars or per-fighter arrays.
+        """
+        starting = self.can_train() if mask is None else self.can_train() & mask
+        index = np.flatnonzero(starting)
+        if not len(index):
+            return 0
+        types = np.broadcast_to(np.asarray(training_type, dtype=np.int8), (self.count,))[index]
+        hours = np.broadcast_to(np.asarray(duration, dtype=np.int16), (self.count,))[index]
+        self.training_spend[index] += training_cost(self.level[index], types, hours)
+        self.training_type[index] = types
+        self.training_hours[index] = hours
+        self.training_done_at[index] = self.hour + hours
+        return len(index)
+
+    def _complete_training(self, index):
+        """_complete_training_session for the fighters at `index`"""
+        rng = self.rng
+        types = self.training_type[index].astype(np.intp)
+        hours = self.training_hours[index].astype(np.float64)
+        size = len(index)
+
+        base_improvement = hours * 0.5 * (1.0 + self.level[index] * 0.1)
+        factor = np.where(RANDOM_GAIN[types], rng.uniform(0.8, 1.2, size), 1.0)
+        gains = ATTRIBUTE_GAIN[types] * (base_improvement * factor)[:, None]
+        self.attributes[index] = np.clip(self.attributes[index] + gains, 0.0, 100.0)
+
+        confidence = np.where(types == MENTAL, rng.uniform(2, 5, size), 0.0)
+        self.confidence[index] = np.clip(self.confidence[index] + confidence, 0.0, 100.0)
+        self.fatigue[index] = np.clip(self.fatigue[index] + hours * 2.0 * FATIGUE_MULTIPLIER[types], 0.0, 100.0)
+        self.motivation[index] = np.clip(self.motivation[index] + rng.uniform(-1, 1, size), 0.0, 100.0)
+
+        self.training_sessions[index] += 1
+        self.training_type[index] = NOT_TRAINING
+        self.add_experience(index, (EXPERIENCE_PER_HOUR[types] * hours).astype(np.int64))
+
+    def add_experience(self, index, amount):
+        """add_experience + _apply_level_up_bonuses for the fighters at `index`"""
+        rng = self.rng
+        self.experience[index] += amount
+        new_level = calculate_levels(self.experience[index])
+        levelled = new_level > self.level[index]
+        if not levelled.any():
+            return
+        index = index[levelled]
+        size = len(index)
+        self.level[index] = new_level[levelled]
+        self.level_ups += size
+
+        # int(randf_range(2, 5)) points, each +1 on a random attribute
+        points = rng.uniform(2, 5, size).astype(np.int64)
+        bonus = np.zeros((size, len(ATTRIBUTES)))
+        for point in range(int(points.max())):
+            rows = np.flatnonzero(points > point)
+            np.add.at(bonus, (rows, rng.integers(0, len(ATTRIBUTES), len(rows))), 1.0)
+        self.attributes[index] = np.minimum(self.attributes[index] + bonus, 100.0)
+        self.motivation[index] = np.clip(self.motivation[index] + rng.uniform(5, 15, size), 0.0, 100.0)
+        self.confidence[index] = np.clip(self.confidence[index] + rng.uniform(3, 8, size), 0.0, 100.0)
+
+    def step_hour(self):
+        """_process_hourly_updates: finish due training, then recover fatigue and decay motivation"""
+        self.hour += 1
+        done = np.flatnonzero((self.training_type != NOT_TRAINING) & (self.training_done_at <= self.hour))
+        if len(done):
+            self._complete_training(done)
+        recovering = self.fatigue > 0
+        self.fatigue[recovering] = np.maximum(self.fatigue[recovering] - FATIGUE_RECOVERY_RATE, 0.0)
+        idle = self.training_type == NOT_TRAINING
+        self.motivation[idle] = np.maximum(self.motivation[idle] - MOTIVATION_DECAY_RATE, 0.0)
+
+    def run(self, hours, training_plan=None, duration=DEFAULT_TRAINING_HOURS):
+        """Advance `hours` game hours; idle fighters able to train start their planned session
+
+        training_plan is a TrainingType (or one per fighter, NOT_TRAINING for fighters that
+        only rest); by default every fighter sticks to one randomly chosen type.
+        """
+        if training_plan is None:
+            training_plan = self.rng.integers(0, len(TRAINING_NAMES), self.count, dtype=np.int8)
+        plan = np.broadcast_to(np.asarray(training_plan, dtype=np.int8), (self.count,))
+        wants_training = plan != NOT_TRAINING
+        for _ in range(hours):
+            self.start_training(plan, duration, wants_training)
+            self.step_hour()
+        return self
+
+    def report(self):
+        rating = self.fighter_rating()
+        levels = np.bincount(self.level, minlength=len(LEVEL_NAMES))
+        percentiles = np.percentile(rating, (5, 25, 50, 75, 95))
+        lines = [
+            f"Fighters: {self.count:,}  hours: {self.hour:,}  level ups: {self.level_ups:,}",
+            "Levels: " + ", ".join(f"{name} {count / self.count:.3f}"
+                                   for name, count in zip(LEVEL_NAMES, levels.tolist()) if count),
+            "Rating p5/p25/p50/p75/p95: " + "/".join(f"{value:.0f}" for value in percentiles),
+            "Attributes mean: " + ", ".join(f"{name} {value:.1f}"
+                                            for name, value in zip(ATTRIBUTES, self.attributes.mean(axis=0))),
+            f"Condition mean: motivation {self.motivation.mean():.1f}, fatigue {self.fatigue.mean():.1f}, "
+            f"confidence {self.confidence.mean():.1f}",
+            f"Training: {int(self.training_sessions.sum()):,} sessions, "
+            f"{int(self.training_spend.sum()):,} spent ({self.training_spend.mean():,.0f} per fighter)",
+        ]
+        return "\n".join(lines)
+
+
+def benchmark(fighters=100_000, hours=24 * 365, seed=0):
+    """Time a league of `fighters` training for `hours`; returns (table, fighter-hours per second)"""
+    table = FighterTable(fighters, seed)
+    start = time.perf_counter()
+    table.run(hours)
+    elapsed = time.perf_counter() - start
+    rate = fighters * hours / elapsed if elapsed else 0.0
+    print(f"⏱️ {fighters:,} fighters x {hours:,} hours in {elapsed:.2f}s ({rate:,.0f} fighter-hours/s)")
+    return table, rate
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Columnar FighterManager progression model")
+    arg_parser.add_argument('--fighters', type=int, default=100_000)
+    arg_parser.add_argument('--hours', type=int, default=24 * 365)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    table, _ = benchmark(args.fighters, args.hours, args.seed)
+    print(table.report())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+MUGEN AIR (animation) parser with compiled animation tables, built on mugen_text's tokenizer
+Each action is stored as parallel typed arrays instead of per-frame objects
+Run: python mugen_air.py <file.air | roster dir>   (parses everything and reports timing)
+"""
+
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_right
+
+from mugen_text import KEY, SECTION, read_text, tokenize
+
+# Frame flag bits
+FLIP_H = 1
+FLIP_V = 2
+
+
+class AIRAction:
+    """One compiled [Begin Action N] block
+
+    Frame data lives in parallel arrays indexed by frame number. Collision boxes use
+    a CSR layout: boxes for frame i are clsnN_boxes[4*clsnN_index[i]:4*clsnN_index[i+1]]
+    as (x1, y1, x2, y2) quadruples.
+    """
+    __slots__ = ('number', 'groups', 'numbers', 'durations', 'offset_x', 'offset_y',
+                 'flags', 'trans', 'loopstart', 'clsn1_index', 'clsn1_boxes',
+                 'clsn2_index', 'clsn2_boxes')
+
+    def __init__(self, number):
+        self.number = number
+        self.groups = array('i')
+        self.numbers = array('i')
+        self.durations = array('i')  # Ticks; -1 holds the frame forever
+        self.offset_x = array('i')
+        self.offset_y = array('i')
+        self.flags = array('B')  # FLIP_H / FLIP_V bits
+        self.trans = []  # Blend mode string per frame ('' when unset)
+        self.loopstart = 0
+        self.clsn1_index = array('I', [0])
+        self.clsn1_boxes = array('i')
+        self.clsn2_index = array('I', [0])
+        self.clsn2_boxes = array('i')
+
+    def __len__(self):
+        return len(self.groups)
+
+    def frame(self, i):
+        """Return (group, number, duration, x, y, flags) for frame i"""
+        return (self.groups[i], self.numbers[i], self.durations[i],
+                self.offset_x[i], self.offset_y[i], self.flags[i])
+
+    def clsn1(self, i):
+        """Attack boxes of frame i as a list of (x1, y1, x2, y2)"""
+        return self._boxes(self.clsn1_index, self.clsn1_boxes, i)
+
+    def clsn2(self, i):
+        """Hurt boxes of frame i as a list of (x1, y1, x2, y2)"""
+        return self._boxes(self.clsn2_index, self.clsn2_boxes, i)
+
+    @staticmethod
+    def _boxes(index, boxes, i):
+        start, end = index[i] * 4, index[i + 1] * 4
+        return [tuple(boxes[j:j + 4]) for j in range(start, end, 4)]
+
+    def total_time(self):
+        """Length of one pass in ticks, or -1 if a frame holds forever"""
+        if -1 in self.durations:
+            return -1
+        return sum(self.durations)
+
+    def sprite_keys(self):
+        """Set of (group, number) sprites used by this action"""
+        return set(zip(self.groups, self.numbers))
+
+    def clock(self):
+        """Return an AnimationClock sequencing this action's frames"""
+        return AnimationClock(self.durations, self.loopstart)
+
+
+class AnimationClock:
+    """Maps a tick count (60 per second) to the frame being shown
+
+    Frame lookup is computed from the tick directly, so a player that derives the
+    tick from wall time never accumulates drift.
+    """
+    TICKS_PER_SECOND = 60
+
+    def __init__(self, durations, loopstart=0):
+        self.frame_count = len(durations)
+        self.loopstart = loopstart if 0 <= loopstart < self.frame_count else 0
+        self.hold_frame = None  # First frame with time -1; nothing after it plays
+        self.starts = [0]  # starts[i] is the tick at which frame i begins
+        for i, duration in enumerate(durations):
+            if duration == -1:
+                self.hold_frame = i
+                break
+            self.starts.append(self.starts[-1] + max(1, duration))
+        self.first_pass = self.starts[-1]
+        self.loop_length = self.first_pass - self.starts[self.loopstart]
+
+    def _fold(self, tick):
+        """Map a tick into the first pass of the animation"""
+        if tick >= self.first_pass and self.hold_frame is None and self.loop_length > 0:
+            tick = self.starts[self.loopstart] + (tick - self.first_pass) % self.loop_length
+        return tick
+
+    def frame_at(self, tick):
+        """Index of the frame shown at `tick`"""
+        if self.frame_count == 0:
+            return None
+        tick = self._fold(tick)
+        if self.hold_frame is not None and tick >= self.first_pass:
+            return self.hold_frame
+        return min(bisect_right(self.starts, tick) - 1, self.frame_count - 1)
+
+    def next_change(self, tick):
+        """First tick after `tick` at which the shown frame changes, or None if it never does"""
+        if self.frame_count == 0:
+            return None
+        frame = self.frame_at(tick)
+        if frame == self.hold_frame:
+            return None
+        if self.frame_count == 1 and self.hold_frame is None:
+            return None
+        return tick + (self.starts[frame + 1] - self._fold(tick))
+
+
+def place_frame(width, height, axis_x, axis_y, x, y, flags):
+    """Top-left corner of a sprite drawn for a frame, relative to the animation origin
+
+    The sprite axis lands on the origin plus the frame offset; flips mirror about the axis.
+    """
+    left = x - (width - axis_x if flags & FLIP_H else axis_x)
+    top = y - (height - axis_y if flags & FLIP_V else axis_y)
+    return left, top
+
+
+def _to_int(text):
+    text = text.strip()
+    if not text:
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+def _parse_flip(text):
+    text = text.strip().upper()
+    flags = 0
+    if 'H' in text:
+        flags |= FLIP_H
+    if 'V' in text:
+        flags |= FLIP_V
+    return flags
+
+
+class AIRParser:
+    """Parses .air files into {action number: AIRAction}"""
+    def __init__(self):
+        self.actions = {}
+
+    def parse_file(self, filepath):
+        """Parse an AIR file; returns False if it cannot be read"""
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading AIR file {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        """Parse AIR source text"""
+        self.actions = {}
+        action = None
+        clsn_default = {1: [], 2: []}  # Boxes applied to every following frame
+        clsn_next = {1: None, 2: None}  # Boxes applied to the next frame only
+        clsn_target = None  # Box list receiving ClsnN[i] lines
+
+        for kind, _, key, line in tokenize(text):
+            if kind == SECTION:
+                action = None
+                header = key.split()
+                if len(header) >= 3 and header[0].lower() == 'begin' and header[1].lower() == 'action':
+                    try:
+                        number = int(header[2])
+                    except ValueError:
+                        continue
+                    action = AIRAction(number)
+                    self.actions[number] = action
+                    clsn_default = {1: [], 2: []}
+                    clsn_next = {1: None, 2: None}
+                    clsn_target = None
+                continue
+
+            if action is None:
+                continue
+
+            if kind == KEY:
+                # "Clsn2[0] = x1, y1, x2, y2"
+                if key.startswith('clsn') and '[' in key and clsn_target is not None:
+                    box = [_to_int(part) for part in line.split(',')[:4]]
+                    if len(box) == 4:
+                        clsn_target.append(box)
+                continue
+
+            first = line[0]
+            if first in 'Cc' and line[:4].lower() == 'clsn':
+                kind = 1 if line[4:5] == '1' else 2
+                if line.partition(':')[0].strip().lower().endswith('default'):
+                    clsn_default[kind] = clsn_target = []
+                else:
+                    clsn_next[kind] = clsn_target = []
+                continue
+
+            if first in 'Ll' and line.lower().startswith('loopstart'):
+                action.loopstart = len(action.groups)
+                continue
+
+            if first in 'Ii' and line.lower().startswith('interpolate'):
+                continue
+
+            parts = line.split(',')
+            if len(parts) < 5:
+                continue
+            # group, number, x, y, time [, flip [, trans]]
+            try:
+                group, number, x, y, duration = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3]), int(parts[4])
+            except ValueError:
+                try:
+                    group, number, x, y, duration = map(_to_int, parts[:5])
+                except ValueError:
+                    continue
+            action.groups.append(group)
+            action.numbers.append(number)
+            action.offset_x.append(x)
+            action.offset_y.append(y)
+            action.durations.append(duration)
+            action.flags.append(_parse_flip(parts[5]) if len(parts) > 5 else 0)
+            action.trans.append(parts[6].strip() if len(parts) > 6 else '')
+
+            boxes = clsn_next[1] if clsn_next[1] is not None else clsn_default[1]
+            for box in boxes:
+                action.clsn1_boxes.extend(box)
+            action.clsn1_index.append(action.clsn1_index[-1] + len(boxes))
+            boxes = clsn_next[2] if clsn_next[2] is not None else clsn_default[2]
+            for box in boxes:
+                action.clsn2_boxes.extend(box)
+            action.clsn2_index.append(action.clsn2_index[-1] + len(boxes))
+            clsn_next[1] = clsn_next[2] = clsn_target = None
+
+        # A loopstart after the last frame loops nothing; MUGEN restarts from 0
+        for action in self.actions.values():
+            if action.loopstart >= len(action.groups):
+                action.loopstart = 0
+        return self.actions
+
+    def get_action(self, number):
+        return self.actions.get(number)
+
+    def has_action(self, number):
+        return number in self.actions
+
+    def get_action_numbers(self):
+        return sorted(self.actions)
+
+
+_air_cache = {}  # Maps absolute path to ((mtime_ns, size), actions)
+_air_cache_lock = threading.Lock()
+
+
+def load_air(filepath):
+    """Parse an AIR file, reusing the previous result while its mtime and size are unchanged"""
+    path = os.path.abspath(filepath)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _air_cache_lock:
+        cached = _air_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    parser = AIRParser()
+    if not parser.parse_file(path):
+        return None
+    with _air_cache_lock:
+        _air_cache[path] = (signature, parser.actions)
+    return parser.actions
+
+
+def clear_air_cache():
+    with _air_cache_lock:
+        _air_cache.clear()
+
+
+def find_air_files(root):
+    """Yield every .air file below a directory"""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith('.air'):
+                yield os.path.join(dirpath, name)
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "assets/mugen/chars"
+    paths = [target] if os.path.isfile(target) else sorted(find_air_files(target))
+    if not paths:
+        print(f"❌ No AIR files found under {target}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    actions = frames = 0
+    for path in paths:
+        parsed = load_air(path) or {}
+        actions += len(parsed)
+        frames += sum(len(action) for action in parsed.values())
+    elapsed = time.perf_counter() - start
+    print(f"✅ Parsed {len(paths)} AIR files: {actions} actions, {frames} frames in {elapsed * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for path in paths:
+        load_air(path)
+    print(f"♻️ Cached reload: {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Roster archive packer and mmap reader
+Bundles every roster file (.def/.sff/.air/.cmd/.cns/.st/.act/.snd) under a directory into one
+archive with aligned entries and a path-sorted index, optionally adding pre-decoded RGBA sprites
+for each SFF. The reader maps the archive once and hands out zero-copy memoryviews, so startup
+is one open plus one index read instead of hundreds of loose file opens.
+Run: python mugen_archive.py pack assets/mugen --out roster.pak [--decode]
+     python mugen_archive.py list roster.pak | verify roster.pak
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b'FMPAK\0\0\0'
+ARCHIVE_VERSION = 1
+# magic, version, alignment, entry count, index offset, index length, strings offset, strings length
+HEADER = struct.Struct('<8sIIIxxxxQQQQ')
+# path offset/length in the string table, data offset/length, kind, crc32, width, height, axis x/y
+RECORD = struct.Struct('<IIQQIIHHhh')
+KIND_FILE, KIND_SPRITE = 0, 1
+DEFAULT_ALIGNMENT = 64
+ROSTER_EXTENSIONS = ('.def', '.sff', '.air', '.cmd', '.cns', '.st', '.act', '.snd')
+COPY_CHUNK = 1 << 20
+
+
+def sprite_path(sff_path, group, number):
+    """Archive path of a pre-decoded sprite"""
+    return f"{sff_path}#{group},{number}"
+
+
+def _normalize(path):
+    return path.replace('\\', '/').lstrip('/')
+
+
+def find_roster_files(root, extensions=ROSTER_EXTENSIONS):
+    """{archive path: file path} for every roster file under root"""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.lower().endswith(extensions):
+                path = os.path.join(directory, name)
+                files[_normalize(os.path.relpath(path, root))] = path
+    return files
+
+
+def _decode_worker(job):
+    from mugen_build import decode_stage
+
+    name, path = job
+    try:
+        return name, decode_stage(path)
+    except Exception as e:
+        print(f"⚠️ Could not decode {name}: {e}")
+        return name, {}
+
+
+def _pad(f, alignment):
+    remainder = f.tell() % alignment
+    if remainder:
+        f.write(b'\0' * (alignment - remainder))
+
+
+def _decoded_sprites(jobs, max_workers):
+    """Yield (archive path, sprites) for each SFF job, in job order, as decoding finishes"""
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(_decode_worker, jobs)
+    else:
+        for job in jobs:
+            yield _decode_worker(job)
+
+
+def _write_entry(f, records, alignment, name, kind, source, width=0, height=0, axis=(0, 0)):
+    """Append one aligned entry (file path or bytes) and record where it went"""
+    _pad(f, alignment)
+    offset = f.tell()
+    crc = 0
+    if kind == KIND_FILE:
+        with open(source, 'rb') as src:
+            for chunk in iter(lambda: src.read(COPY_CHUNK), b''):
+                crc = zlib.crc32(chunk, crc)
+                f.write(chunk)
+    else:
+        crc = zlib.crc32(source)
+        f.write(source)
+    records.append((name, kind, offset, f.tell() - offset, crc, width, height, axis))
+
+
+def pack_archive(root, out_path, decode_sprites=False, alignment=DEFAULT_ALIGNMENT, max_workers=None,
+                 verbose=True):
+    """Write the archive; returns the number of entries
+
+    Decoded sprites are written as each SFF finishes, so only the index records stay in memory;
+    the index is path-sorted, the data region is not.
+    """
+    start = time.perf_counter()
+    files = find_roster_files(root)
+    if not files:
+        print(f"❌ No roster files found under {root}")
+        return 0
+    names = sorted(files, key=lambda name: name.encode('utf-8'))
+
+    temp_path = f"{out_path}.tmp"
+    # (archive path, kind, data offset, length, crc, width, height, axis)
+    records = []
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(b'\0' * HEADER.size)
+            for name in names:
+                _write_entry(f, records, alignment, name, KIND_FILE, files[name])
+            if decode_sprites:
+                sff_jobs = [(name, files[name]) for name in names if name.lower().endswith('.sff')]
+                for name, sprites in _decoded_sprites(sff_jobs, max_workers):
+                    for (group, number), (size, axis, data) in sprites.items():
+                        _write_entry(f, records, alignment, sprite_path(name, group, number), KIND_SPRITE, data,
+                                     size[0], size[1], axis)
+            records.sort(key=lambda record: record[0].encode('utf-8'))
+
+            strings = bytearray()
+            index = []
+            for name, kind, offset, length, crc, width, height, axis in records:
+                encoded = name.encode('utf-8')
+                index.append(RECORD.pack(len(strings), len(encoded), offset, length, kind, crc,
+                                         width, height, axis[0], axis[1]))
+                strings += encoded
+            _pad(f, alignment)
+            strings_offset = f.tell()
+            f.write(strings)
+            _pad(f, alignment)
+            index_offset = f.tell()
+            f.write(b''.join(index))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, ARCHIVE_VERSION, alignment, len(index), index_offset,
+                                len(index) * RECORD.size, strings_offset, len(strings)))
+        os.replace(temp_path, out_path)
+    finally:
+        # Only left behind when writing failed
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    if verbose:
+        sprites = sum(1 for record in records if record[1] == KIND_SPRITE)
+        print(f"✅ Packed {len(records) - sprites} files" + (f" and {sprites} decoded sprites" if sprites else "")
+              + f" into {out_path} ({os.path.getsize(out_path):,} bytes) in {time.perf_counter() - start:.2f}s")
+    return len(records)
+
+
+class ArchiveEntry:
+    __slots__ = ('path', 'kind', 'offset', 'length', 'crc', 'width', 'height', 'axis')
+
+    def __init__(self, path, kind, offset, length, crc, width, height, axis):
+        self.path = path
+        self.kind = kind
+        self.offset = offset
+        self.length = length
+        self.crc = crc
+        self.width = width
+        self.height = height
+        self.axis = axis
+
+
+class RosterArchive:
+    """Read-only view of a packed archive; lookups binary-search the mapped index
+
+    Views returned by get()/sprite() point into the mapping; release them before close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, version, self.alignment, self.count, index_offset, index_length, strings_offset, strings_length = \
+            HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != ARCHIVE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {ARCHIVE_VERSION} roster archive")
+        self._index = self._view[index_offset:index_offset + index_length]
+        self._strings = self._view[strings_offset:strings_offset + strings_length]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, path):
+        return self._find(path) is not None
+
+    def close(self):
+        for name in ('_index', '_strings', '_view'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _record(self, position):
+        return RECORD.unpack_from(self._index, position * RECORD.size)
+
+    def _name(self, record):
+        return self._strings[record[0]:record[0] + record[1]].tobytes()
+
+    def _entry(self, record):
+        return ArchiveEntry(self._name(record).decode('utf-8'), record[4], record[2], record[3],
+                            record[5], record[6], record[7], (record[8], record[9]))
+
+    def _find(self, path):
+        target = _normalize(path).encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(self._record(middle)) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            record = self._record(low)
+            if self._name(record) == target:
+                return record
+        return None
+
+    def entry(self, path):
+        """ArchiveEntry metadata for `path`, or None"""
+        record = self._find(path)
+        return self._entry(record) if record is not None else None
+
+    def get(self, path):
+        """Zero-copy memoryview of an entry's bytes, or None"""
+        record = self._find(path)
+        if record is None:
+            return None
+        return self._view[record[2]:record[2] + record[3]]
+
+    def sprite(self, sff_path, group, number):
+        """(RGBA memoryview, (width, height), axis) of a pre-decoded sprite, or None"""
+        record = self._find(sprite_path(_normalize(sff_path), group, number))
+        if record is None or record[4] != KIND_SPRITE:
+            return None
+        return self._view[record[2]:record[2] + record[3]], (record[6], record[7]), (record[8], record[9])
+
+    def entries(self, prefix=''):
+        """ArchiveEntry for every path starting with `prefix`, in path order"""
+        prefix = _normalize(prefix).encode('utf-8')
+        for position in range(self.count):
+            record = self._record(position)
+            if self._name(record).startswith(prefix):
+                yield self._entry(record)
+
+    def verify(self):
+        """Paths whose CRC does not match their data"""
+        bad = []
+        for position in range(self.count):
+            record = self._record(position)
+            if zlib.crc32(self._view[record[2]:record[2] + record[3]]) != record[5]:
+                bad.append(self._name(record).decode('utf-8'))
+        return bad
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Pack a roster into one mmap-able archive")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    pack_cmd = commands.add_parser('pack', help="Pack every roster file under a directory")
+    pack_cmd.add_argument('root', help="Roster root, e.g. assets/mugen")
+    pack_cmd.add_argument('--out', default='roster.pak')
+    pack_cmd.add_argument('--decode', action='store_true', help="Also store decoded RGBA sprites")
+    pack_cmd.add_argument('--align', type=int, default=DEFAULT_ALIGNMENT, help="Entry alignment in bytes")
+    pack_cmd.add_argument('--workers', type=int, default=None, help="Decode worker processes")
+    list_cmd = commands.add_parser('list', help="List entries")
+    list_cmd.add_argument('archive')
+    list_cmd.add_argument('--prefix', default='')
+    verify_cmd = commands.add_parser('verify', help="Check entry CRCs")
+    verify_cmd.add_argument('archive')
+    args = arg_parser.parse_args()
+
+    if args.command == 'pack':
+        if not pack_archive(args.root, args.out, args.decode, args.align, args.workers):
+            raise SystemExit(1)
+        raise SystemExit(0)
+
+    start = time.perf_counter()
+    with RosterArchive(args.archive) as archive:
+        opened_ms = (time.perf_counter() - start) * 1000
+        if args.command == 'list':
+            for item in archive.entries(args.prefix):
+                size = f" {item.width}x{item.height}" if item.kind == KIND_SPRITE else ""
+                print(f"{item.length:>10} {item.path}{size}")
+            print(f"⏱️ {len(archive)} entries, opened in {opened_ms:.2f} ms")
+        else:
+            bad = archive.verify()
+            for path in bad:
+                print(f"❌ CRC mismatch: {path}")
+            print(f"{'✅' if not bad else '❌'} {len(archive) - len(bad)}/{len(archive)} entries OK")
+            if bad:
+                raise SystemExit(1)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Asyncio facade over SFFParser
+    sff = await open_sff(path)
+    img = await sff.get(group, number)
+Parsing and decoding run in an executor (the loop's default thread pool unless one is given),
+each open file bounds how many decodes it runs at once, and concurrent requests for the same
+sprite share a single decode.
+Run: python mugen_async.py file.sff [--concurrency N] [--requests N]
+"""
+
+import asyncio
+import time
+
+DEFAULT_CONCURRENCY = 4
+
+
+async def open_sff(path, executor=None, max_concurrency=DEFAULT_CONCURRENCY, pixel_cache_size=256):
+    """Parse `path` off the event loop; returns an AsyncSFF, or None if it cannot be parsed"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False, pixel_cache_size=pixel_cache_size)
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(executor, parser.parse_file, path):
+        return None
+    return AsyncSFF(path, parser, executor, max_concurrency)
+
+
+class AsyncSFF:
+    """One parsed SFF; get() may be awaited from any number of tasks"""
+
+    def __init__(self, path, parser, executor=None, max_concurrency=DEFAULT_CONCURRENCY):
+        self.path = path
+        self.parser = parser
+        self.executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight = {}  # (group, number) -> Task decoding it
+        self.requests = 0
+        self.decodes = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def __contains__(self, key):
+        return tuple(key) in self.parser.sprites
+
+    @property
+    def sprites(self):
+        return self.parser.sprites
+
+    async def get(self, group, number):
+        """RGBA image of one sprite, or None if the file has no such sprite"""
+        key = (group, number)
+        if key not in self.parser.sprites:
+            return None
+        self.requests += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._decode(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        # A cancelled caller must not cancel the decode other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def get_many(self, keys):
+        """{key: image or None} for every requested key"""
+        keys = list(dict.fromkeys(tuple(key) for key in keys))
+        images = await asyncio.gather(*(self.get(*key) for key in keys))
+        return dict(zip(keys, images))
+
+    async def _decode(self, key):
+        async with self._semaphore:
+            self.decodes += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.parser.extract_sprite_image, self.path, *key)
+
+    async def close(self):
+        """Wait for decodes still in flight"""
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+
+async def _demo(path, concurrency, requests):
+    import random
+
+    start = time.perf_counter()
+    sff = await open_sff(path, max_concurrency=concurrency, pixel_cache_size=0)
+    if sff is None:
+        return False
+    opened = time.perf_counter() - start
+    keys = list(sff.sprites)
+    rng = random.Random(0)
+    # Overlapping requests with repeats, as a preview page would issue them
+    wanted = [rng.choice(keys) for _ in range(requests)]
+    start = time.perf_counter()
+    async with sff:
+        images = await asyncio.gather(*(sff.get(*key) for key in wanted))
+    elapsed = time.perf_counter() - start
+    print(f"✅ {sum(img is not None for img in images)}/{len(wanted)} requests served by {sff.decodes} decodes "
+          f"of {len(keys)} sprites")
+    print(f"⏱️ opened in {opened * 1000:.1f} ms, served in {elapsed * 1000:.1f} ms")
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Serve overlapping sprite requests through the async facade")
+    arg_parser.add_argument('sff', help="SFF file")
+    arg_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="Decodes at once")
+    arg_parser.add_argument('--requests', type=int, default=200)
+    args = arg_parser.parse_args()
+
+    if not asyncio.run(_demo(args.sff, args.concurrency, args.requests)):
+        raise SystemExit(1)
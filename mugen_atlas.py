@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Select-screen portrait atlas baker
+Pulls only the 9000,0 (small) and 9000,1 (large) portraits out of every select.def character,
+packs each size into one atlas PNG and writes a JSON manifest of the rectangles per character,
+so the select screen needs one texture load per portrait size regardless of roster size.
+Run: python mugen_atlas.py assets/mugen/data/select.def --out assets/mugen/portraits
+"""
+
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mugen_def import CharacterDef, SelectDef
+from mugen_roster import PORTRAITS, default_chars_dir
+
+ATLAS_PADDING = 1
+MAX_ATLAS_WIDTH = 4096
+
+
+def _portrait_worker(job):
+    """Worker process: index just the portrait headers of one SFF and decode them to RGBA bytes
+
+    Portraits that fail to decode are left out, so the character lands in the missing list.
+    """
+    from mugen_prototype import SFFParser
+
+    name, sff_path = job
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(sff_path, only=PORTRAITS.values()):
+        return name, {}
+    present = [key for key in PORTRAITS.values() if key in parser.sprites]
+    images = parser.extract_sprites(sff_path, present)
+    portraits = {}
+    for size, key in PORTRAITS.items():
+        img = images.get(key)
+        if img is not None:
+            img = img.convert('RGBA')
+            portraits[size] = (img.size, list(parser.sprites[key].offset), img.tobytes())
+    return name, portraits
+
+
+def character_sprite_files(select_path, chars_dir):
+    """[(select name, sff path)] for every character entry, in select.def order"""
+    select = SelectDef()
+    if not select.parse_file(select_path):
+        return None
+    jobs = []
+    seen = set()
+    for entry in select.characters:
+        if entry['type'] != 'character' or entry['name'] in seen:
+            continue
+        seen.add(entry['name'])
+        definition = CharacterDef()
+        def_path = os.path.join(chars_dir, entry['def_path'].replace('\\', '/'))
+        if not os.path.exists(def_path) or not definition.parse_file(def_path):
+            print(f"⚠️ Skipping {entry['name']}: DEF not found at {def_path}")
+            continue
+        sprite_file = definition.get_sprite_file()
+        if not sprite_file:
+            print(f"⚠️ Skipping {entry['name']}: no sprite file in DEF")
+            continue
+        jobs.append((entry['name'], definition.resolve(sprite_file)))
+    return jobs
+
+
+def pack_shelves(sizes, padding=ATLAS_PADDING, max_width=MAX_ATLAS_WIDTH):
+    """Shelf-pack (width, height) boxes; returns (atlas width, atlas height, [(x, y)] per box)
+
+    Boxes are placed tallest first so each shelf wastes little height. The atlas width is
+    the smallest power of two that keeps the result roughly square.
+    """
+    if not sizes:
+        return 0, 0, []
+    area = sum((w + padding) * (h + padding) for w, h in sizes)
+    widest = max(w for w, _ in sizes) + padding
+    width = 1 << max(0, math.ceil(math.log2(max(widest, math.sqrt(area)))))
+    width = max(min(width, max_width), widest)
+
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for index in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[index]
+        if x + w + padding > width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[index] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h + padding)
+    return width, y + shelf_height, positions
+
+
+def bake_portraits(select_path, out_dir, chars_dir=None, max_workers=None, verbose=True):
+    """Write portraits_<size>.png atlases and portraits.json into out_dir; returns the manifest"""
+    from PIL import Image
+
+    start = time.perf_counter()
+    jobs = character_sprite_files(select_path, chars_dir or default_chars_dir(select_path))
+    if jobs is None:
+        return None
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_portrait_worker, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        results = [_portrait_worker(job) for job in jobs]
+    if verbose:
+        print(f"🎨 Decoded portraits of {len(results)} characters in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+    for size in PORTRAITS:
+        entries = [(name, portraits[size]) for name, portraits in results if size in portraits]
+        image_name = f"portraits_{size}.png"
+        width, height, positions = pack_shelves([entry[0] for _, entry in entries])
+        characters = {}
+        if entries:
+            atlas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+            for (name, (sprite_size, axis, data)), (x, y) in zip(entries, positions):
+                atlas.paste(Image.frombytes('RGBA', sprite_size, data), (x, y))
+                characters[name] = {'x': x, 'y': y, 'w': sprite_size[0], 'h': sprite_size[1], 'axis': axis}
+            atlas.save(os.path.join(out_dir, image_name), optimize=True)
+        manifest[size] = {
+            'image': image_name if entries else None,
+            'size': [width, height],
+            'group': PORTRAITS[size][0],
+            'number': PORTRAITS[size][1],
+            'characters': characters,
+            'missing': [name for name, portraits in results if size not in portraits],
+        }
+        if verbose:
+            print(f"  ✅ {image_name}: {len(characters)} portraits in {width}x{height}"
+                  + (f", {len(manifest[size]['missing'])} missing" if manifest[size]['missing'] else ""))
+
+    with open(os.path.join(out_dir, 'portraits.json'), 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    if verbose:
+        print(f"✅ Baked portrait atlases into {out_dir} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Bake select-screen portrait atlases from select.def")
+    arg_parser.add_argument('select', help="Path to select.def")
+    arg_parser.add_argument('--out', default='portraits', help="Output directory")
+    arg_parser.add_argument('--chars', default=None, help="Characters directory (default: ../chars from select.def)")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args()
+
+    if bake_portraits(args.select, args.out, args.chars, args.workers) is None:
+        raise SystemExit(1)
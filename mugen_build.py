@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Incremental asset build pipeline
+Runs parse -> decode -> trim -> atlas for every select.def character, then writes one build
+manifest. Each stage result is cached under a key made of the SFF content hash, the stage's
+parameters and a digest of the tool code, so only characters whose files (or whose tools)
+changed are rebuilt. Characters build in parallel worker processes; --watch polls the asset
+tree and rebuilds just the characters whose files changed.
+Run: python mugen_build.py assets/mugen/data/select.def --out build [--watch]
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from mugen_atlas import ATLAS_PADDING, MAX_ATLAS_WIDTH, character_sprite_files, pack_shelves
+from mugen_roster import default_chars_dir
+
+BUILD_VERSION = 1
+# Modules whose code a stage runs; editing one invalidates that stage and everything after it
+STAGE_MODULES = {
+    'parse': ('mugen_prototype.py',),
+    'decode': ('mugen_prototype.py',),
+    'trim': ('mugen_build.py',),
+    'atlas': ('mugen_build.py', 'mugen_atlas.py'),
+    'manifest': ('mugen_build.py',),
+}
+HASH_CHUNK = 1 << 20
+WATCH_EXTENSIONS = ('.def', '.sff', '.act')
+
+
+def file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _code_digest(stage):
+    here = os.path.dirname(os.path.abspath(__file__))
+    hasher = hashlib.sha256(f"{BUILD_VERSION}:{stage}".encode())
+    for name in STAGE_MODULES[stage]:
+        with open(os.path.join(here, name), 'rb') as f:
+            hasher.update(f.read())
+    return hasher.hexdigest()
+
+
+def stage_key(stage, *inputs):
+    """Cache key for a stage from its upstream keys/content hashes and parameters"""
+    payload = json.dumps([stage, _code_digest(stage), *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class HashMemo:
+    """Content hashes keyed by path, reused while a file's size and mtime are unchanged"""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.hashed = 0
+
+    def digest(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = file_digest(path)
+        self.entries[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        self.hashed += 1
+        return digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+
+class BuildCache:
+    """Content-addressed store of pickled stage results: <dir>/<stage>/<key[:2]>/<key>"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, key[:2], key)
+
+    def get(self, stage, key):
+        try:
+            with open(self._path(stage, key), 'rb') as f:
+                return pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            return None
+
+    def put(self, stage, key, value):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1))
+        os.replace(temp_path, path)
+        return value
+
+
+# Stage implementations
+
+def parse_stage(sff_path):
+    """SFF version and sprite table"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(sff_path):
+        raise ValueError(f"could not parse {sff_path}")
+    sprites = [(group, number, sprite.size[0], sprite.size[1], sprite.offset[0], sprite.offset[1])
+               for (group, number), sprite in sorted(parser.sprites.items())]
+    return {'sff_version': parser.header.ver0, 'sprites': sprites}
+
+
+def decode_stage(sff_path):
+    """Every sprite as {(group, number): ((w, h), (axis x, axis y), RGBA bytes)}
+
+    Sprites that fail to decode are left out rather than stood in for by placeholders.
+    """
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(sff_path):
+        raise ValueError(f"could not parse {sff_path}")
+    decoded = {}
+    for (group, number), img in parser.extract_sprites(sff_path, sorted(parser.sprites)).items():
+        if img is not None:
+            img = img.convert('RGBA')
+            decoded[(group, number)] = (img.size, tuple(parser.sprites[(group, number)].offset), img.tobytes())
+    return decoded
+
+
+def trim_stage(decoded):
+    """Crop transparent borders, moving the axis so sprites still line up"""
+    from PIL import Image
+
+    trimmed = {}
+    for key, (size, axis, data) in decoded.items():
+        img = Image.frombytes('RGBA', size, data)
+        box = img.getchannel('A').getbbox()
+        if box is None:
+            trimmed[key] = ((0, 0), (0, 0), b'')
+            continue
+        if box != (0, 0) + tuple(size):
+            img = img.crop(box)
+        trimmed[key] = (img.size, (axis[0] - box[0], axis[1] - box[1]), img.tobytes())
+    return trimmed
+
+
+def atlas_stage(trimmed, padding=ATLAS_PADDING, max_width=MAX_ATLAS_WIDTH):
+    """Pack trimmed sprites into one PNG; returns (png bytes, {"group,number": rect})"""
+    import io
+    from PIL import Image
+
+    keys = [key for key in sorted(trimmed) if trimmed[key][0][0] and trimmed[key][0][1]]
+    width, height, positions = pack_shelves([trimmed[key][0] for key in keys], padding, max_width)
+    frames = {}
+    atlas = Image.new('RGBA', (max(width, 1), max(height, 1)), (0, 0, 0, 0))
+    for key, (x, y) in zip(keys, positions):
+        size, axis, data = trimmed[key]
+        atlas.paste(Image.frombytes('RGBA', size, data), (x, y))
+        frames[f"{key[0]},{key[1]}"] = {'x': x, 'y': y, 'w': size[0], 'h': size[1], 'axis': list(axis)}
+    for key in sorted(trimmed):
+        if key not in frames and not trimmed[key][0][0]:
+            frames[f"{key[0]},{key[1]}"] = {'x': 0, 'y': 0, 'w': 0, 'h': 0, 'axis': [0, 0]}
+    buffer = io.BytesIO()
+    atlas.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), frames
+
+
+def _write_atomic(path, data):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def build_character(job):
+    """Worker: bring one character's outputs up to date; returns (name, info, stages run)"""
+    name, sff_path, sff_hash, cache_dir, out_dir, padding, max_width = job
+    cache = BuildCache(cache_dir)
+    keys = {'parse': stage_key('parse', sff_hash), 'decode': stage_key('decode', sff_hash)}
+    keys['trim'] = stage_key('trim', keys['decode'])
+    keys['atlas'] = stage_key('atlas', keys['trim'], padding, max_width)
+    ran = []
+
+    def run(stage, compute):
+        value = cache.get(stage, keys[stage])
+        if value is None:
+            value = cache.put(stage, keys[stage], compute())
+            ran.append(stage)
+        return value
+
+    character_dir = os.path.join(out_dir, name)
+    png_path = os.path.join(character_dir, 'atlas.png')
+    frames_path = os.path.join(character_dir, 'atlas.json')
+    parsed = run('parse', lambda: parse_stage(sff_path))
+    info = {'sff_version': parsed['sff_version'], 'sprite_count': len(parsed['sprites']),
+            'sff_hash': sff_hash, 'key': keys['atlas'],
+            'atlas': os.path.relpath(png_path, out_dir).replace(os.sep, '/'),
+            'frames': os.path.relpath(frames_path, out_dir).replace(os.sep, '/')}
+
+    try:
+        with open(frames_path) as f:
+            written = json.load(f)
+        current = written.get('key') == keys['atlas'] and os.path.exists(png_path)
+    except (OSError, ValueError):
+        current = False
+    if current:
+        info['failed'] = written.get('failed', [])
+        return name, info, ran
+
+    # Later stages are only computed when their own cache entry is missing
+    png, frames = run('atlas', lambda: atlas_stage(
+        run('trim', lambda: trim_stage(run('decode', lambda: decode_stage(sff_path)))), padding, max_width))
+    # Sprites in the table but not in the atlas failed to decode
+    info['failed'] = [f"{group},{number}" for group, number, *_ in parsed['sprites']
+                      if f"{group},{number}" not in frames]
+    for key in info['failed']:
+        print(f"⚠️ {name}: sprite {key} failed to decode")
+    os.makedirs(character_dir, exist_ok=True)
+    _write_atomic(png_path, png)
+    _write_atomic(frames_path, json.dumps({'key': keys['atlas'], 'frames': frames, 'failed': info['failed']},
+                                          separators=(',', ':')).encode())
+    ran.append('write')
+    return name, info, ran
+
+
+def _build_worker(job):
+    try:
+        return build_character(job)
+    except Exception as e:
+        return job[0], None, [f"error: {e}"]
+
+
+def _top_dir(path, root):
+    return os.path.relpath(os.path.abspath(path), os.path.abspath(root)).split(os.sep)[0]
+
+
+def build(select_path, out_dir, chars_dir=None, cache_dir=None, max_workers=None, only=None,
+          padding=ATLAS_PADDING, max_width=MAX_ATLAS_WIDTH, verbose=True):
+    """Bring out_dir up to date for select.def; returns the build manifest or None
+
+    `only` limits the work to characters with those names or directories under chars_dir
+    (used by --watch); the manifest still lists everyone, reusing the previous manifest's
+    entries for the rest.
+    """
+    start = time.perf_counter()
+    chars_dir = chars_dir or default_chars_dir(select_path)
+    cache_dir = cache_dir or os.path.join(out_dir, '.cache')
+    manifest_path = os.path.join(out_dir, 'build_manifest.json')
+    sources = character_sprite_files(select_path, chars_dir)
+    if sources is None:
+        return None
+
+    previous = {}
+    if only is not None:
+        try:
+            with open(manifest_path) as f:
+                previous = json.load(f).get('characters', {})
+        except (OSError, ValueError):
+            only = None  # No manifest to reuse entries from
+
+    memo = HashMemo(os.path.join(cache_dir, 'hashes.json'))
+    jobs = []
+    for name, sff_path in sources:
+        if only is not None and name in previous and not {name, _top_dir(sff_path, chars_dir)} & only:
+            continue
+        if not os.path.exists(sff_path):
+            print(f"⚠️ Skipping {name}: SFF not found at {sff_path}")
+            continue
+        jobs.append((name, sff_path, memo.digest(sff_path), cache_dir, out_dir, padding, max_width))
+    memo.save()
+
+    results = {}
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, info, ran in pool.map(_build_worker, jobs):
+                results[name] = (info, ran)
+    else:
+        for job in jobs:
+            name, info, ran = _build_worker(job)
+            results[name] = (info, ran)
+
+    characters = {}
+    for name, _ in sources:
+        if name in results:
+            info, ran = results[name]
+            if info is None:
+                print(f"❌ {name}: {ran[0]}")
+                continue
+            characters[name] = info
+            if verbose and ran:
+                print(f"  🔨 {name}: {', '.join(ran)}")
+        elif name in previous:
+            characters[name] = previous[name]
+
+    manifest_key = stage_key('manifest', file_digest(select_path),
+                             sorted((name, info['key']) for name, info in characters.items()))
+    manifest = {'version': BUILD_VERSION, 'key': manifest_key, 'characters': characters}
+    try:
+        with open(manifest_path) as f:
+            manifest_current = json.load(f).get('key') == manifest_key
+    except (OSError, ValueError):
+        manifest_current = False
+    if not manifest_current:
+        os.makedirs(out_dir, exist_ok=True)
+        _write_atomic(manifest_path, json.dumps(manifest, separators=(',', ':')).encode())
+
+    if verbose:
+        rebuilt = sum(1 for info, ran in results.values() if info is not None and 'write' in ran)
+        print(f"✅ Build of {len(characters)} characters: {rebuilt} rebuilt, {len(characters) - rebuilt} up to date, "
+              f"{memo.hashed} files hashed, manifest {'unchanged' if manifest_current else 'written'} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return manifest
+
+
+def snapshot_tree(roots):
+    """{path: (size, mtime_ns)} for every watched file under `roots`"""
+    snapshot = {}
+    for root in roots:
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                if filename.lower().endswith(WATCH_EXTENSIONS):
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[os.path.abspath(path)] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def watch(select_path, out_dir, chars_dir=None, interval=1.0, **options):
+    """Build, then poll the select.def and character directories and rebuild what changed"""
+    chars_dir = os.path.abspath(chars_dir or default_chars_dir(select_path))
+    select_path = os.path.abspath(select_path)
+    roots = [os.path.dirname(select_path), chars_dir]
+    build(select_path, out_dir, chars_dir, **options)
+    snapshot = snapshot_tree(roots)
+    print(f"👀 Watching {', '.join(roots)} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_tree(roots)
+            changed = {path for path in current.keys() | snapshot.keys() if current.get(path) != snapshot.get(path)}
+            snapshot = current
+            if not changed:
+                continue
+            if select_path in changed:
+                only = None
+            else:
+                only = {_top_dir(path, chars_dir) for path in changed if path.startswith(chars_dir + os.sep)}
+            print(f"🔄 {len(changed)} file(s) changed" + (f": {', '.join(sorted(only))}" if only else ""))
+            build(select_path, out_dir, chars_dir, only=only, **options)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Incremental SFF asset build (parse, decode, trim, atlas, manifest)")
+    arg_parser.add_argument('select', help="Path to select.def")
+    arg_parser.add_argument('--out', default='build', help="Output directory")
+    arg_parser.add_argument('--chars', default=None, help="Characters directory (default: ../chars from select.def)")
+    arg_parser.add_argument('--cache', default=None, help="Stage cache directory (default: <out>/.cache)")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument('--watch', action='store_true', help="Keep running and rebuild on changes")
+    arg_parser.add_argument('--interval', type=float, default=1.0, help="Watch poll interval in seconds")
+    args = arg_parser.parse_args()
+
+    options = {'cache_dir': args.cache, 'max_workers': args.workers}
+    if args.watch:
+        watch(args.select, args.out, args.chars, args.interval, **options)
+    elif build(args.select, args.out, args.chars, **options) is None:
+        raise SystemExit(1)
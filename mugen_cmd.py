@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+MUGEN CMD (command) parser built on mugen_text's tokenizer
+Mirrors scripts/mugen/cmd_parser.gd; the [Statedef -1] command states reuse the CNS parser
+Commands compile into step matchers driven by a shared per-player input buffer
+Run: python mugen_cmd.py <file.cmd> [--bench PLAYERS]
+"""
+
+import re
+import time
+
+from mugen_cns import CNSParser
+from mugen_text import KEY, SECTION, read_text, split_values, tokenize, unquote
+
+DEFAULT_COMMAND_TIME = 15
+DEFAULT_BUFFER_TIME = 1
+COMMAND_TRIGGER = re.compile(r'\bcommand\s*=\s*"([^"]*)"', re.IGNORECASE)
+
+
+class Command:
+    """One [Command] block"""
+    def __init__(self, lineno):
+        self.lineno = lineno
+        self.name = ''
+        self.input = []  # e.g. ['~D', 'DF', 'F', 'x']
+        self.time = None  # None until set; falls back to [Defaults] command.time
+        self.buffer_time = None
+
+
+class CMDParser:
+    """Parses .cmd files into commands, [Remap] and the [Statedef -1] command states"""
+    def __init__(self):
+        self.commands = []
+        self.remap = {}
+        self.default_time = DEFAULT_COMMAND_TIME
+        self.default_buffer_time = DEFAULT_BUFFER_TIME
+        self.states = {}  # {state number: mugen_cns.StateDef}, normally just -1
+
+    def parse_file(self, filepath):
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading CMD file {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        self.commands = []
+        self.remap = {}
+        self.default_time = DEFAULT_COMMAND_TIME
+        self.default_buffer_time = DEFAULT_BUFFER_TIME
+        tokens = list(tokenize(text))
+
+        section = ''
+        command = None
+        for kind, lineno, key, value in tokens:
+            if kind == SECTION:
+                section = key.lower()
+                command = None
+                if section == 'command':
+                    command = Command(lineno)
+                    self.commands.append(command)
+                continue
+            if kind != KEY:
+                continue
+            if command is not None:
+                if key == 'name':
+                    command.name = unquote(value)
+                elif key == 'command':
+                    command.input = [step for step in split_values(value) if step]
+                elif key == 'time':
+                    command.time = _to_int(value, DEFAULT_COMMAND_TIME)
+                elif key == 'buffer.time':
+                    command.buffer_time = _to_int(value, DEFAULT_BUFFER_TIME)
+            elif section == 'remap':
+                self.remap[key] = value
+            elif section == 'defaults':
+                if key == 'command.time':
+                    self.default_time = _to_int(value, DEFAULT_COMMAND_TIME)
+                elif key == 'command.buffer.time':
+                    self.default_buffer_time = _to_int(value, DEFAULT_BUFFER_TIME)
+
+        for command in self.commands:
+            if command.time is None:
+                command.time = self.default_time
+            if command.buffer_time is None:
+                command.buffer_time = self.default_buffer_time
+
+        # The same token stream feeds the state parser, so the file is only tokenized once
+        states = CNSParser()
+        states.parse_tokens(tokens)
+        self.states = states.states
+        return self.commands
+
+    def get_command_names(self):
+        """Distinct command names in definition order"""
+        return list(dict.fromkeys(command.name for command in self.commands))
+
+    def get_state_cmds(self):
+        """[(command name, target state)] pairs from ChangeState controllers in [Statedef -1]"""
+        pairs = []
+        state = self.states.get(-1)
+        if state is None:
+            return pairs
+        for controller in state.controllers:
+            if controller.type.lower() != 'changestate':
+                continue
+            target = _to_int(controller.params.get('value', ''), None)
+            for _, condition, _ in controller.triggers:
+                for name in COMMAND_TRIGGER.findall(condition):
+                    pairs.append((name, target))
+        return pairs
+
+
+def _to_int(text, default):
+    try:
+        return int(text.strip())
+    except ValueError:
+        return default
+
+
+# Input bits: directions are relative to facing (F = toward the opponent)
+INPUT_BITS = {
+    'U': 1 << 0, 'D': 1 << 1, 'B': 1 << 2, 'F': 1 << 3,
+    'a': 1 << 4, 'b': 1 << 5, 'c': 1 << 6, 'x': 1 << 7, 'y': 1 << 8, 'z': 1 << 9,
+    's': 1 << 10, 'd': 1 << 11, 'w': 1 << 12,
+}
+DIRECTION_MASK = INPUT_BITS['U'] | INPUT_BITS['D'] | INPUT_BITS['B'] | INPUT_BITS['F']
+DIRECTIONS = {
+    'U': INPUT_BITS['U'], 'D': INPUT_BITS['D'], 'B': INPUT_BITS['B'], 'F': INPUT_BITS['F'],
+    'UB': INPUT_BITS['U'] | INPUT_BITS['B'], 'UF': INPUT_BITS['U'] | INPUT_BITS['F'],
+    'DB': INPUT_BITS['D'] | INPUT_BITS['B'], 'DF': INPUT_BITS['D'] | INPUT_BITS['F'],
+}
+BIT_COUNT = len(INPUT_BITS)
+
+
+class CommandSyntaxError(ValueError):
+    pass
+
+
+def input_mask(*symbols):
+    """Held-input mask for symbols such as ('DF', 'x'); directions are upper case, buttons lower"""
+    mask = 0
+    for symbol in symbols:
+        if symbol in DIRECTIONS:
+            mask |= DIRECTIONS[symbol]
+        elif symbol in INPUT_BITS:
+            mask |= INPUT_BITS[symbol]
+        else:
+            raise CommandSyntaxError(f"unknown input symbol {symbol!r}")
+    return mask
+
+
+class InputBuffer:
+    """Per-player input history shared by every command recognizer reading it
+
+    push() is called once per tick; it derives the press/release edges and hold lengths
+    that all command steps test, so no step ever rescans history.
+    """
+    def __init__(self, history=64):
+        self.history = [0] * history  # Ring buffer of held masks
+        self.tick = -1
+        self.held = self.prev = self.changed = self.pressed = self.released = 0
+        self.dir = self.prev_dir = 0
+        self.dir_run = self.prev_dir_run = 0
+        self.counters = [0] * BIT_COUNT  # Ticks each bit has been held, through this tick
+        self.prev_counters = [0] * BIT_COUNT
+
+    def push(self, held):
+        self.tick += 1
+        self.history[self.tick % len(self.history)] = held
+        self.prev, self.held = self.held, held
+        self.changed = held ^ self.prev
+        self.pressed = held & self.changed
+        self.released = self.prev & self.changed
+        self.prev_dir, self.dir = self.dir, held & DIRECTION_MASK
+        self.prev_dir_run = self.dir_run
+        self.dir_run = self.dir_run + 1 if self.dir == self.prev_dir else 1
+        self.prev_counters, counters = self.counters, self.prev_counters
+        for bit in range(BIT_COUNT):
+            counters[bit] = self.prev_counters[bit] + 1 if held >> bit & 1 else 0
+        self.counters = counters
+
+    def held_at(self, ticks_ago):
+        """Held mask `ticks_ago` ticks before the current one (within the history length)"""
+        return self.history[(self.tick - ticks_ago) % len(self.history)]
+
+
+def _bits(mask):
+    return [bit for bit in range(BIT_COUNT) if mask >> bit & 1]
+
+
+def _compile_element(text):
+    """Compile one element (e.g. '~30$B', '/F', 'x') into (level, edge, trigger mask) closures"""
+    release = hold = any_direction = False
+    charge = 0
+    index = 0
+    while index < len(text) and text[index] in '~/$':
+        marker = text[index]
+        index += 1
+        if marker == '~':
+            release = True
+            digits = index
+            while index < len(text) and text[index].isdigit():
+                index += 1
+            charge = int(text[digits:index]) if index > digits else 0
+        elif marker == '/':
+            hold = True
+        else:
+            any_direction = True
+    symbol = text[index:].strip()
+
+    if symbol in DIRECTIONS:
+        value = DIRECTIONS[symbol]
+        if any_direction:
+            bits = _bits(value)
+            now = lambda b: (b.held & value) == value
+            before = lambda b: (b.prev & value) == value
+            held_for = lambda b: min(b.prev_counters[bit] for bit in bits)
+        else:
+            now = lambda b: b.dir == value
+            before = lambda b: b.prev_dir == value
+            held_for = lambda b: b.prev_dir_run
+        trigger = DIRECTION_MASK
+    elif symbol in INPUT_BITS and symbol not in DIRECTIONS:
+        value = INPUT_BITS[symbol]
+        bit = _bits(value)[0]
+        now = lambda b: b.held & value
+        before = lambda b: b.prev & value
+        held_for = lambda b: b.prev_counters[bit]
+        trigger = value
+    else:
+        raise CommandSyntaxError(f"unknown command symbol {text!r}")
+
+    if release:
+        level = lambda b: not now(b)
+        if charge:
+            edge = lambda b: before(b) and not now(b) and held_for(b) >= charge
+        else:
+            edge = lambda b: before(b) and not now(b)
+        return level, edge, trigger
+    if hold:
+        return now, now, None  # Held inputs match on every tick, not just edges
+    return now, lambda b: now(b) and not before(b), trigger
+
+
+class CommandStep:
+    """One comma-separated step: elements joined by '+', optionally '>' (nothing in between)"""
+    def __init__(self, text):
+        text = text.strip()
+        self.text = text
+        self.strict = text.startswith('>')
+        if self.strict:
+            text = text[1:].strip()
+        parts = [part.strip() for part in text.split('+')]
+        if not all(parts):
+            raise CommandSyntaxError(f"empty element in step {self.text!r}")
+        self.release_only = all(part.startswith('~') for part in parts)
+        elements = [_compile_element(part) for part in parts]
+        # None means the step can match without an input edge (a '/' hold)
+        self.trigger_mask = None
+        if all(element[2] is not None for element in elements):
+            self.trigger_mask = 0
+            for element in elements:
+                self.trigger_mask |= element[2]
+
+        if len(elements) == 1:
+            self.matches = elements[0][1]
+        else:
+            levels = [element[0] for element in elements]
+            edges = [element[1] for element in elements]
+            # Every element satisfied this tick, at least one of them newly
+            self.matches = lambda b: all(level(b) for level in levels) and any(edge(b) for edge in edges)
+
+
+class CompiledCommand:
+    def __init__(self, command):
+        self.name = command.name
+        self.time = command.time
+        self.buffer_time = max(1, command.buffer_time)
+        self.steps = [CommandStep(step) for step in command.input]
+        if not self.steps:
+            raise CommandSyntaxError(f"command {command.name!r} has no steps")
+
+
+class CommandSet:
+    """Immutable compiled commands, shared by every player's recognizer"""
+    def __init__(self, commands):
+        self.commands = []
+        self.errors = []
+        for command in commands:
+            try:
+                self.commands.append(CompiledCommand(command))
+            except CommandSyntaxError as e:
+                self.errors.append((command, str(e)))
+                print(f"⚠️ Skipping command {command.name!r} (line {command.lineno}): {e}")
+        self.names = sorted({command.name for command in self.commands})
+        # First steps indexed by input bit, so starting a match only looks at commands whose
+        # first step an input edge this tick could satisfy
+        self.starts_by_bit = [[] for _ in range(BIT_COUNT)]
+        self.starts_always = []
+        for index, command in enumerate(self.commands):
+            mask = command.steps[0].trigger_mask
+            if mask is None:
+                self.starts_always.append(index)
+            else:
+                for bit in _bits(mask):
+                    self.starts_by_bit[bit].append(index)
+
+
+class CommandRecognizer:
+    """Tracks partial matches of a CommandSet against one player's InputBuffer
+
+    Partial matches are (command, next step) -> tick of the first step. Only the latest
+    start is kept per pair because it dominates earlier ones, so each tick costs
+    O(active partial matches + commands started by this tick's edges).
+    """
+    def __init__(self, command_set):
+        self.command_set = command_set
+        self.partials = {}
+        self.completed_at = {}  # Command name -> tick it last completed
+        self.active_until = {}  # Command name -> last tick it stays active (buffer.time)
+
+    def reset(self):
+        self.partials = {}
+        self.completed_at = {}
+        self.active_until = {}
+
+    def _complete(self, command, tick):
+        self.completed_at[command.name] = tick
+        until = tick + command.buffer_time - 1
+        if self.active_until.get(command.name, -1) < until:
+            self.active_until[command.name] = until
+
+    @staticmethod
+    def _advance(command, index, step_index, start, buffer, partials, completed):
+        """Record a match of steps[step_index] this tick
+
+        A release may share its tick with the next step (rolling ~D into DF releases D on
+        the tick DF is pressed), so release steps chain into a next step that also matches.
+        """
+        steps = command.steps
+        while step_index + 1 < len(steps):
+            next_index = step_index + 1
+            if steps[step_index].release_only and steps[next_index].matches(buffer):
+                step_index = next_index
+                continue
+            if partials.get((index, next_index), -1) < start:
+                partials[(index, next_index)] = start
+            return
+        completed.append(command)
+
+    def update(self, buffer):
+        """Advance on the tick just pushed to `buffer`; returns names completed this tick"""
+        commands = self.command_set.commands
+        tick = buffer.tick
+        changed = buffer.changed
+        completed = []
+        partials = {}
+
+        for (index, step_index), start in self.partials.items():
+            command = commands[index]
+            if tick - start > command.time:
+                continue
+            step = command.steps[step_index]
+            if step.matches(buffer):
+                self._advance(command, index, step_index, start, buffer, partials, completed)
+            elif step.strict and changed:
+                continue  # '>' allows no other input change before this step
+            if partials.get((index, step_index), -1) < start:
+                partials[(index, step_index)] = start
+
+        candidates = list(self.command_set.starts_always)
+        if changed:
+            starts_by_bit = self.command_set.starts_by_bit
+            for bit in _bits(changed):
+                candidates.extend(starts_by_bit[bit])
+        seen = set()
+        for index in candidates:
+            if index in seen:
+                continue
+            seen.add(index)
+            command = commands[index]
+            if command.steps[0].matches(buffer):
+                self._advance(command, index, 0, tick, buffer, partials, completed)
+
+        self.partials = partials
+        for command in completed:
+            self._complete(command, tick)
+        return [command.name for command in completed]
+
+    def active_commands(self, tick):
+        """Names active at `tick` (completed within their buffer.time)"""
+        return {name for name, until in self.active_until.items() if until >= tick}
+
+    def is_active(self, name, tick):
+        return self.active_until.get(name, -1) >= tick
+
+
+def compile_commands(cmd_parser):
+    """Compile a parsed CMDParser's commands into a shareable CommandSet"""
+    return CommandSet(cmd_parser.commands)
+
+
+def benchmark(command_set, players=64, ticks=3600, seed=0):
+    """Feed random inputs to `players` recognizers; returns (player-ticks per second, completions)"""
+    import random
+
+    rng = random.Random(seed)
+    symbols = list(DIRECTIONS) + ['a', 'b', 'c', 'x', 'y', 'z']
+    streams = []
+    for _ in range(players):
+        stream = []
+        held = 0
+        for _ in range(ticks):
+            if rng.random() < 0.25:
+                held = input_mask(rng.choice(symbols)) | (held & ~DIRECTION_MASK if rng.random() < 0.3 else 0)
+            stream.append(held)
+        streams.append(stream)
+
+    buffers = [InputBuffer() for _ in range(players)]
+    recognizers = [CommandRecognizer(command_set) for _ in range(players)]
+    completions = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        for buffer, recognizer, stream in zip(buffers, recognizers, streams):
+            buffer.push(stream[tick])
+            completions += len(recognizer.update(buffer))
+    elapsed = time.perf_counter() - start
+    return players * ticks / elapsed if elapsed > 0 else float('inf'), completions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Parse a MUGEN .cmd file and benchmark its compiled commands")
+    arg_parser.add_argument('cmd', help=".cmd file")
+    arg_parser.add_argument('--bench', type=int, metavar='PLAYERS', default=0,
+                            help="Simulate this many players for one minute of random input")
+    args = arg_parser.parse_args()
+
+    parser = CMDParser()
+    if not parser.parse_file(args.cmd):
+        raise SystemExit(1)
+    print(f"✅ {len(parser.commands)} commands, {len(parser.get_state_cmds())} command states")
+    for command in parser.commands:
+        print(f"  {command.name}: {', '.join(command.input)} (time {command.time})")
+
+    if args.bench:
+        command_set = compile_commands(parser)
+        rate, completions = benchmark(command_set, players=args.bench)
+        print(f"⏱️ {len(command_set.commands)} compiled commands: {rate:,.0f} player-ticks/s "
+              f"({rate / 60:,.0f} players in real time), {completions} completions")
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+MUGEN CNS / ST (constants and states) parser built on mugen_text's tokenizer
+Mirrors scripts/mugen/cns_parser.gd: [Statedef N] blocks own the [State N, label] controllers after them
+Run: python mugen_cns.py <file.cns | file.st>
+"""
+
+from mugen_text import KEY, SECTION, read_text, tokenize, unquote
+from mugen_trigger import TriggerSyntaxError, compile_conditions
+
+STATEDEF_KEYS = ('type', 'movetype', 'physics', 'anim')
+
+
+class StateController:
+    """One [State N, label] block"""
+    def __init__(self, state, label, lineno):
+        self.state = state
+        self.label = label
+        self.lineno = lineno
+        self.type = ''
+        self.triggers = []  # [(key, condition, lineno)] in file order, e.g. ('trigger1', 'time = 0', 12)
+        self.params = {}
+        self.error = None  # Trigger syntax error, if compiling failed
+        self._compiled = None
+
+    def trigger_groups(self):
+        """Return (triggerall conditions, [conditions of trigger1, trigger2, ...])
+
+        MUGEN fires the controller when every triggerall holds and every line of at least
+        one numbered trigger group holds. Numbering stops at the first missing group.
+        """
+        all_conditions = []
+        numbered = {}
+        for key, condition, _ in self.triggers:
+            if key == 'triggerall':
+                all_conditions.append(condition)
+            else:
+                try:
+                    numbered.setdefault(int(key[7:]), []).append(condition)
+                except ValueError:
+                    continue
+        groups = []
+        index = 1
+        while index in numbered:
+            groups.append(numbered[index])
+            index += 1
+        return all_conditions, groups
+
+    def compile(self):
+        """Compile the trigger lines once into f(FighterState) -> bool"""
+        if self._compiled is None:
+            try:
+                self._compiled = compile_conditions(*self.trigger_groups())
+            except TriggerSyntaxError as e:
+                self.error = str(e)
+                print(f"⚠️ [State {self.state}, {self.label}] line {self.lineno}: {e}")
+                self._compiled = _never
+        return self._compiled
+
+    def triggered(self, state):
+        return self.compile()(state)
+
+
+def _never(state):
+    return False
+
+
+class StateDef:
+    """One [Statedef N] block with its parameters and controllers"""
+    def __init__(self, number, lineno):
+        self.number = number
+        self.lineno = lineno
+        self.type = ''
+        self.movetype = ''
+        self.physics = ''
+        self.anim = 0
+        self.params = {}
+        self.controllers = []
+
+    def triggered_controllers(self, state):
+        """Controllers whose triggers fire for a FighterState, in file order"""
+        return [controller for controller in self.controllers if controller.compile()(state)]
+
+
+def _state_number(text):
+    try:
+        return int(text.strip())
+    except ValueError:
+        return None
+
+
+class CNSParser:
+    """Parses .cns/.st files into constants sections and {state number: StateDef}"""
+    def __init__(self):
+        self.constants = {}  # [Data], [Size], [Velocity], [Movement]...
+        self.states = {}
+
+    def parse_file(self, filepath):
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading CNS file {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        return self.parse_tokens(tokenize(text))
+
+    def parse_tokens(self, tokens):
+        """Build states from mugen_text tokens"""
+        self.constants = {}
+        self.states = {}
+        statedef = None
+        controller = None
+        section = None  # Constants section receiving KEY tokens
+
+        for kind, lineno, key, value in tokens:
+            if kind == SECTION:
+                head, _, rest = key.partition(' ')
+                head = head.lower()
+                section = controller = None
+                if head == 'statedef':
+                    number = _state_number(rest.partition(',')[0])
+                    statedef = None
+                    if number is not None:
+                        statedef = StateDef(number, lineno)
+                        self.states[number] = statedef
+                elif head == 'state':
+                    number_text, _, label = rest.partition(',')
+                    number = _state_number(number_text)
+                    if statedef is None and number is not None:
+                        # Controllers without a preceding Statedef (e.g. [State -1] in CMD files)
+                        statedef = self.states.get(number) or StateDef(number, lineno)
+                        self.states[number] = statedef
+                    if statedef is not None:
+                        # MUGEN ignores the number in [State N, label]; the owning Statedef wins
+                        controller = StateController(statedef.number, label.strip(), lineno)
+                        statedef.controllers.append(controller)
+                else:
+                    statedef = None
+                    section = self.constants.setdefault(key.lower(), {})
+                continue
+
+            if kind != KEY:
+                continue
+            if controller is not None:
+                if key == 'type':
+                    controller.type = value
+                elif key.startswith('trigger'):
+                    controller.triggers.append((key, value, lineno))
+                else:
+                    controller.params[key] = unquote(value)
+            elif statedef is not None:
+                if key == 'anim':
+                    try:
+                        statedef.anim = int(value)
+                    except ValueError:
+                        statedef.params[key] = value
+                elif key in STATEDEF_KEYS:
+                    setattr(statedef, key, value)
+                else:
+                    statedef.params[key] = value
+            elif section is not None:
+                section[key] = value
+        return self.states
+
+    def compile_triggers(self):
+        """Compile every controller's triggers up front; returns the number that failed"""
+        failed = 0
+        for state in self.states.values():
+            for controller in state.controllers:
+                controller.compile()
+                failed += controller.error is not None
+        return failed
+
+    def get_state(self, number):
+        return self.states.get(number)
+
+    def get_state_numbers(self):
+        return sorted(self.states)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python mugen_cns.py <file.cns | file.st>")
+        sys.exit(1)
+
+    parser = CNSParser()
+    if parser.parse_file(sys.argv[1]):
+        controllers = sum(len(state.controllers) for state in parser.states.values())
+        print(f"✅ {len(parser.states)} states, {controllers} controllers, "
+              f"{len(parser.constants)} constants sections")
+        for number in parser.get_state_numbers():
+            state = parser.states[number]
+            print(f"  [Statedef {number}] type={state.type} movetype={state.movetype} "
+                  f"anim={state.anim} controllers={len(state.controllers)}")
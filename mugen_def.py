@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+MUGEN DEF, select.def and system.def parsers built on mugen_text's tokenizer
+Mirrors scripts/mugen/def_parser.gd, select_def_parser.gd and system_def_parser.gd
+Run: python mugen_def.py <file.def | select.def | system.def>
+"""
+
+import os
+
+from mugen_text import KEY, LINE, SECTION, parse_sections, read_text, split_values, tokenize, unquote
+
+
+def _to_int(text, default=0):
+    try:
+        return int(text.strip())
+    except ValueError:
+        try:
+            return int(float(text))
+        except ValueError:
+            return default
+
+
+class CharacterDef:
+    """Character (or stage) .def file: {lower-cased section: {key: value}}"""
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.sections = {}
+
+    def parse_file(self, filepath):
+        """Parse a .def file; returns False if it cannot be read"""
+        self.filepath = filepath
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading DEF file {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        self.sections = parse_sections(tokenize(text))
+        return self.sections
+
+    def get(self, section, key, default=''):
+        return self.sections.get(section, {}).get(key, default)
+
+    @property
+    def base_dir(self):
+        return os.path.dirname(self.filepath) if self.filepath else ''
+
+    def resolve(self, relative):
+        """Path of a file referenced by this .def, relative to its folder"""
+        return os.path.join(self.base_dir, relative.replace('\\', '/')) if relative else ''
+
+    def get_character_name(self):
+        info = self.sections.get('info', {})
+        return info.get('displayname') or info.get('name', '')
+
+    def get_character_author(self):
+        return self.get('info', 'author')
+
+    def get_localcoord(self):
+        values = split_values(self.get('info', 'localcoord', '320,240'))
+        if len(values) < 2:
+            return (320, 240)
+        return (_to_int(values[0], 320), _to_int(values[1], 240))
+
+    def get_sprite_file(self):
+        return self.get('files', 'sprite')
+
+    def get_animation_file(self):
+        return self.get('files', 'anim')
+
+    def get_command_file(self):
+        return self.get('files', 'cmd')
+
+    def get_constants_file(self):
+        return self.get('files', 'cns')
+
+    def get_sound_file(self):
+        return self.get('files', 'sound')
+
+    def get_state_files(self):
+        """st, st0..st9 and stcommon entries in the order MUGEN loads them"""
+        files = self.sections.get('files', {})
+        keys = ['st'] + [f'st{i}' for i in range(10)] + ['stcommon']
+        return [files[key] for key in keys if files.get(key)]
+
+    def get_palette_files(self):
+        """{palette slot: .act path} for pal1..pal12"""
+        files = self.sections.get('files', {})
+        return {i: files[f'pal{i}'] for i in range(1, 13) if files.get(f'pal{i}')}
+
+    def is_valid_character(self):
+        return bool(self.get_sprite_file() and self.get_animation_file())
+
+    def is_valid_stage(self):
+        return 'bgdef' in self.sections or 'stageinfo' in self.sections
+
+
+class SelectDef:
+    """select.def: roster entries, extra stages and [Select Info] options"""
+    def __init__(self):
+        self.characters = []
+        self.stages = []
+        self.config = {}
+        self.grid_config = {'rows': 2, 'columns': 8, 'cell_size': (32.0, 32.0)}
+
+    def parse_file(self, filepath):
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading select.def {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        self.characters = []
+        self.stages = []
+        self.config = {}
+        section = ''
+        for kind, lineno, key, value in tokenize(text):
+            if kind == SECTION:
+                section = key.lower()
+            elif section == 'characters':
+                # "kfm, stages/kfm.def, music=..." never tokenizes as KEY; "name=x" might
+                self._parse_character_line(value if kind == LINE else f"{key}={value}", lineno)
+            elif section == 'extrastages':
+                if kind == LINE:
+                    self.stages.append({
+                        'def_path': value,
+                        'name': os.path.splitext(os.path.basename(value))[0],
+                    })
+            elif section == 'select info' and kind == KEY:
+                self._parse_config_line(key, value)
+        return self.characters
+
+    def _parse_character_line(self, line, lineno):
+        # Format: kfm, stages/kfm.def, music=sound/kfm.mp3, order=1, includestage=0
+        parts = split_values(line)
+        if parts[0].lower() == 'random':
+            self.characters.append({
+                'name': 'random', 'type': 'random', 'def_path': '', 'stage': '',
+                'music': '', 'order': 9999, 'line': lineno,
+            })
+            return
+        entry = {
+            'name': parts[0],
+            'type': 'character',
+            # Either a folder under chars/ or a path to the .def itself
+            'def_path': parts[0] if parts[0].lower().endswith('.def') else f"{parts[0]}/{parts[0]}.def",
+            'stage': '',
+            'music': '',
+            'order': len(self.characters),
+            'line': lineno,
+        }
+        for part in parts[1:]:
+            key, sep, value = part.partition('=')
+            key = key.strip().lower()
+            if not sep:
+                if part and not entry['stage']:
+                    entry['stage'] = part
+            elif key == 'order':
+                entry['order'] = _to_int(value, entry['order'])
+            elif key:
+                entry[key] = unquote(value.strip())
+        self.characters.append(entry)
+
+    def _parse_config_line(self, key, value):
+        self.config[key] = value
+        if key == 'rows':
+            self.grid_config['rows'] = _to_int(value, 2)
+        elif key == 'columns':
+            self.grid_config['columns'] = _to_int(value, 8)
+        elif key == 'cell.size':
+            coords = split_values(value)
+            if len(coords) >= 2:
+                try:
+                    self.grid_config['cell_size'] = (float(coords[0]), float(coords[1]))
+                except ValueError:
+                    pass
+
+    def get_ordered_characters(self):
+        return sorted(self.characters, key=lambda entry: entry['order'])
+
+    def get_character_by_name(self, name):
+        for entry in self.characters:
+            if entry['name'] == name:
+                return entry
+        return None
+
+
+class SystemDef:
+    """system.def (and fight.def): {lower-cased section: {key: value}}"""
+    def __init__(self):
+        self.sections = {}
+
+    def parse_file(self, filepath):
+        try:
+            text = read_text(filepath)
+        except OSError as e:
+            print(f"❌ Error reading system.def {filepath}: {e}")
+            return False
+        self.parse_text(text)
+        return True
+
+    def parse_text(self, text):
+        self.sections = parse_sections(tokenize(text))
+        return self.sections
+
+    def get_font_path(self, font_id):
+        return self.sections.get('files', {}).get(f'font{font_id}', '')
+
+    def get_select_config(self):
+        return self.sections.get('select info', {})
+
+    def get_vs_screen_config(self):
+        return self.sections.get('vs screen', {})
+
+    def get_music_config(self):
+        return self.sections.get('music', {})
+
+    def get_file_paths(self):
+        return self.sections.get('files', {})
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python mugen_def.py <file.def | select.def | system.def>")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    name = os.path.basename(path).lower()
+    if name == 'select.def':
+        select = SelectDef()
+        if select.parse_file(path):
+            print(f"✅ {len(select.characters)} characters, {len(select.stages)} extra stages")
+            for entry in select.get_ordered_characters():
+                print(f"  {entry['order']:4d} {entry['name']} {entry['stage']}")
+    elif name in ('system.def', 'fight.def'):
+        system = SystemDef()
+        if system.parse_file(path):
+            for section, values in system.sections.items():
+                print(f"[{section}] {len(values)} keys")
+    else:
+        definition = CharacterDef()
+        if definition.parse_file(path):
+            print(f"✅ {definition.get_character_name()} by {definition.get_character_author()}")
+            for section, values in definition.sections.items():
+                print(f"[{section}]")
+                for key, value in values.items():
+                    print(f"  {key} = {value}")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Export AIR actions as animated GIF / APNG / WebP files
+Every distinct sprite is decoded once across all exported actions, then actions are
+composited on a fixed canvas and encoded in parallel worker processes.
+Run: python mugen_export.py kfm.sff kfm.air --actions 0,200-210 --format gif --out exports
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mugen_air import FLIP_H, FLIP_V, AnimationClock, load_air, place_frame
+
+FORMATS = {
+    'gif': '.gif',
+    'apng': '.png',
+    'webp': '.webp',
+}
+# Frame delay resolution in milliseconds; GIF stores delays in centiseconds
+DURATION_STEP_MS = {
+    'gif': 10,
+    'apng': 1,
+    'webp': 1,
+}
+
+
+def parse_action_list(text):
+    """Parse "0,200-210,3000" into a list of action numbers"""
+    actions = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        low, sep, high = part.partition('-')
+        if sep and low:
+            actions.extend(range(int(low), int(high) + 1))
+        else:
+            actions.append(int(part))
+    return actions
+
+
+def _decode_worker(sff_path, keys, palette_index):
+    """Worker process: decode a batch of sprites to raw RGBA bytes"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(sff_path):
+        return {}
+    keys = [key for key in keys if key in parser.sprites]
+    decoded = {}
+    for (group, number), img in parser.extract_sprites(sff_path, keys, palette_index).items():
+        if img is not None:
+            img = img.convert('RGBA')
+            decoded[(group, number)] = (img.size, tuple(parser.sprites[(group, number)].offset), img.tobytes())
+    return decoded
+
+
+def decode_sprites(sff_path, keys, palette_index=None, max_workers=None):
+    """Decode each sprite exactly once, spreading the keys over worker processes"""
+    keys = sorted(keys)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(keys)))
+    if workers == 1:
+        return _decode_worker(sff_path, keys, palette_index)
+    batches = [keys[i::workers] for i in range(workers)]
+    decoded = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_decode_worker, [sff_path] * workers, batches, [palette_index] * workers):
+            decoded.update(result)
+    return decoded
+
+
+def frame_durations_ms(action, hold_ms, step_ms=1):
+    """Per-frame durations in milliseconds, as multiples of `step_ms`
+
+    Frame start times are rounded to the step rather than each duration, so rounding never
+    accumulates: one-tick frames alternate 20 and 10 ms as GIF centiseconds but keep 60 fps.
+    """
+    clock = AnimationClock(action.durations, action.loopstart)
+    durations = []
+    for i in range(len(action)):
+        if clock.hold_frame is not None and i >= clock.hold_frame:
+            durations.append(hold_ms)
+            break
+        start_ms = round(clock.starts[i] * 1000 / AnimationClock.TICKS_PER_SECOND / step_ms) * step_ms
+        end_ms = round(clock.starts[i + 1] * 1000 / AnimationClock.TICKS_PER_SECOND / step_ms) * step_ms
+        durations.append(max(10, end_ms - start_ms))
+    return durations
+
+
+def layout_action(action, decoded):
+    """Return [(sprite key or None, flags, left, top)] and the bounding box of one action"""
+    frames = []
+    bounds = None
+    for i in range(len(action)):
+        group, number, _, x, y, flags = action.frame(i)
+        entry = decoded.get((group, number))
+        if entry is None:
+            frames.append((None, flags, 0, 0))
+            continue
+        (width, height), (axis_x, axis_y), _ = entry
+        left, top = place_frame(width, height, axis_x, axis_y, x, y, flags)
+        frames.append(((group, number), flags, left, top))
+        rect = (left, top, left + width, top + height)
+        bounds = rect if bounds is None else (min(bounds[0], rect[0]), min(bounds[1], rect[1]),
+                                              max(bounds[2], rect[2]), max(bounds[3], rect[3]))
+    return frames, bounds
+
+
+def union_bounds(boxes):
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def _encode_worker(job):
+    """Worker process: composite one action's frames and write the animated file"""
+    from PIL import Image
+
+    out_path, fmt, bounds, frames, durations, sprites = job
+    origin_x, origin_y = -bounds[0], -bounds[1]
+    size = (bounds[2] - bounds[0], bounds[3] - bounds[1])
+    sprite_images = {key: Image.frombytes('RGBA', sprite_size, data)
+                     for key, (sprite_size, _, data) in sprites.items()}
+
+    images = []
+    for key, flags, left, top in frames:
+        canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+        if key is not None:
+            img = sprite_images[key]
+            if flags & FLIP_H:
+                img = img.transpose(Image.FLIP_LEFT_RIGHT)
+            if flags & FLIP_V:
+                img = img.transpose(Image.FLIP_TOP_BOTTOM)
+            canvas.alpha_composite(img, (left + origin_x, top + origin_y))
+        images.append(canvas)
+
+    if fmt == 'gif':
+        images[0].save(out_path, save_all=True, append_images=images[1:], duration=durations,
+                       loop=0, disposal=2, optimize=False)
+    elif fmt == 'apng':
+        images[0].save(out_path, format='PNG', save_all=True, append_images=images[1:],
+                       duration=durations, loop=0, disposal=1)
+    else:
+        images[0].save(out_path, format='WEBP', save_all=True, append_images=images[1:],
+                       duration=durations, loop=0, lossless=True)
+    return out_path, len(images)
+
+
+def export_actions(sff_path, air_path, action_numbers, out_dir, fmt='gif', palette_index=None,
+                   shared_canvas=True, hold_ms=1000, max_workers=None, verbose=True):
+    """Render actions to animated files; returns the list of written paths
+
+    Animated files can only loop back to their first frame, so an action with a loopstart
+    replays the frames before it on every cycle.
+    """
+    start = time.perf_counter()
+    actions = load_air(air_path) or {}
+    selected = []
+    for number in action_numbers:
+        action = actions.get(number)
+        if action is None or len(action) == 0:
+            if verbose:
+                print(f"⚠️ Action {number} not found in {air_path}")
+            continue
+        selected.append(action)
+    if not selected:
+        print("❌ Nothing to export")
+        return []
+
+    keys = set()
+    for action in selected:
+        keys.update(action.sprite_keys())
+    decoded = decode_sprites(sff_path, keys, palette_index, max_workers)
+    if verbose:
+        print(f"🎨 Decoded {len(decoded)} distinct sprites for {len(selected)} actions "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    layouts = [layout_action(action, decoded) for action in selected]
+    shared_bounds = union_bounds(bounds for _, bounds in layouts) if shared_canvas else None
+
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(sff_path))[0]
+    jobs = []
+    for action, (frames, bounds) in zip(selected, layouts):
+        bounds = shared_bounds or bounds
+        if bounds is None:
+            if verbose:
+                print(f"⚠️ Action {action.number} has no decodable frames")
+            continue
+        durations = frame_durations_ms(action, hold_ms, DURATION_STEP_MS[fmt])
+        clock = action.clock()
+        if verbose and clock.loopstart and clock.hold_frame is None:
+            print(f"⚠️ Action {action.number} loops from frame {clock.loopstart}; the file loops from frame 0")
+        frames = frames[:len(durations)]
+        sprites = {key: decoded[key] for key, _, _, _ in frames if key is not None}
+        out_path = os.path.join(out_dir, f"{stem}_action{action.number}{FORMATS[fmt]}")
+        jobs.append((out_path, fmt, bounds, frames, durations, sprites))
+
+    written = []
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for out_path, count in (pool.map if pool else map)(_encode_worker, jobs):
+            written.append(out_path)
+            if verbose:
+                print(f"  ✅ {out_path} ({count} frames)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if verbose:
+        print(f"✅ Exported {len(written)} actions in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Export AIR actions as animated images")
+    arg_parser.add_argument('sff', help="Character or stage .sff file")
+    arg_parser.add_argument('air', help="Matching .air file")
+    arg_parser.add_argument('--actions', required=True, help="Action numbers, e.g. 0,200-210")
+    arg_parser.add_argument('--format', choices=sorted(FORMATS), default='gif')
+    arg_parser.add_argument('--out', default='exports', help="Output directory")
+    arg_parser.add_argument('--palette', type=int, default=None, help="Palette index for every sprite")
+    arg_parser.add_argument('--per-action-canvas', action='store_true',
+                            help="Crop each action to its own bounds instead of one shared canvas")
+    arg_parser.add_argument('--hold-ms', type=int, default=1000, help="Display time for time -1 frames")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = arg_parser.parse_args()
+
+    export_actions(args.sff, args.air, parse_action_list(args.actions), args.out, args.format,
+                   args.palette, not args.per_action_canvas, args.hold_ms, args.workers)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+SQLite sprite index for a whole roster
+Stores every SFF's sprite table (group, number, size, axis, format, palette, data offset and
+length, content hash) in one database, refreshed incrementally by file size and mtime, so
+roster-wide questions are answered with a query instead of reparsing every file.
+Run: python mugen_index.py index assets/mugen --db sprites.db
+     python mugen_index.py large --min 512 | missing 9000 0 | formats [--format lz5] | sql "SELECT ..."
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    character TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sff_version INTEGER,
+    sprite_count INTEGER,
+    palette_count INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS sprites (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    grp INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    axis_x INTEGER,
+    axis_y INTEGER,
+    format TEXT,
+    palette INTEGER,
+    data_offset INTEGER,
+    data_length INTEGER,
+    hash TEXT,
+    PRIMARY KEY (file_id, grp, number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sprites_key ON sprites (grp, number);
+CREATE INDEX IF NOT EXISTS sprites_size ON sprites (width, height);
+CREATE INDEX IF NOT EXISTS sprites_format ON sprites (format);
+CREATE INDEX IF NOT EXISTS sprites_hash ON sprites (hash);
+"""
+SPRITE_COLUMNS = ('file_id', 'grp', 'number', 'width', 'height', 'axis_x', 'axis_y', 'format', 'palette',
+                  'data_offset', 'data_length', 'hash')
+V2_FORMATS = {0: 'raw', 1: 'invalid', 2: 'rle8', 3: 'rle5', 4: 'lz5', 10: 'png8', 11: 'png24', 12: 'png32'}
+
+
+def sprite_format(version, sprite):
+    if version == 1:
+        return 'pcx'
+    return V2_FORMATS.get(-sprite.rle, f"unknown{-sprite.rle}")
+
+
+def find_sff_files(roots):
+    paths = []
+    for root in roots:
+        if os.path.isfile(root):
+            paths.append(os.path.abspath(root))
+            continue
+        for directory, _, files in os.walk(root):
+            paths.extend(os.path.abspath(os.path.join(directory, name))
+                         for name in files if name.lower().endswith('.sff'))
+    return sorted(paths)
+
+
+def read_sprite_table(path):
+    """Worker: parse one SFF; returns (path, size, mtime_ns, version, palettes, rows, error)
+
+    rows are sprite tuples in SPRITE_COLUMNS order without file_id; the hash covers the
+    sprite's raw data bytes, read in file order.
+    """
+    from mugen_prototype import SFFParser
+
+    stat = os.stat(path)
+    parser = SFFParser(verbose=False, pixel_cache_size=0)
+    if not parser.parse_file(path):
+        return path, stat.st_size, stat.st_mtime_ns, None, 0, [], "parse failed"
+    version = parser.header.ver0
+    sprites = sorted(parser.sprites.items(), key=lambda item: getattr(item[1], 'data_offset', 0))
+    rows = []
+    with open(path, 'rb') as f:
+        for (group, number), sprite in sprites:
+            offset = getattr(sprite, 'data_offset', None)
+            length = getattr(sprite, 'data_length', 0) or None
+            digest = None
+            if offset is not None and length:
+                f.seek(offset)
+                digest = hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+            rows.append((group, number, sprite.size[0], sprite.size[1], sprite.offset[0], sprite.offset[1],
+                         sprite_format(version, sprite), sprite.palette_index, offset, length, digest))
+    return path, stat.st_size, stat.st_mtime_ns, version, len(parser.palette_list.palettes), rows, None
+
+
+class SpriteDatabase:
+    """The sprite index database; usable as a context manager"""
+
+    def __init__(self, db_path, readonly=False):
+        self.db_path = db_path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(db_path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _store(self, path, size, mtime_ns, version, palette_count, rows, error):
+        """Replace one file's rows in a single transaction"""
+        with self.conn:
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            cursor = self.conn.execute(
+                "INSERT INTO files (path, character, size, mtime_ns, sff_version, sprite_count, palette_count, error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, os.path.basename(os.path.dirname(path)), size, mtime_ns, version, len(rows),
+                 palette_count, error))
+            file_id = cursor.lastrowid
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO sprites ({', '.join(SPRITE_COLUMNS)})"
+                f" VALUES ({', '.join('?' * len(SPRITE_COLUMNS))})",
+                [(file_id,) + row for row in rows])
+
+    def refresh(self, roots, max_workers=None, force=False, verbose=True):
+        """Index new and changed SFFs under `roots` and drop deleted ones; returns (indexed, removed)"""
+        start = time.perf_counter()
+        on_disk = {}
+        for path in find_sff_files(roots):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            on_disk[path] = (stat.st_size, stat.st_mtime_ns)
+
+        known = {path: (size, mtime_ns) for path, size, mtime_ns in
+                 self.conn.execute("SELECT path, size, mtime_ns FROM files")}
+        # Roots match whole path components: assets/mugen does not cover assets/mugen2
+        roots = [os.path.abspath(root) for root in roots]
+        prefixes = tuple(os.path.join(root, '') for root in roots)
+        removed = [path for path in known if path not in on_disk
+                   and (path in roots or path.startswith(prefixes))]
+        stale = [path for path, state in on_disk.items() if force or known.get(path) != state]
+
+        if removed:
+            with self.conn:
+                self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+
+        sprites = 0
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(stale)))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(read_sprite_table, stale, chunksize=max(1, len(stale) // (workers * 8))):
+                    self._store(*result)
+                    sprites += len(result[5])
+        else:
+            for path in stale:
+                result = read_sprite_table(path)
+                self._store(*result)
+                sprites += len(result[5])
+
+        if verbose:
+            print(f"✅ Indexed {len(stale)} files ({sprites:,} sprites), removed {len(removed)}, "
+                  f"{len(on_disk) - len(stale)} unchanged in {time.perf_counter() - start:.2f}s")
+        return len(stale), len(removed)
+
+    def query(self, sql, params=()):
+        return self.conn.execute(sql, params).fetchall()
+
+    def large_sprites(self, min_size=512):
+        return self.query(
+            "SELECT f.path, s.grp, s.number, s.width, s.height FROM sprites s JOIN files f ON f.id = s.file_id"
+            " WHERE s.width >= ? OR s.height >= ? ORDER BY s.width * s.height DESC", (min_size, min_size))
+
+    def files_missing(self, group, number):
+        return self.query(
+            "SELECT f.path FROM files f WHERE f.error IS NULL AND NOT EXISTS"
+            " (SELECT 1 FROM sprites s WHERE s.file_id = f.id AND s.grp = ? AND s.number = ?) ORDER BY f.path",
+            (group, number))
+
+    def format_counts(self):
+        return self.query("SELECT format, COUNT(DISTINCT file_id), COUNT(*) FROM sprites"
+                          " GROUP BY format ORDER BY COUNT(*) DESC")
+
+    def files_using_format(self, fmt):
+        return self.query(
+            "SELECT f.path, COUNT(*) FROM sprites s JOIN files f ON f.id = s.file_id WHERE s.format = ?"
+            " GROUP BY f.id ORDER BY f.path", (fmt,))
+
+
+def _print_rows(rows, start, headers=None):
+    if headers:
+        print("\t".join(headers))
+    for row in rows:
+        print("\t".join("" if value is None else str(value) for value in row))
+    print(f"⏱️ {len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="SQLite index of every SFF sprite table in a roster")
+    arg_parser.add_argument('--db', default='sprites.db', help="Index database file")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    index_cmd = commands.add_parser('index', help="Index new/changed SFF files")
+    index_cmd.add_argument('roots', nargs='+', help="Directories or SFF files")
+    index_cmd.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    index_cmd.add_argument('--force', action='store_true', help="Reindex unchanged files too")
+    large_cmd = commands.add_parser('large', help="Sprites at least --min pixels wide or tall")
+    large_cmd.add_argument('--min', type=int, default=512)
+    missing_cmd = commands.add_parser('missing', help="Files without a given sprite")
+    missing_cmd.add_argument('group', type=int)
+    missing_cmd.add_argument('number', type=int)
+    formats_cmd = commands.add_parser('formats', help="Sprite formats in use")
+    formats_cmd.add_argument('--format', default=None, help="List files using this format (e.g. lz5)")
+    sql_cmd = commands.add_parser('sql', help="Run a read-only SQL query")
+    sql_cmd.add_argument('query')
+    args = arg_parser.parse_args()
+
+    if args.command == 'index':
+        with SpriteDatabase(args.db) as db:
+            db.refresh(args.roots, args.workers, args.force)
+        raise SystemExit(0)
+
+    if not os.path.exists(args.db):
+        print(f"❌ Index not found: {args.db} (run the index command first)")
+        raise SystemExit(1)
+    with SpriteDatabase(args.db, readonly=True) as db:
+        start = time.perf_counter()
+        if args.command == 'large':
+            _print_rows(db.large_sprites(args.min), start, ('path', 'group', 'number', 'width', 'height'))
+        elif args.command == 'missing':
+            _print_rows(db.files_missing(args.group, args.number), start, ('path',))
+        elif args.command == 'formats' and args.format:
+            _print_rows(db.files_using_format(args.format), start, ('path', 'sprites'))
+        elif args.command == 'formats':
+            _print_rows(db.format_counts(), start, ('format', 'files', 'sprites'))
+        else:
+            try:
+                cursor = db.conn.execute(args.query)
+            except sqlite3.Error as e:
+                print(f"❌ {e}")
+                raise SystemExit(1)
+            _print_rows(cursor.fetchall(), start, [column[0] for column in cursor.description or ()])
@@ -8,9 +8,19 @@ Run: python mugen_prototype.py
 import struct
 import os
 import io
+import mmap
 import zlib
+import time
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+from mugen_air import FLIP_H, FLIP_V, AnimationClock, load_air, place_frame
+
 # For graphics - we'll use PIL first (simpler than pygame)
 try:
     from PIL import Image, ImageDraw, ImageFont, ImageTk
@@ -50,6 +60,11 @@ def load_act_palette(act_file_path):
         print(f"Error loading ACT file {act_file_path}: {e}")
         return None
 
+def palette_to_rgba(palette):
+    """256 RGBA bytes for a palette, alpha 0 wherever the RGB matches color 0 and 255 elsewhere"""
+    transparent = palette[0][:3]
+    return b''.join(bytes((r, g, b, 0 if (r, g, b) == transparent else 255)) for r, g, b, _ in palette)
+
 class SFFHeader:
     def __init__(self):
         self.signature = None
@@ -61,6 +76,10 @@ class SFFHeader:
         self.first_palette_header_offset = 0
         self.number_of_sprites = 0
         self.number_of_palettes = 0
+        self.ldata_offset = 0  # v2 literal data block (palettes, most sprites)
+        self.ldata_length = 0
+        self.tdata_offset = 0  # v2 translated data block (sprites with flags bit 0 set)
+        self.tdata_length = 0
         
     def read(self, f):
         """Read SFF header from file"""
@@ -87,7 +106,8 @@ class SFFHeader:
             self.number_of_sprites = struct.unpack('<I', f.read(4))[0]
             self.first_palette_header_offset = struct.unpack('<I', f.read(4))[0]
             self.number_of_palettes = struct.unpack('<I', f.read(4))[0]
-            f.read(8)  # Skip ldata and tdata offsets for now
+            self.ldata_offset, self.ldata_length, self.tdata_offset, self.tdata_length = \
+                struct.unpack('<IIII', f.read(16))
         else:
             raise ValueError(f"Unsupported SFF version: {self.ver0}")
 
@@ -104,6 +124,7 @@ class SFFSprite:
         self.pixels = None
         self.is_linked = False
         self.linked_index = 0
+        self.flags = 0
         
     def read_header_v1(self, f):
         """Read SFF v1 sprite header"""
@@ -113,7 +134,7 @@ class SFFSprite:
             
         # Parse sprite header - based on Ikemen GO format
         next_offset, data_length, x, y, self.group, self.number, \
-        self.linked_index, palette_same = struct.unpack('<IIHHHHHB', data[:19])
+        self.linked_index, palette_same = struct.unpack('<IIhhHHHB', data[:19])
         
         # The linked_index indicates if this sprite shares data with another
         self.is_linked = self.linked_index != 0
@@ -128,7 +149,8 @@ class SFFSprite:
             
         self.group, self.number, self.size[0], self.size[1], \
         self.offset[0], self.offset[1], self.linked_index, fmt, \
-        self.coldepth, data_offset, data_length = struct.unpack('<HHHHhhHBBII', data)
+        self.coldepth, data_offset, data_length = struct.unpack('<HHHHhhHBBII', data[:24])
+        self.palette_index, self.flags = struct.unpack('<HH', data[24:28])
         
         self.rle = -fmt if fmt != 0 else 0
         self.is_linked = data_length == 0
@@ -153,44 +175,231 @@ class PaletteList:
             return self.palettes[index]
         return None
 
-class SFFParser:
+class SFFStats:
+    """Per-phase wall time, byte counts and counters collected by SFFParser"""
     def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+        
+    def reset(self):
+        """Clear all recorded phases and counters"""
+        with self._lock:
+            self.phases = {}  # Maps phase name to {'calls', 'seconds', 'bytes'}
+            self.counters = {}  # Maps counter name to integer value
+    
+    @contextmanager
+    def phase(self, name, f=None):
+        """Time a block as phase `name`, attributing bytes read through `f`"""
+        start_bytes = f.bytes_read if f is not None else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nbytes = f.bytes_read - start_bytes if f is not None else 0
+            with self._lock:
+                entry = self.phases.get(name)
+                if entry is None:
+                    entry = self.phases[name] = {'calls': 0, 'seconds': 0.0, 'bytes': 0}
+                entry['calls'] += 1
+                entry['seconds'] += elapsed
+                entry['bytes'] += nbytes
+    
+    def count(self, name, n=1):
+        """Increment counter `name` by `n`"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+    
+    def snapshot(self):
+        """Return a copy of the phases and counters as plain dicts"""
+        with self._lock:
+            return {
+                'phases': {name: dict(entry) for name, entry in self.phases.items()},
+                'counters': dict(self.counters),
+            }
+    
+    def report(self):
+        """Format the collected stats as a human readable table"""
+        snap = self.snapshot()
+        lines = [f"{'phase':<16} {'calls':>7} {'ms':>10} {'bytes':>12}"]
+        for name, entry in sorted(snap['phases'].items()):
+            lines.append(f"{name:<16} {entry['calls']:>7} {entry['seconds'] * 1000:>10.2f} {entry['bytes']:>12}")
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"{name:<16} {value:>7}")
+        return "\n".join(lines)
+
+class CountingReader:
+    """Binary file wrapper that counts read/seek calls and bytes read"""
+    def __init__(self, f):
+        self._f = f
+        self.reads = 0
+        self.seeks = 0
+        self.bytes_read = 0
+        
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.reads += 1
+        self.bytes_read += len(data)
+        return data
+    
+    def seek(self, offset, whence=0):
+        self.seeks += 1
+        return self._f.seek(offset, whence)
+    
+    def tell(self):
+        return self._f.tell()
+
+class SpriteReader:
+    """Positionless reads (os.pread, or mmap slices where pread is missing) safe to share between threads"""
+    def __init__(self, filepath):
+        self._fd = os.open(filepath, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        self.size = os.fstat(self._fd).st_size
+        self._mmap = None
+        if not hasattr(os, 'pread') and self.size:
+            self._mmap = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.bytes_read = 0
+    
+    def read_at(self, offset, size):
+        """Read up to `size` bytes at `offset` without touching any file position"""
+        size = max(0, min(size, self.size - offset))
+        if self._mmap is not None:
+            data = self._mmap[offset:offset + size]
+        else:
+            data = os.pread(self._fd, size, offset)
+        with self._lock:
+            self.reads += 1
+            self.bytes_read += len(data)
+        return data
+    
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+class SFFParser:
+    PCX_SCAN_LIMIT = 100000  # Bytes read after a PCX header when the sprite has no stored length
+    MAX_READ_GAP = 64 * 1024  # Unrequested bytes extract_sprites reads through to join two ranges
+    MAX_READ_SIZE = 8 * 1024 * 1024  # Largest single read extract_sprites issues
+    SCAN_CHUNK = 1024 * 1024  # Bytes per read while scanning a v1 file for PCX headers
+    
+    def __init__(self, verbose=True, pixel_cache_size=256, tracer=None):
         self.header = SFFHeader()
+        self.filepath = None  # Last file passed to parse_file
         self.sprites = {}  # Dict mapping (group, number) to SFFSprite
         self.palette_list = PaletteList()
+        self.verbose = verbose  # Set False to silence per-sprite logging on the hot path
+        self._stats = SFFStats()
+        self._pixel_cache = OrderedDict()  # Maps (filepath, group, number) to (width, height, pixels)
+        self._pixel_cache_size = pixel_cache_size
+        self._cache_lock = threading.Lock()
+        self.tracer = tracer  # Optional mugen_trace.Tracer recording phase spans
+        
+    def stats(self):
+        """Return per-phase timings, byte counts and counters collected so far"""
+        return self._stats.snapshot()
+    
+    def reset_stats(self):
+        """Discard collected stats"""
+        self._stats.reset()
+    
+    def stats_report(self):
+        """Return collected stats formatted as a table"""
+        return self._stats.report()
+    
+    def _log(self, message):
+        """Print an informational message when verbose logging is enabled"""
+        if self.verbose:
+            print(message)
+    
+    @contextmanager
+    def _phase(self, name, f=None, **args):
+        """Record a phase in the stats and, when tracing, as a trace span"""
+        with self._stats.phase(name, f):
+            if self.tracer is None:
+                yield
+            else:
+                with self.tracer.span(name, **args):
+                    yield
+    
+    @contextmanager
+    def _open(self, filepath):
+        """Open `filepath` for counted reads, folding the counts into stats on close"""
+        with open(filepath, 'rb') as raw:
+            f = CountingReader(raw)
+            try:
+                yield f
+            finally:
+                self._stats.count('opens')
+                self._stats.count('reads', f.reads)
+                self._stats.count('seeks', f.seeks)
+                self._stats.count('bytes_read', f.bytes_read)
+    
+    @contextmanager
+    def _reader(self, filepath):
+        """Open `filepath` for positionless reads, folding the counts into stats on close"""
+        reader = SpriteReader(filepath)
+        try:
+            yield reader
+        finally:
+            reader.close()
+            self._stats.count('opens')
+            self._stats.count('reads', reader.reads)
+            self._stats.count('bytes_read', reader.bytes_read)
         
-    def parse_file(self, filepath):
-        """Parse SFF file and extract sprites"""
-        print(f"🎨 Parsing SFF file: {filepath}")
+    def parse_file(self, filepath, only=None):
+        """Parse SFF file and extract sprites
+
+        With `only`, just those (group, number) keys are indexed, from the headers alone.
+        """
+        self._log(f"🎨 Parsing SFF file: {filepath}")
         
         if not os.path.exists(filepath):
             print(f"❌ File not found: {filepath}")
             return False
+        
+        self._pixel_cache.clear()
+        self.filepath = filepath
+        # Nothing from a previously parsed file survives; tables are replaced, never edited
+        self.header = SFFHeader()
+        self.sprites = {}
+        self.palette_list = PaletteList()
+        if only is not None:
+            only = set(only)
             
         try:
-            with open(filepath, 'rb') as f:
+            with self._phase('parse_file', path=filepath), self._open(filepath) as f:
                 # Read header
-                self.header.read(f)
-                print(f"📝 Signature: '{self.header.signature.decode('ascii', errors='ignore')}'")
-                print(f"� Version: [{self.header.ver3}, {self.header.ver2}, {self.header.ver1}, {self.header.ver0}]")
-                print(f"📊 SFF Info:")
-                print(f"  Sprite count: {self.header.number_of_sprites}")
-                print(f"  Palette count: {self.header.number_of_palettes}")
-                print(f"  First sprite header offset: {self.header.first_sprite_header_offset}")
-                print(f"  First palette header offset: {self.header.first_palette_header_offset}")
+                with self._phase('header', f):
+                    self.header.read(f)
+                self._log(f"📝 Signature: '{self.header.signature.decode('ascii', errors='ignore')}'")
+                self._log(f"� Version: [{self.header.ver3}, {self.header.ver2}, {self.header.ver1}, {self.header.ver0}]")
+                self._log(f"📊 SFF Info:")
+                self._log(f"  Sprite count: {self.header.number_of_sprites}")
+                self._log(f"  Palette count: {self.header.number_of_palettes}")
+                self._log(f"  First sprite header offset: {self.header.first_sprite_header_offset}")
+                self._log(f"  First palette header offset: {self.header.first_palette_header_offset}")
                 
                 # Get file size for validation
                 f.seek(0, 2)
                 file_size = f.tell()
-                print(f"� File size: {file_size} bytes")
+                self._log(f"� File size: {file_size} bytes")
                 
                 # Parse palettes first
                 if self.header.ver0 == 1:
-                    self._parse_palettes_v1(f, file_size)
-                    return self._parse_sprites_v1(f, file_size)
+                    with self._phase('palettes', f):
+                        self._parse_palettes_v1(f, file_size)
+                    with self._phase('sprite_table', f):
+                        return self._parse_sprites_v1(f, file_size, only)
                 elif self.header.ver0 == 2:
-                    self._parse_palettes_v2(f, file_size)
-                    return self._parse_sprites_v2(f, file_size)
+                    with self._phase('palettes', f):
+                        self._parse_palettes_v2(f, file_size)
+                    with self._phase('sprite_table', f):
+                        return self._parse_sprites_v2(f, file_size, only)
                 else:
                     print(f"❌ Unsupported SFF version: {self.header.ver0}")
                     return False
@@ -204,7 +413,7 @@ class SFFParser:
     def _parse_palettes_v1(self, f, file_size):
         """Parse SFF v1 palettes"""
         if self.header.number_of_palettes == 0 or self.header.first_palette_header_offset == 0:
-            print("⚠️ No palettes defined, creating default palette")
+            self._log("⚠️ No palettes defined, creating default palette")
             self._create_default_palette()
             return
             
@@ -213,16 +422,16 @@ class SFFParser:
         
         # Validate palette offset
         if palette_offset >= file_size:
-            print(f"⚠️ Palette offset {palette_offset} exceeds file size {file_size}")
+            self._log(f"⚠️ Palette offset {palette_offset} exceeds file size {file_size}")
             self._create_default_palette()
             return
             
-        print(f"🎨 Reading {self.header.number_of_palettes} v1 palettes from offset {palette_offset}")
+        self._log(f"🎨 Reading {self.header.number_of_palettes} v1 palettes from offset {palette_offset}")
         
         # Each palette is 768 bytes (256 colors * 3 RGB bytes)
         total_palette_size = self.header.number_of_palettes * 768
         if palette_offset + total_palette_size > file_size:
-            print(f"⚠️ Palette data would exceed file size, limiting palette count")
+            self._log(f"⚠️ Palette data would exceed file size, limiting palette count")
             max_palettes = (file_size - palette_offset) // 768
             self.header.number_of_palettes = max_palettes
         
@@ -241,23 +450,24 @@ class SFFParser:
                 
                 if len(palette) == 256:
                     self.palette_list.add_palette(palette)
-                    print(f"  ✅ Loaded palette {i}")
+                    if self.verbose:
+                        print(f"  ✅ Loaded palette {i}")
                 else:
                     print(f"  ❌ Incomplete palette {i}")
                     break
                     
         except Exception as e:
-            print(f"⚠️ Error reading palettes: {e}")
+            self._log(f"⚠️ Error reading palettes: {e}")
             self._create_default_palette()
     
     def _parse_palettes_v2(self, f, file_size):
         """Parse SFF v2 palettes (with headers)"""
         if self.header.number_of_palettes == 0:
-            print("⚠️ No palettes defined in v2, creating default")
+            self._log("⚠️ No palettes defined in v2, creating default")
             self._create_default_palette()
             return
             
-        print(f"🎨 Reading {self.header.number_of_palettes} v2 palette headers")
+        self._log(f"🎨 Reading {self.header.number_of_palettes} v2 palette headers")
         
         f.seek(self.header.first_palette_header_offset)
         
@@ -268,16 +478,22 @@ class SFFParser:
                 if len(header_data) < 16:
                     break
                     
-                group, number, numcols, link, data_offset, data_size = struct.unpack('<HHHIII', header_data)
+                group, number, numcols, link, data_offset, data_size = struct.unpack('<HHHHII', header_data)
                 
                 if data_size == 0:
-                    # Linked palette
-                    print(f"  Palette {i}: [{group},{number}] linked to {link}")
+                    # Linked palette: reuse the target so list positions keep matching header slots
+                    if self.verbose:
+                        print(f"  Palette {i}: [{group},{number}] linked to {link}")
+                    linked = self.palette_list.get_palette(link)
+                    if linked is None:
+                        self._create_default_palette()
+                    else:
+                        self.palette_list.add_palette(linked)
                     continue
                     
                 # Read palette data
                 current_pos = f.tell()
-                f.seek(data_offset)
+                f.seek(self.header.ldata_offset + data_offset)
                 
                 palette = []
                 colors_to_read = min(256, data_size // 4)  # 4 bytes per RGBA color
@@ -302,12 +518,13 @@ class SFFParser:
                 
                 if len(palette) == 256:
                     self.palette_list.add_palette(palette)
-                    print(f"  ✅ Loaded palette {i}: [{group},{number}] with {colors_to_read} colors")
+                    if self.verbose:
+                        print(f"  ✅ Loaded palette {i}: [{group},{number}] with {colors_to_read} colors")
                 
                 f.seek(current_pos)
                 
             except Exception as e:
-                print(f"⚠️ Error reading palette {i}: {e}")
+                self._log(f"⚠️ Error reading palette {i}: {e}")
                 break
     
     def _create_default_palette(self):
@@ -318,40 +535,28 @@ class SFFParser:
             alpha = 0 if i == 0 else 255
             palette.append((gray, gray, gray, alpha))
         self.palette_list.add_palette(palette)
-        print("🎨 Created default grayscale palette")
+        self._log("🎨 Created default grayscale palette")
     
-    def _parse_sprites_v1(self, f, file_size):
-        """Parse SFF v1 sprites - handle non-standard header layout"""
+    def _parse_sprites_v1(self, f, file_size, only=None):
+        """Parse SFF v1 sprites - handle non-standard header layout
+
+        `only` limits the table to those (group, number) keys.
+        """
         if self.header.number_of_sprites == 0:
             print("❌ No sprites defined")
             return False
             
-        print(f"📋 Reading {self.header.number_of_sprites} v1 sprite headers")
+        self._log(f"📋 Reading {self.header.number_of_sprites} v1 sprite headers")
         
         # This SFF file has a non-standard layout where sprite headers are not at offset 0
         # Let's scan for the actual sprite data locations
         sprites_loaded = 0
         
-        # First, let's find all PCX headers in the file
-        f.seek(0)
-        file_data = f.read()
-        
-        pcx_positions = []
-        for i in range(len(file_data) - 128):
-            if file_data[i] == 10:  # PCX manufacturer byte
-                # Validate this looks like a real PCX header
-                f.seek(i)
-                header = f.read(16)
-                if len(header) >= 16:
-                    manufacturer, version, encoding, bpp = header[:4]
-                    if bpp == 8:  # 8-bit color depth
-                        xmin, ymin, xmax, ymax = struct.unpack('<HHHH', header[4:12])
-                        width = xmax - xmin + 1
-                        height = ymax - ymin + 1
-                        if 1 <= width <= 2048 and 1 <= height <= 2048:  # Reasonable dimensions
-                            pcx_positions.append((i, width, height))
-        
-        print(f"🔍 Found {len(pcx_positions)} potential sprite locations")
+        # With `only`, headers are checked against the PCX header they point at instead of a
+        # scan of the whole file
+        pcx_positions = self._scan_pcx_v1(f, file_size) if only is None else []
+        if only is None:
+            self._log(f"🔍 Found {len(pcx_positions)} potential sprite locations")
         
         # Now let's look for sprite headers that point to these PCX locations
         # The sprite headers should be somewhere after the palettes
@@ -371,11 +576,12 @@ class SFFParser:
             if start_pos >= file_size - 32:
                 continue
                 
-            print(f"🔍 Searching for sprite headers starting at {start_pos}")
+            self._log(f"🔍 Searching for sprite headers starting at {start_pos}")
             
             # Try to read sprite headers from this position
             current_pos = start_pos
             temp_sprites = []
+            matched = 0
             
             for i in range(self.header.number_of_sprites):
                 if current_pos + 32 > file_size:
@@ -387,20 +593,24 @@ class SFFParser:
                     break
                 
                 try:
-                    next_offset, data_length, x, y, group, number, linked_index, palette_same = struct.unpack('<IIHHHHHB', header_data[:19])
+                    next_offset, data_length, x, y, group, number, linked_index, palette_same = struct.unpack('<IIhhHHHB', header_data[:19])
                     
                     # Check if this points to one of our PCX locations
-                    pcx_found = False
-                    for pcx_pos, pcx_width, pcx_height in pcx_positions:
-                        if abs(next_offset - pcx_pos) < 10:  # Allow for small offset differences
-                            pcx_found = True
-                            break
+                    if only is None:
+                        # Allow for small offset differences
+                        pcx = next(((w, h) for pos, w, h in pcx_positions if abs(next_offset - pos) < 10), None)
+                    else:
+                        pcx = self._pcx_size_at(f, next_offset)
                     
-                    if pcx_found and 0 <= group < 1000 and 0 <= number < 1000:
+                    if pcx and 0 <= group < 10000 and 0 <= number < 1000:
+                        matched += 1
+                        if only is not None and (group, number) not in only:
+                            current_pos += 32
+                            continue
                         sprite = SFFSprite()
                         sprite.group = group
                         sprite.number = number
-                        sprite.size = [pcx_width, pcx_height]
+                        sprite.size = list(pcx)
                         sprite.offset = [x, y]
                         sprite.is_linked = linked_index != 0
                         sprite.linked_index = linked_index
@@ -410,7 +620,8 @@ class SFFParser:
                         sprite.palette_index = min(group, len(self.palette_list.palettes) - 1)
                         
                         temp_sprites.append(sprite)
-                        print(f"  Found sprite header {i}: [{group},{number}] -> PCX at {next_offset}")
+                        if self.verbose:
+                            print(f"  Found sprite header {i}: [{group},{number}] -> PCX at {next_offset}")
                 
                 except struct.error:
                     break
@@ -418,19 +629,24 @@ class SFFParser:
                 current_pos += 32
             
             # If we found reasonable number of sprite headers, use them
-            if len(temp_sprites) >= self.header.number_of_sprites // 2:  # At least half
+            if matched >= self.header.number_of_sprites // 2:  # At least half
                 found_headers = True
                 for sprite in temp_sprites:
                     if not sprite.is_linked:  # Only store non-linked sprites for now
                         sprite_key = (sprite.group, sprite.number)
                         self.sprites[sprite_key] = sprite
                         sprites_loaded += 1
-                        print(f"    ✅ Loaded sprite [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]}")
+                        if self.verbose:
+                            print(f"    ✅ Loaded sprite [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]}")
                 break
         
+        if not found_headers and only is not None:
+            # Keys can't be trusted without headers; fall back to the full scan
+            return self._parse_sprites_v1(f, file_size)
+        
         # If we still can't find headers, create sprites directly from PCX positions
         if not found_headers and pcx_positions:
-            print(f"🔧 Could not find sprite headers, creating sprites from PCX data directly")
+            self._log(f"🔧 Could not find sprite headers, creating sprites from PCX data directly")
             
             for i, (pcx_pos, width, height) in enumerate(pcx_positions[:self.header.number_of_sprites]):
                 # Create sprite with estimated group/number
@@ -451,11 +667,50 @@ class SFFParser:
                 sprite_key = (sprite.group, sprite.number)
                 self.sprites[sprite_key] = sprite
                 sprites_loaded += 1
-                print(f"    ✅ Created sprite [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]} from PCX at {pcx_pos}")
+                if self.verbose:
+                    print(f"    ✅ Created sprite [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]} from PCX at {pcx_pos}")
         
-        print(f"✅ Loaded {sprites_loaded} v1 sprites")
+        self._log(f"✅ Loaded {sprites_loaded} v1 sprites")
         return sprites_loaded > 0
     
+    def _scan_pcx_v1(self, f, file_size):
+        """(offset, width, height) of every plausible PCX header in the file"""
+        # A chunk at a time so large files are never held in memory whole
+        pcx_positions = []
+        scan_end = file_size - 128
+        chunk_start = 0
+        while chunk_start < scan_end:
+            limit = min(self.SCAN_CHUNK, scan_end - chunk_start)
+            f.seek(chunk_start)
+            chunk = f.read(limit + 16)  # Room for the header of a candidate near the end
+            i = chunk.find(10, 0, limit)  # PCX manufacturer byte
+            while i != -1:
+                # Validate this looks like a real PCX header
+                header = chunk[i:i + 16]
+                if len(header) >= 16:
+                    manufacturer, version, encoding, bpp = header[:4]
+                    if bpp == 8:  # 8-bit color depth
+                        xmin, ymin, xmax, ymax = struct.unpack('<HHHH', header[4:12])
+                        width = xmax - xmin + 1
+                        height = ymax - ymin + 1
+                        if 1 <= width <= 2048 and 1 <= height <= 2048:  # Reasonable dimensions
+                            pcx_positions.append((chunk_start + i, width, height))
+                i = chunk.find(10, i + 1, limit)
+            chunk_start += limit
+        
+        return pcx_positions
+    
+    def _pcx_size_at(self, f, offset):
+        """(width, height) of the PCX header at `offset`, or None if there isn't one"""
+        f.seek(offset)
+        header = f.read(16)
+        if len(header) < 16 or header[0] != 10 or header[3] != 8:
+            return None
+        xmin, ymin, xmax, ymax = struct.unpack('<HHHH', header[4:12])
+        width = xmax - xmin + 1
+        height = ymax - ymin + 1
+        return (width, height) if 1 <= width <= 2048 and 1 <= height <= 2048 else None
+    
     def _test_sprite_header_v1(self, f):
         """Test if current position contains a valid v1 sprite header"""
         pos = f.tell()
@@ -466,11 +721,11 @@ class SFFParser:
                 if len(header_data) < 32:
                     return False
                 
-                next_offset, data_length, x, y, group, number, linked_index = struct.unpack('<IIHHHHI', header_data[:20])
+                next_offset, data_length, x, y, group, number, linked_index = struct.unpack('<IIhhHHI', header_data[:20])
                 
                 # Basic sanity checks
                 if (data_length < 1000000 and  # Reasonable size
-                    0 <= group < 1000 and     # Reasonable group
+                    0 <= group < 10000 and    # Reasonable group (9000 = portraits)
                     0 <= number < 1000 and    # Reasonable number
                     abs(x) < 10000 and abs(y) < 10000):  # Reasonable coordinates
                     continue
@@ -483,9 +738,9 @@ class SFFParser:
         finally:
             f.seek(pos)  # Reset position
     
-    def _parse_sprites_v2(self, f, file_size):
-        """Parse SFF v2 sprites"""
-        print(f"📋 Reading {self.header.number_of_sprites} v2 sprite headers")
+    def _parse_sprites_v2(self, f, file_size, only=None):
+        """Parse SFF v2 sprites; `only` limits the table to those (group, number) keys"""
+        self._log(f"📋 Reading {self.header.number_of_sprites} v2 sprite headers")
         
         f.seek(self.header.first_sprite_header_offset)
         sprites_loaded = 0
@@ -496,23 +751,30 @@ class SFFParser:
                 # For v2, we need lofs and tofs (but we'll use 0 for now)
                 data_offset, data_length = sprite.read_header_v2(f, 0, 0)
                 
-                print(f"  Sprite {i}: [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]} fmt={sprite.rle}")
+                if self.verbose:
+                    print(f"  Sprite {i}: [{sprite.group},{sprite.number}] {sprite.size[0]}x{sprite.size[1]} fmt={sprite.rle}")
                 
                 if sprite.is_linked:
-                    print(f"    ⏭️ Linked sprite")
+                    if self.verbose:
+                        print(f"    ⏭️ Linked sprite")
                     continue
                 
-                if data_length > 0:
+                if data_length > 0 and (only is None or (sprite.group, sprite.number) in only):
+                    # Data offsets are relative to the ldata or tdata block
+                    block = self.header.tdata_offset if sprite.flags & 1 else self.header.ldata_offset
+                    sprite.data_offset = block + data_offset
+                    sprite.data_length = data_length
                     sprite_key = (sprite.group, sprite.number)
                     self.sprites[sprite_key] = sprite
                     sprites_loaded += 1
-                    print(f"    ✅ Loaded sprite [{sprite.group},{sprite.number}]")
+                    if self.verbose:
+                        print(f"    ✅ Loaded sprite [{sprite.group},{sprite.number}]")
                 
             except Exception as e:
                 print(f"  ❌ Error reading sprite {i}: {e}")
                 break
         
-        print(f"✅ Loaded {sprites_loaded} v2 sprites")
+        self._log(f"✅ Loaded {sprites_loaded} v2 sprites")
         return sprites_loaded > 0
     
     def _read_pcx_header(self, f, sprite):
@@ -598,62 +860,33 @@ class SFFParser:
         """Decode RLE8 compressed sprite data (SFF v2)"""
         if not data:
             return None
-            
+        
+        # A byte of the form 01nnnnnn repeats the following byte n times; anything else is a pixel
         pixels = bytearray(width * height)
         i = 0
         j = 0
+        end = len(pixels)
         
-        while j < len(pixels) and i < len(data):
-            if i >= len(data):
-                break
-                
+        while j < end and i < len(data):
             byte = data[i]
             i += 1
-            
-            if byte == 0:
-                # Escape sequence
+            if byte & 0xC0 == 0x40:
                 if i >= len(data):
                     break
-                count = data[i]
+                count = min(byte & 0x3F, end - j)
+                pixels[j:j + count] = bytes((data[i],)) * count
                 i += 1
-                
-                if count == 0:
-                    # End of line
-                    continue
-                elif count == 1:
-                    # End of bitmap
-                    break
-                elif count == 2:
-                    # Delta
-                    if i + 1 < len(data):
-                        dx = data[i]
-                        dy = data[i + 1]
-                        j += dx + dy * width
-                        i += 2
-                else:
-                    # Absolute mode
-                    for _ in range(count):
-                        if i < len(data) and j < len(pixels):
-                            pixels[j] = data[i]
-                            j += 1
-                            i += 1
-                    # Align to word boundary
-                    if count % 2 == 1:
-                        i += 1
+                j += count
             else:
-                # Encoded mode
-                if i < len(data):
-                    value = data[i]
-                    i += 1
-                    for _ in range(byte):
-                        if j < len(pixels):
-                            pixels[j] = value
-                            j += 1
+                pixels[j] = byte
+                j += 1
         
         return bytes(pixels)
     
-    def extract_sprite_image(self, filepath, group, number):
-        """Extract and decode a specific sprite to PIL Image"""
+    def extract_sprite_image(self, filepath, group, number, placeholder=True, palette_index=None):
+        """Extract and decode a specific sprite to PIL Image, in `palette_index` instead of the
+        sprite's own palette if given; a failed decode gives a placeholder image, or None when
+        `placeholder` is False"""
         sprite_key = (group, number)
         if sprite_key not in self.sprites:
             print(f"❌ Sprite [{group},{number}] not found")
@@ -661,110 +894,302 @@ class SFFParser:
             
         sprite = self.sprites[sprite_key]
         
+        # Decoded pixels are cached before colorization so palette changes stay cheap
+        cached = self._get_cached_pixels(filepath, group, number)
+        if cached is not None:
+            width, height, pixels = cached
+            return self._colorize(sprite, group, number, width, height, pixels, palette_index)
+        
         try:
-            with open(filepath, 'rb') as f:
-                if self.header.ver0 == 1:
-                    return self._extract_sprite_v1(f, sprite, group, number)
-                elif self.header.ver0 == 2:
-                    return self._extract_sprite_v2(f, sprite, group, number)
-                else:
-                    print(f"❌ Unsupported SFF version for extraction: {self.header.ver0}")
-                    return None
+            with self._reader(filepath) as reader:
+                return self._sprite_image(reader, filepath, sprite, group, number, placeholder=placeholder,
+                                          palette_index=palette_index)
                     
         except Exception as e:
             print(f"❌ Error extracting sprite [{group},{number}]: {e}")
             import traceback
             traceback.print_exc()
-            return self._create_placeholder_image(group, number, 64, 64)
+            return self._create_placeholder_image(group, number, 64, 64) if placeholder else None
     
-    def _extract_sprite_v1(self, f, sprite, group, number):
-        """Extract SFF v1 sprite"""
-        # Check if sprite has stored data offset
+    def extract_sprite_pixels(self, filepath, group, number):
+        """Decode a sprite to (width, height, palette-index bytes) without colorizing, or None"""
+        sprite = self.sprites.get((group, number))
+        if sprite is None or not hasattr(sprite, 'data_offset'):
+            return None
+        cached = self._get_cached_pixels(filepath, group, number)
+        if cached is not None:
+            return cached
+        try:
+            with self._reader(filepath) as reader:
+                decoded = self._decode(reader, filepath, sprite, group, number)
+        except Exception as e:
+            print(f"❌ Error extracting sprite [{group},{number}]: {e}")
+            return None
+        # Direct-color PNG sprites have no palette indices
+        if not isinstance(decoded, tuple) or not decoded[2]:
+            return None
+        return decoded
+    
+    def decode_many(self, keys, max_workers=None, filepath=None, palette_index=None):
+        """Decode sprites on a thread pool; returns {(group, number): RGBA image, or None for
+        missing sprites and failed decodes}
+        
+        All threads share one SpriteReader and decoding never writes to the parsed tables,
+        so PNG inflation and colorizing overlap wherever PIL and zlib release the GIL.
+        `palette_index` overrides every sprite's own palette.
+        """
+        filepath = filepath or self.filepath
+        keys = list(dict.fromkeys((group, number) for group, number in keys))
+        
+        def decode(key):
+            sprite = self.sprites.get(key)
+            if sprite is None:
+                return key, None
+            cached = self._get_cached_pixels(filepath, *key)
+            if cached is not None:
+                return key, self._colorize(sprite, key[0], key[1], *cached, palette_index)
+            try:
+                return key, self._sprite_image(reader, filepath, sprite, *key, placeholder=False,
+                                               palette_index=palette_index)
+            except Exception as e:
+                print(f"❌ Error extracting sprite [{key[0]},{key[1]}]: {e}")
+                return key, None
+        
+        with self._reader(filepath) as reader:
+            workers = max(1, min(max_workers or os.cpu_count() or 1, len(keys)))
+            if workers == 1:
+                return dict(map(decode, keys))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return dict(pool.map(decode, keys))
+    
+    def extract_sprites(self, filepath, keys, palette_index=None):
+        """Extract many sprites with few large reads; returns {(group, number): image} in request
+        order, with None for missing sprites and failed decodes (never a placeholder)
+        
+        Uncached sprites are sorted by data offset, neighbouring byte ranges are merged into
+        one read (bridging gaps up to MAX_READ_GAP, up to MAX_READ_SIZE per read) and decoded
+        in file order, so cold reads from network shares and spinning disks stay sequential.
+        `palette_index` overrides every sprite's own palette.
+        """
+        keys = list(dict.fromkeys((group, number) for group, number in keys))
+        images = dict.fromkeys(keys)
+        pending = []
+        for key in keys:
+            sprite = self.sprites.get(key)
+            if sprite is None:
+                print(f"❌ Sprite [{key[0]},{key[1]}] not found")
+                continue
+            if not hasattr(sprite, 'data_offset'):
+                images[key] = self._sprite_image(None, filepath, sprite, *key, placeholder=False)
+                continue
+            cached = self._get_cached_pixels(filepath, *key)
+            if cached is not None:
+                images[key] = self._colorize(sprite, key[0], key[1], *cached, palette_index)
+                continue
+            offset, size = self._data_span(sprite)
+            pending.append((offset, size, key, sprite))
+        
+        # Coalesce into runs of [start, end, sprites]
+        pending.sort(key=lambda item: item[:2])
+        runs = []
+        for item in pending:
+            offset, size = item[0], item[1]
+            if runs and offset - runs[-1][1] <= self.MAX_READ_GAP \
+                    and max(runs[-1][1], offset + size) - runs[-1][0] <= self.MAX_READ_SIZE:
+                runs[-1][1] = max(runs[-1][1], offset + size)
+                runs[-1][2].append(item)
+            else:
+                runs.append([offset, offset + size, [item]])
+        
+        with self._reader(filepath) as reader:
+            for start, end, items in runs:
+                with self._phase('read.batch', reader):
+                    block = memoryview(reader.read_at(start, end - start))
+                for offset, size, (group, number), sprite in items:
+                    data = block[offset - start:offset - start + size]
+                    try:
+                        images[(group, number)] = self._sprite_image(reader, filepath, sprite, group, number, data,
+                                                                     placeholder=False, palette_index=palette_index)
+                    except Exception as e:
+                        print(f"❌ Error extracting sprite [{group},{number}]: {e}")
+                        images[(group, number)] = None
+        self._stats.count('batch_reads', len(runs))
+        return images
+    
+    def iter_sprites(self, filepath=None, indexed=False):
+        """Yield ((group, number), RGBA image) for every sprite in file order, one at a time
+        
+        Each sprite's bytes are read just before it is decoded and nothing goes into the pixel
+        cache, so memory stays at one sprite plus the palettes however large the file is. With
+        indexed=True items are (width, height, palette-index bytes) instead. Failed decodes,
+        and direct-color sprites when indexed, yield None.
+        """
+        filepath = filepath or self.filepath
+        ordered = sorted(self.sprites.items(), key=lambda item: (getattr(item[1], 'data_offset', 0), item[0]))
+        with self._reader(filepath) as reader:
+            for (group, number), sprite in ordered:
+                try:
+                    if not indexed:
+                        item = self._sprite_image(reader, filepath, sprite, group, number, cache=False,
+                                                  placeholder=False)
+                    elif hasattr(sprite, 'data_offset'):
+                        item = self._decode(reader, filepath, sprite, group, number, cache=False)
+                        if not isinstance(item, tuple) or not item[2]:
+                            item = None
+                    else:
+                        item = None
+                except Exception as e:
+                    print(f"❌ Error extracting sprite [{group},{number}]: {e}")
+                    item = None
+                yield (group, number), item
+    
+    def _get_cached_pixels(self, filepath, group, number):
+        """Look up decoded (width, height, pixels) in the pixel cache"""
+        cache_key = (filepath, group, number)
+        with self._cache_lock:
+            cached = self._pixel_cache.get(cache_key)
+            if cached is not None:
+                self._pixel_cache.move_to_end(cache_key)
+        self._stats.count('cache_hits' if cached is not None else 'cache_misses')
+        return cached
+    
+    def _cache_pixels(self, filepath, group, number, width, height, pixels):
+        """Store decoded pixels, evicting the least recently used entries"""
+        if self._pixel_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._pixel_cache[(filepath, group, number)] = (width, height, pixels)
+            while len(self._pixel_cache) > self._pixel_cache_size:
+                self._pixel_cache.popitem(last=False)
+    
+    def _sprite_image(self, reader, filepath, sprite, group, number, data=None, cache=True, placeholder=True,
+                      palette_index=None):
+        """Decode an uncached sprite (from `data`, or read through `reader`) and return it as an
+        image; failures give a placeholder image, or None when `placeholder` is False"""
         if not hasattr(sprite, 'data_offset'):
             print(f"❌ Sprite [{group},{number}] missing data offset info")
-            return self._create_placeholder_image(group, number, 64, 64)
-        
-        data_offset = sprite.data_offset
-        data_length = getattr(sprite, 'data_length', 0)
-        
-        print(f"📷 Extracting sprite [{group},{number}] from offset {data_offset}")
+            return self._create_placeholder_image(group, number, 64, 64) if placeholder else None
+        decoded = self._decode(reader, filepath, sprite, group, number, data, cache)
+        if decoded is None:
+            return self._create_placeholder_image(group, number, 64, 64) if placeholder else None
+        if not isinstance(decoded, tuple):
+            return decoded
+        width, height, pixels = decoded
+        if not pixels:
+            print(f"❌ Failed to decode pixel data")
+            return self._create_placeholder_image(group, number, width, height) if placeholder else None
+        return self._colorize(sprite, group, number, width, height, pixels, palette_index)
+    
+    def _data_span(self, sprite):
+        """(offset, size) of the bytes a sprite decodes from"""
+        if self.header.ver0 == 1:
+            # Sprites recovered from a PCX scan have no stored length
+            return sprite.data_offset, sprite.data_length or 128 + self.PCX_SCAN_LIMIT
+        return sprite.data_offset, sprite.data_length
+    
+    def _decode(self, reader, filepath, sprite, group, number, data=None, cache=True):
+        """Read (unless `data` is given) and decode one sprite: (width, height, indexed pixels),
+        an RGBA image for direct-color PNGs, or None. Only reads parser state, so threads may
+        call it at once."""
+        if self.verbose:
+            print(f"📷 Extracting sprite [{group},{number}] from offset {sprite.data_offset}")
+        
+        if data is None and self.header.ver0 in (1, 2):
+            data = reader.read_at(*self._data_span(sprite))
+        if self.header.ver0 == 1:
+            decoded = self._decode_pcx(data, group, number)
+        elif self.header.ver0 == 2:
+            decoded = self._decode_v2(data, sprite, group, number)
+        else:
+            print(f"❌ Unsupported SFF version for extraction: {self.header.ver0}")
+            return None
         
-        try:
-            # Read PCX header first to determine actual data size
-            f.seek(data_offset)
-            pcx_header = f.read(128)
-            
-            if len(pcx_header) < 128:
-                print(f"❌ PCX header too short: {len(pcx_header)} bytes")
-                return self._create_placeholder_image(group, number, 64, 64)
+        if isinstance(decoded, tuple):
+            if decoded[2]:
+                self._stats.count('sprites_decoded')
+                if cache:
+                    self._cache_pixels(filepath, group, number, *decoded)
+        elif decoded is not None:
+            self._stats.count('sprites_decoded')
+        return decoded
+    
+    def _decode_pcx(self, data, group, number):
+        """Decode a v1 sprite's PCX data (header, pixels, trailing palette) to (width, height, pixels)"""
+        with self._phase('decode.pcx', group=group, number=number):
+            if len(data) < 128:
+                print(f"❌ PCX header too short: {len(data)} bytes")
+                return None
             
             # Parse PCX header
-            manufacturer = pcx_header[0]
-            version = pcx_header[1]
-            encoding = pcx_header[2]
-            bits_per_pixel = pcx_header[3]
+            manufacturer = data[0]
+            encoding = data[2]
             
             if manufacturer != 10:
                 print(f"❌ Not a PCX file (manufacturer={manufacturer})")
-                return self._create_placeholder_image(group, number, 64, 64)
+                return None
             
             # Get dimensions
-            xmin, ymin, xmax, ymax = struct.unpack('<HHHH', pcx_header[4:12])
+            xmin, ymin, xmax, ymax = struct.unpack('<HHHH', data[4:12])
             width = xmax - xmin + 1
             height = ymax - ymin + 1
             
-            print(f"📐 Sprite dimensions: {width}x{height}, encoding={encoding}")
+            if self.verbose:
+                print(f"📐 Sprite dimensions: {width}x{height}, encoding={encoding}")
             
             # Get bytes per line
-            bytes_per_line = struct.unpack('<H', pcx_header[66:68])[0]
-            
-            # Calculate data size if not provided
-            if data_length == 0:
-                # Estimate data size - for RLE, this is tricky, so we'll read conservatively
-                if encoding == 1:  # RLE
-                    # For RLE, read until we find the palette at the end or hit another PCX header
-                    max_read = min(100000, f.seek(0, 2) - (data_offset + 128))  # Don't read beyond file
-                    f.seek(data_offset + 128)
-                    estimated_pixel_data = f.read(max_read)
-                    
-                    # Look for palette signature (we expect 768 bytes of palette at the end)
-                    pixel_data_end = len(estimated_pixel_data) - 768
-                    if pixel_data_end < 0:
-                        pixel_data_end = len(estimated_pixel_data)
-                    
-                else:  # Uncompressed
-                    pixel_data_end = width * height
-                
-            else:
-                # Use provided data length
-                f.seek(data_offset + 128)
-                pixel_data_end = data_length - 128 - 768  # Subtract header and palette
-                if pixel_data_end < 0:
-                    pixel_data_end = data_length - 128
+            bytes_per_line = struct.unpack('<H', data[66:68])[0]
             
-            # Read pixel data
-            f.seek(data_offset + 128)
-            pixel_data = f.read(pixel_data_end)
+            # Pixel data runs up to the 768-byte palette at the end, when there is room for one
+            pixel_data = data[128:]
+            if len(pixel_data) >= 768:
+                pixel_data = pixel_data[:-768]
             
             # Decode pixels
             if encoding == 1:  # RLE encoded
                 pixels = self.decode_rle_pcx(pixel_data, width, height, bytes_per_line)
             else:  # Uncompressed
-                pixels = pixel_data[:width * height]
-            
-            if not pixels:
-                print(f"❌ Failed to decode pixel data")
-                return self._create_placeholder_image(group, number, width, height)
-            
+                pixels = bytes(pixel_data[:width * height])
+        
+        return width, height, pixels
+    
+    def _decode_v2(self, data, sprite, group, number):
+        """Decode a v2 sprite's data block by format"""
+        fmt = -sprite.rle
+        width, height = sprite.size
+        if fmt == 0:
+            with self._phase('decode.raw', group=group, number=number):
+                return width, height, bytes(data[:width * height])
+        
+        # Compressed formats start with the uncompressed length
+        body = data[4:]
+        if fmt == 2:
+            with self._phase('decode.rle8', group=group, number=number):
+                return width, height, self.decode_rle8(body, width, height)
+        if fmt in (10, 11, 12):
+            with self._phase('decode.png', group=group, number=number):
+                img = Image.open(io.BytesIO(body))
+                img.load()
+            if fmt == 10 and img.mode in ('P', 'L'):
+                # PNG8 indices use the SFF palette, not the PNG's own
+                return img.width, img.height, img.tobytes()
+            return img.convert('RGBA')
+        
+        print(f"⚠️ SFF v2 sprite format {fmt} is not supported yet [{group},{number}]")
+        return None
+    
+    def _colorize(self, sprite, group, number, width, height, pixels, palette_index=None):
+        """Apply a palette (default: the sprite's own) to indexed pixels and return an RGBA image"""
+        with self._phase('colorize', group=group, number=number):
             # Get palette
-            palette_index = getattr(sprite, 'palette_index', 0)
+            if palette_index is None:
+                palette_index = getattr(sprite, 'palette_index', 0)
             palette = self.palette_list.get_palette(palette_index)
             
             if not palette and len(self.palette_list.palettes) > 0:
                 palette = self.palette_list.palettes[0]
             
             if not palette:
-                print(f"⚠️ No palette available, creating grayscale image")
+                self._log(f"⚠️ No palette available, creating grayscale image")
                 # Create PIL image from raw pixel data (grayscale)
                 img = Image.new('L', (width, height))
                 if len(pixels) >= width * height:
@@ -774,46 +1199,15 @@ class SFFParser:
             # Create PIL image with palette
             img = Image.new('P', (width, height))
             if len(pixels) >= width * height:
-                img.putdata(pixels[:width * height])
+                img.frombytes(bytes(pixels[:width * height]))
             
-            # Convert palette to PIL format
-            pil_palette = []
-            for r, g, b, a in palette:
-                pil_palette.extend([r, g, b])
-            
-            img.putpalette(pil_palette)
-            
-            # Convert to RGBA to handle transparency
+            # Color 0 is transparent, and so is every entry sharing its RGB
+            img.putpalette(palette_to_rgba(palette), rawmode='RGBA')
             rgba_img = img.convert('RGBA')
             
-            # Make color 0 transparent
-            if len(palette) > 0:
-                datas = rgba_img.getdata()
-                new_data = []
-                transparent_color = palette[0][:3]  # RGB of color 0
-                
-                for item in datas:
-                    if item[:3] == transparent_color:  # If it matches color 0
-                        new_data.append((item[0], item[1], item[2], 0))  # Make transparent
-                    else:
-                        new_data.append(item)
-                
-                rgba_img.putdata(new_data)
-            
-            print(f"✅ Successfully extracted sprite [{group},{number}] as {width}x{height} image")
+            if self.verbose:
+                print(f"✅ Successfully extracted sprite [{group},{number}] as {width}x{height} image")
             return rgba_img
-            
-        except Exception as e:
-            print(f"❌ Error extracting sprite data: {e}")
-            import traceback
-            traceback.print_exc()
-            return self._create_placeholder_image(group, number, 64, 64)
-    
-    def _extract_sprite_v2(self, f, sprite, group, number):
-        """Extract SFF v2 sprite"""
-        # This would implement v2 sprite extraction with proper format handling
-        print(f"⚠️ SFF v2 sprite extraction not fully implemented yet")
-        return self._create_placeholder_image(group, number, 64, 64)
     
     def _create_placeholder_image(self, group, number, width=64, height=64):
         """Create a placeholder image for missing/invalid sprites"""
@@ -838,16 +1232,166 @@ class SFFParser:
         
         return img
 
+class SpriteIndex:
+    """Sorted sprite keys supporting the viewer's search queries
+    
+    Query terms (space separated, all must match):
+      200        group 200              5000-5999   groups 5000 to 5999
+      g:200      group 200              g:200-299   groups 200 to 299
+      n:5        number 5               n:0-9       numbers 0 to 9
+      200,5      exact sprite [200,5]   200,        group 200
+    Anything else falls back to a substring match on the "[group,number]" text.
+    """
+    def __init__(self, keys):
+        self.keys = sorted(keys)
+        self.groups = [group for group, _ in self.keys]  # Parallel list for bisect
+        
+    def group_range(self, low, high):
+        """Return keys whose group lies in [low, high]"""
+        return self.keys[bisect_left(self.groups, low):bisect_right(self.groups, high)]
+    
+    @staticmethod
+    def _parse_range(text):
+        low, sep, high = text.partition('-')
+        if sep:
+            return int(low), int(high)
+        return int(low), int(low)
+    
+    def _parse_term(self, term):
+        """Return (group_low, group_high, predicate) for one query term"""
+        unbounded = (0, float('inf'))
+        try:
+            if term.startswith('g:'):
+                return self._parse_range(term[2:]) + (None,)
+            if term.startswith('n:'):
+                low, high = self._parse_range(term[2:])
+                return unbounded + (lambda key: low <= key[1] <= high,)
+            if ',' in term:
+                group_text, _, number_text = term.strip('[]').partition(',')
+                group = int(group_text)
+                if not number_text:
+                    return group, group, None
+                number = int(number_text)
+                return group, group, lambda key: key[1] == number
+            return self._parse_range(term) + (None,)
+        except ValueError:
+            return unbounded + (lambda key: term in f"[{key[0]},{key[1]}]",)
+    
+    def query(self, text):
+        """Return the sorted keys matching a search string"""
+        terms = text.lower().split()
+        if not terms:
+            return self.keys
+        
+        low, high = 0, float('inf')
+        predicates = []
+        for term in terms:
+            term_low, term_high, predicate = self._parse_term(term)
+            low, high = max(low, term_low), min(high, term_high)
+            if predicate is not None:
+                predicates.append(predicate)
+        if low > high:
+            return []
+        
+        candidates = self.group_range(low, high)
+        for predicate in predicates:
+            candidates = [key for key in candidates if predicate(key)]
+        return candidates
+
+class ThumbnailCache:
+    """Sprite thumbnail cache: in-memory LRU backed by PNG files on disk
+    
+    Keys include the SFF path, mtime and size, so editing a file invalidates its thumbnails,
+    and VERSION, so decoder fixes invalidate thumbnails written by older builds.
+    """
+    VERSION = 2  # Bump whenever decoding output changes
+    def __init__(self, cache_dir=None, memory_items=1024):
+        if cache_dir is None:
+            base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            cache_dir = os.path.join(base, 'fightermanager', 'thumbnails')
+        self.cache_dir = Path(cache_dir)
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def _disk_path(self, key):
+        import hashlib
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.png"
+    
+    def get(self, key):
+        """Return the cached thumbnail for `key`, or None"""
+        with self._lock:
+            img = self._memory.get(key)
+            if img is not None:
+                self._memory.move_to_end(key)
+                return img
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            img = Image.open(path)
+            img.load()
+        except Exception:
+            return None
+        self._remember(key, img)
+        return img
+    
+    def put(self, key, img):
+        """Store a thumbnail in memory and on disk"""
+        self._remember(key, img)
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            img.save(tmp_path, format='PNG')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write thumbnail cache {path}: {e}")
+    
+    def _remember(self, key, img):
+        with self._lock:
+            self._memory[key] = img
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
 class MUGENViewer:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("MUGEN SFF Viewer - Robust Prototype")
         self.root.geometry("1000x700")
         
-        self.parser = SFFParser()
+        self.parser = SFFParser(verbose=False)
         self.current_image = None
         
+        # Sprites are decoded on worker threads; results come back through a queue
+        # drained by a root.after poll so Tk is only ever touched from the UI thread
+        self.decode_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sff-decode")
+        self._decode_results = queue.Queue()
+        self._pending_decodes = {}  # Maps image key to [future, callbacks, cancellable]
+        self._image_cache = OrderedDict()  # Maps image key to decoded PIL image
+        self._image_cache_size = 64
+        self._palette_overrides = {}  # Maps (group, number) to a palette chosen with Apply
+        
+        # Grid thumbnails get their own workers so scrolling never delays the main view
+        self.thumb_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sff-thumb")
+        self.thumbnail_cache = ThumbnailCache()
+        self._pending_thumbnails = {}  # Maps thumbnail key to [future, callbacks, cancellable]
+        self._thumb_photos = OrderedDict()  # Maps thumbnail key to PhotoImage
+        self._thumb_photo_limit = 512
+        self._file_signature = None  # (path, mtime_ns, size) of the loaded SFF
+        self._display_generation = 0
+        self._load_generation = 0  # Bumped per loaded file; older job results are dropped
+        self._poll_scheduled = False
+        self.prefetch_radius = 2
+        
+        self._animation = None  # Playback state while an action is playing
+        self._animation_generation = 0
+        self._animation_after_id = None
+        
         self.setup_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def setup_gui(self):
         # Create main frame with paned window
@@ -888,7 +1432,7 @@ class MUGENViewer:
         search_frame.pack(fill=tk.X, pady=(2, 5))
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', self.filter_sprites)
+        self.search_var.trace('w', self.on_search_changed)
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
         
@@ -933,8 +1477,28 @@ class MUGENViewer:
         self.palette_info_var = tk.StringVar(value="No palettes loaded")
         ttk.Label(palette_frame, textvariable=self.palette_info_var, wraplength=250).pack(anchor=tk.W, pady=(2, 0))
         
+        # Animation playback from the .air next to the .sff
+        animation_frame = ttk.LabelFrame(left_frame, text="Animation", padding=5)
+        animation_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        animation_control_frame = ttk.Frame(animation_frame)
+        animation_control_frame.pack(fill=tk.X)
+        ttk.Label(animation_control_frame, text="Action:").pack(side=tk.LEFT)
+        self.action_var = tk.StringVar(value="0")
+        ttk.Entry(animation_control_frame, textvariable=self.action_var, width=8).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(animation_control_frame, text="Play", command=self.play_animation).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Button(animation_control_frame, text="Stop", command=self.stop_animation).pack(side=tk.LEFT, padx=(2, 0))
+        
+        # Single sprite and thumbnail grid views share the right panel
+        self.view_notebook = ttk.Notebook(right_frame)
+        self.view_notebook.pack(fill=tk.BOTH, expand=True)
+        sprite_tab = ttk.Frame(self.view_notebook)
+        grid_tab = ttk.Frame(self.view_notebook)
+        self.view_notebook.add(sprite_tab, text="Sprite")
+        self.view_notebook.add(grid_tab, text="Grid")
+        
         # Image display area
-        image_frame = ttk.LabelFrame(right_frame, text="Sprite Display", padding=10)
+        image_frame = ttk.LabelFrame(sprite_tab, text="Sprite Display", padding=10)
         image_frame.pack(fill=tk.BOTH, expand=True)
         
         # Scrollable image canvas
@@ -954,8 +1518,27 @@ class MUGENViewer:
         self.image_info_var = tk.StringVar(value="No sprite selected")
         ttk.Label(image_frame, textvariable=self.image_info_var).pack(pady=(5, 0))
         
+        # Thumbnail grid: only the cells inside the viewport exist on the canvas,
+        # so scrolling cost is independent of the number of sprites
+        self.grid_canvas = tk.Canvas(grid_tab, bg='gray90', highlightthickness=0)
+        self.grid_scroll = ttk.Scrollbar(grid_tab, orient=tk.VERTICAL, command=self._grid_yview)
+        self.grid_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.grid_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.grid_canvas.bind('<Configure>', lambda event: self._schedule_grid_redraw())
+        self.grid_canvas.bind('<MouseWheel>', self._on_grid_wheel)
+        self.grid_canvas.bind('<Button-4>', lambda event: self._grid_yview('scroll', -1, 'units'))
+        self.grid_canvas.bind('<Button-5>', lambda event: self._grid_yview('scroll', 1, 'units'))
+        self.grid_canvas.bind('<Button-1>', self._on_grid_click)
+        self._grid_top = 0  # Scroll position in pixels
+        self._grid_redraw_scheduled = False
+        
         # Store all sprites for filtering
         self.all_sprites = []
+        self.visible_sprites = []  # Sprite keys in listbox row order
+        self._row_of = {}  # Maps sprite key to its listbox row
+        self.sprite_index = SpriteIndex([])
+        self._search_after_id = None
+        self.search_debounce_ms = 150
         self.current_sprite = None  # Track currently displayed sprite for palette changes
         
     def apply_palette(self):
@@ -970,7 +1553,8 @@ class MUGENViewer:
                 group, number = self.current_sprite
                 sprite = self.parser.sprites.get((group, number))
                 if sprite:
-                    sprite.palette_index = palette_index
+                    # Kept by the viewer: the parsed tables are shared with decode workers
+                    self._palette_overrides[(group, number)] = palette_index
                     self.display_sprite(group, number)
                     self.status_var.set(f"✅ Applied palette {palette_index} to sprite [{group},{number}]")
                 else:
@@ -1037,10 +1621,22 @@ class MUGENViewer:
         self.status_var.set(f"Loading {filepath}...")
         self.root.update()
         
+        # Frames of a playing action belong to the old file
+        self.stop_animation()
+        self._reset_decodes()
+        self._palette_overrides.clear()
+        
         try:
-            if self.parser.parse_file(filepath):
+            # Jobs still running keep reading the old parser, so parse into a fresh one and swap
+            parser = SFFParser(verbose=False)
+            if parser.parse_file(filepath):
+                self.parser = parser
+                self._load_generation += 1
+                stat = os.stat(filepath)
+                self._file_signature = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
                 sprites = self.parser.get_sprite_list()
                 self.all_sprites = sorted(sprites)
+                self.sprite_index = SpriteIndex(self.all_sprites)
                 self.status_var.set(f"✅ Loaded {len(sprites)} sprites from SFF v{self.parser.header.ver0}")
                 
                 # Populate listbox
@@ -1090,121 +1686,167 @@ class MUGENViewer:
             if self.parser.has_sprite(group, number):
                 found_sprites.append((group, number))
                 print(f"  ✅ Found [{group},{number}]")
-                
-                # Try to extract the sprite
-                img = self.parser.extract_sprite_image(self.file_var.get(), group, number)
-                if img:
-                    print(f"     Successfully extracted as {img.size} image")
-                else:
-                    print(f"     Failed to extract image data")
             else:
                 print(f"  ❌ Missing [{group},{number}]")
         
-        if found_sprites:
-            self.status_var.set(f"🎉 Found {len(found_sprites)} title sprites!")
-            # Display the first found sprite
-            group, number = found_sprites[0]
-            self.display_sprite(group, number)
-        else:
+        if not found_sprites:
             self.status_var.set("😞 No title background sprites found")
+            return
+        
+        self.status_var.set(f"Extracting {len(found_sprites)} title sprites...")
+        extracted = []
+        
+        def on_decoded(key, img):
+            _, group, number, _ = key
+            extracted.append((group, number))
+            if img:
+                print(f"     [{group},{number}] successfully extracted as {img.size} image")
+            else:
+                print(f"     [{group},{number}] failed to extract image data")
+            if len(extracted) == len(found_sprites):
+                self.status_var.set(f"🎉 Found {len(found_sprites)} title sprites!")
+                # Display the first found sprite
+                self.display_sprite(*found_sprites[0])
+        
+        # Extract all title sprites in the background
+        for group, number in found_sprites:
+            self._request_decode(self._image_key(group, number), on_decoded, cancellable=False)
+    
+    def on_search_changed(self, *args):
+        """Debounce search input: filter once typing pauses"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.search_debounce_ms, self.filter_sprites)
     
     def filter_sprites(self, *args):
-        """Filter sprite list based on search text"""
-        search_text = self.search_var.get().lower()
-        if not search_text:
-            filtered_sprites = self.all_sprites
-        else:
-            filtered_sprites = []
-            for group, number in self.all_sprites:
-                sprite_text = f"[{group},{number}]"
-                if search_text in sprite_text.lower():
-                    filtered_sprites.append((group, number))
-        
-        self.sprite_listbox.delete(0, tk.END)
-        for group, number in filtered_sprites:
-            self.sprite_listbox.insert(tk.END, f"[{group},{number}]")
+        """Filter sprite list based on search text (see SpriteIndex.query for syntax)"""
+        self._search_after_id = None
+        self._set_visible_sprites(self.sprite_index.query(self.search_var.get()))
     
     def update_sprite_list(self):
         """Update the sprite listbox with all sprites"""
-        self.sprite_listbox.delete(0, tk.END)
-        for group, number in self.all_sprites:
-            self.sprite_listbox.insert(tk.END, f"[{group},{number}]")
+        self._set_visible_sprites(self.all_sprites)
+    
+    def _set_visible_sprites(self, sprites):
+        """Update the listbox to show `sprites`, touching only rows that changed"""
+        old = self.visible_sprites
+        new = list(sprites)
+        new_set = set(new)
+        removed = sum(1 for key in old if key not in new_set)
+        kept = len(old) - removed
+        added = len(new) - kept
+        
+        if kept == 0 or removed + added > kept:
+            # Mostly different: one bulk replace is cheaper than many small edits
+            self.sprite_listbox.delete(0, tk.END)
+            if new:
+                self.sprite_listbox.insert(tk.END, *(f"[{g},{n}]" for g, n in new))
+        else:
+            # Both lists are sorted subsequences of all_sprites, so walk them in step:
+            # delete runs of vanished rows back to front, then insert runs of new rows
+            row = len(old) - 1
+            while row >= 0:
+                if old[row] in new_set:
+                    row -= 1
+                    continue
+                end = row
+                while row >= 0 and old[row] not in new_set:
+                    row -= 1
+                self.sprite_listbox.delete(row + 1, end)
+            
+            old_set = set(old)
+            row = 0
+            while row < len(new):
+                if new[row] in old_set:
+                    row += 1
+                    continue
+                start = row
+                while row < len(new) and new[row] not in old_set:
+                    row += 1
+                self.sprite_listbox.insert(start, *(f"[{g},{n}]" for g, n in new[start:row]))
+        
+        self.visible_sprites = new
+        self._row_of = {key: row for row, key in enumerate(new)}
+        self._grid_top = 0
+        self._schedule_grid_redraw()
     
     def on_sprite_select(self, event):
         """Handle sprite selection"""
         selection = self.sprite_listbox.curselection()
-        if selection:
-            sprite_text = self.sprite_listbox.get(selection[0])
-            # Parse "[group,number]" format
-            import re
-            match = re.match(r'\[(\d+),(\d+)\]', sprite_text)
-            if match:
-                group, number = int(match.group(1)), int(match.group(2))
-                self.image_info_var.set(f"Selected: [{group},{number}] - Click to load")
-                self.current_sprite = (group, number)  # Update current sprite for palette actions
+        if selection and selection[0] < len(self.visible_sprites):
+            group, number = self.visible_sprites[selection[0]]
+            if (group, number) != self.current_sprite:
+                # Decoding happens in the background, so selection can load immediately
+                self.display_sprite(group, number)
     
     def on_sprite_double_click(self, event):
         """Handle double-click to load sprite"""
         selection = self.sprite_listbox.curselection()
-        if selection:
-            sprite_text = self.sprite_listbox.get(selection[0])
-            import re
-            match = re.match(r'\[(\d+),(\d+)\]', sprite_text)
-            if match:
-                group, number = int(match.group(1)), int(match.group(2))
-                self.display_sprite(group, number)
+        if selection and selection[0] < len(self.visible_sprites):
+            self.display_sprite(*self.visible_sprites[selection[0]])
     
     def display_sprite(self, group, number):
-        """Display the selected sprite"""
-        try:
-            self.current_sprite = (group, number)  # Track current sprite
+        """Display the selected sprite, decoding it on a worker thread if needed"""
+        self.stop_animation()
+        self.current_sprite = (group, number)  # Track current sprite
+        self._display_generation += 1
+        generation = self._display_generation
+        
+        # Get sprite info to show current palette
+        current_palette_index = self._sprite_palette(group, number)
+        self.palette_var.set(str(current_palette_index))
+        
+        self._select_list_row(group, number)
+        
+        key = self._image_key(group, number)
+        img = self._cached_image(key)
+        if img is not None:
+            self._show_image(group, number, img, current_palette_index)
+        else:
             self.status_var.set(f"Loading sprite [{group},{number}]...")
-            self.root.update()
             
-            # Get sprite info to show current palette
-            sprite = self.parser.sprites.get((group, number))
-            current_palette_index = sprite.palette_index if sprite else 0
-            self.palette_var.set(str(current_palette_index))
+            def on_decoded(key, img):
+                # Drop results for selections the user has already moved past
+                if generation == self._display_generation:
+                    self._show_image(group, number, img, current_palette_index)
+            
+            self._request_decode(key, on_decoded)
+        
+        keep = {key}
+        keep.update(self._prefetch_neighbors(group, number))
+        self._cancel_stale_decodes(keep)
+        self._schedule_grid_redraw()  # Move the grid highlight
+    
+    def _show_image(self, group, number, img, current_palette_index):
+        """Draw a decoded sprite on the canvas (UI thread only)"""
+        if not img:
+            self.status_var.set(f"❌ Could not load sprite [{group},{number}]")
+            self.image_info_var.set("Failed to load sprite")
+            return
+        
+        try:
+            # Clear canvas
+            self.image_canvas.delete("all")
+            
+            # Convert to PhotoImage
+            photo = ImageTk.PhotoImage(img)
+            
+            # Add to canvas
+            self.image_canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+            self.image_canvas.image = photo  # Keep reference
+            
+            # Update scroll region
+            self.image_canvas.config(scrollregion=self.image_canvas.bbox("all"))
+            
+            # Update info with palette information
+            mode = img.mode
+            has_alpha = mode in ('RGBA', 'LA') or 'transparency' in img.info
+            alpha_info = " (with transparency)" if has_alpha else ""
+            palette_info = f", palette {current_palette_index}"
+            self.image_info_var.set(f"Sprite [{group},{number}]: {img.size[0]}x{img.size[1]}, {mode}{alpha_info}{palette_info}")
+            
+            self.status_var.set(f"✅ Displayed sprite [{group},{number}] with palette {current_palette_index}")
             
-            img = self.parser.extract_sprite_image(self.file_var.get(), group, number)
-            if img:
-                # Clear canvas
-                self.image_canvas.delete("all")
-                
-                # Convert to PhotoImage
-                photo = ImageTk.PhotoImage(img)
-                
-                # Add to canvas
-                self.image_canvas.create_image(0, 0, anchor=tk.NW, image=photo)
-                self.image_canvas.image = photo  # Keep reference
-                
-                # Update scroll region
-                self.image_canvas.config(scrollregion=self.image_canvas.bbox("all"))
-                
-                # Update info with palette information
-                mode = img.mode
-                has_alpha = mode in ('RGBA', 'LA') or 'transparency' in img.info
-                alpha_info = " (with transparency)" if has_alpha else ""
-                palette_info = f", palette {current_palette_index}"
-                self.image_info_var.set(f"Sprite [{group},{number}]: {img.size[0]}x{img.size[1]}, {mode}{alpha_info}{palette_info}")
-                
-                self.status_var.set(f"✅ Displayed sprite [{group},{number}] with palette {current_palette_index}")
-                
-                # Auto-select this sprite in the list if not already selected
-                sprite_text = f"[{group},{number}]"
-                for i in range(self.sprite_listbox.size()):
-                    if self.sprite_listbox.get(i) == sprite_text:
-                        self.sprite_listbox.selection_clear(0, tk.END)
-                        self.sprite_listbox.selection_set(i)
-                        self.sprite_listbox.see(i)
-                        break
-                
-                self.current_sprite = (group, number)  # Update current sprite for palette actions
-                
-            else:
-                self.status_var.set(f"❌ Could not load sprite [{group},{number}]")
-                self.image_info_var.set("Failed to load sprite")
-                
         except Exception as e:
             self.status_var.set(f"❌ Error displaying sprite: {e}")
             self.image_info_var.set(f"Error: {e}")
@@ -1212,8 +1854,401 @@ class MUGENViewer:
             import traceback
             traceback.print_exc()
     
-
-            print(f"Error selecting next palette: {e}")
+    def _select_list_row(self, group, number):
+        """Select the listbox row for a sprite, if it is currently listed"""
+        row = self._row_of.get((group, number))
+        if row is not None:
+            if self.sprite_listbox.curselection() != (row,):
+                self.sprite_listbox.selection_clear(0, tk.END)
+                self.sprite_listbox.selection_set(row)
+            self.sprite_listbox.see(row)
+        return row
+    
+    def _sprite_palette(self, group, number):
+        """Palette a sprite is shown in: the one applied in the viewer, else its own"""
+        override = self._palette_overrides.get((group, number))
+        if override is not None:
+            return override
+        sprite = self.parser.sprites.get((group, number))
+        return sprite.palette_index if sprite else 0
+    
+    def _image_key(self, group, number):
+        """Cache key for a decoded sprite: file, sprite and palette"""
+        return (self.file_var.get(), group, number, self._sprite_palette(group, number))
+    
+    def _cached_image(self, key):
+        """Return a decoded image from the viewer cache, or None"""
+        img = self._image_cache.get(key)
+        if img is not None:
+            self._image_cache.move_to_end(key)
+        return img
+    
+    def _decode_job(self, key):
+        """Worker thread: decode one sprite to a PIL image"""
+        filepath, group, number, palette_index = key
+        return self.parser.extract_sprite_image(filepath, group, number, palette_index=palette_index)
+    
+    def _request_decode(self, key, callback=None, cancellable=True):
+        """Queue a background decode; concurrent requests for one key share a job"""
+        img = self._cached_image(key)
+        if img is not None:
+            if callback:
+                callback(key, img)
+            return
+        
+        callbacks = [self._store_image] + ([callback] if callback else [])
+        self._submit_job(self._pending_decodes, self.decode_pool, self._decode_job, key, callbacks, cancellable)
+    
+    def _store_image(self, key, img):
+        """Add a decoded image to the viewer cache"""
+        if img is not None:
+            self._image_cache[key] = img
+            while len(self._image_cache) > self._image_cache_size:
+                self._image_cache.popitem(last=False)
+    
+    def _submit_job(self, pending, pool, job, key, callbacks, cancellable):
+        """Run job(key) on a pool unless already pending; callbacks run on the UI thread"""
+        entry = pending.get(key)
+        if entry is not None:
+            entry[1].extend(cb for cb in callbacks if cb not in entry[1])
+            entry[2] = entry[2] and cancellable
+            return
+        
+        future = pool.submit(job, key)
+        pending[key] = [future, list(callbacks), cancellable]
+        generation = self._load_generation
+        future.add_done_callback(lambda fut, key=key: self._decode_results.put((pending, key, fut, generation)))
+        self._schedule_poll()
+    
+    def _prefetch_neighbors(self, group, number):
+        """Decode the list entries around a sprite ahead of time; returns their keys"""
+        keys = []
+        row = self._row_of.get((group, number))
+        if row is None:
+            return keys
+        for offset in range(1, self.prefetch_radius + 1):
+            for neighbor_row in (row + offset, row - offset):
+                if 0 <= neighbor_row < len(self.visible_sprites):
+                    key = self._image_key(*self.visible_sprites[neighbor_row])
+                    keys.append(key)
+                    self._request_decode(key)
+        return keys
+    
+    def _cancel_stale_jobs(self, pending, keep):
+        """Cancel queued jobs that are no longer wanted"""
+        for key, (future, _, cancellable) in list(pending.items()):
+            if key not in keep and cancellable and future.cancel():
+                del pending[key]
+    
+    def _cancel_stale_decodes(self, keep):
+        self._cancel_stale_jobs(self._pending_decodes, keep)
+    
+    def _reset_decodes(self):
+        """Drop all queued jobs and cached images (e.g. when a new file loads)"""
+        self._display_generation += 1
+        for pending in (self._pending_decodes, self._pending_thumbnails):
+            for future, _, _ in pending.values():
+                future.cancel()
+            pending.clear()
+        self._image_cache.clear()
+        self._thumb_photos.clear()
+    
+    def _schedule_poll(self):
+        if not self._poll_scheduled:
+            self._poll_scheduled = True
+            self.root.after(10, self._poll_decode_results)
+    
+    def _poll_decode_results(self):
+        """UI thread: hand finished jobs to their callbacks"""
+        self._poll_scheduled = False
+        while True:
+            try:
+                pending, key, future, generation = self._decode_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._load_generation:
+                continue  # Decoded from a file that has since been replaced
+            entry = pending.get(key)
+            if entry is None or entry[0] is not future:
+                continue  # Cancelled or superseded by a reset
+            del pending[key]
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error decoding sprite {key}: {e}")
+                result = None
+            for callback in entry[1]:
+                callback(key, result)
+        if self._pending_decodes or self._pending_thumbnails:
+            self._schedule_poll()
+    
+    # Thumbnail grid
+    
+    GRID_THUMB_SIZE = 64
+    GRID_CELL_WIDTH = 88
+    GRID_CELL_HEIGHT = 100
+    
+    def _thumbnail_key(self, group, number):
+        """Thumbnail cache key: cache version, file identity (path, mtime, size), sprite, palette
+        and size"""
+        return (ThumbnailCache.VERSION, self._file_signature, group, number, self._sprite_palette(group, number),
+                self.GRID_THUMB_SIZE)
+    
+    def _thumbnail_job(self, key):
+        """Worker thread: load a thumbnail from the cache or decode and shrink the sprite
+        
+        Sprites that fail to decode get a placeholder thumbnail that is never cached.
+        """
+        thumb = self.thumbnail_cache.get(key)
+        if thumb is None:
+            _, (filepath, _, _), group, number, palette_index, size = key
+            parser = self.parser  # One parser for the whole job, even if a new file loads meanwhile
+            img = parser.extract_sprite_image(filepath, group, number, placeholder=False,
+                                              palette_index=palette_index)
+            if img is None:
+                if (group, number) not in parser.sprites:
+                    return None
+                return parser._create_placeholder_image(group, number, size, size)
+            thumb = img.copy()
+            thumb.thumbnail((size, size))
+            self.thumbnail_cache.put(key, thumb)
+        return thumb
+    
+    def _on_thumbnail(self, key, thumb):
+        """UI thread: turn a finished thumbnail into a PhotoImage and repaint the grid"""
+        if thumb is None:
+            return
+        self._thumb_photos[key] = ImageTk.PhotoImage(thumb)
+        while len(self._thumb_photos) > self._thumb_photo_limit:
+            self._thumb_photos.popitem(last=False)
+        self._schedule_grid_redraw()
+    
+    def _grid_columns(self):
+        return max(1, self.grid_canvas.winfo_width() // self.GRID_CELL_WIDTH)
+    
+    def _grid_content_height(self):
+        rows = -(-len(self.visible_sprites) // self._grid_columns())
+        return rows * self.GRID_CELL_HEIGHT
+    
+    def _schedule_grid_redraw(self):
+        if not self._grid_redraw_scheduled:
+            self._grid_redraw_scheduled = True
+            self.root.after_idle(self._redraw_grid)
+    
+    def _redraw_grid(self):
+        """Draw only the cells intersecting the viewport and request their thumbnails"""
+        self._grid_redraw_scheduled = False
+        canvas = self.grid_canvas
+        canvas.delete('cell')
+        if self._file_signature is None:
+            return
+        
+        view_height = max(1, canvas.winfo_height())
+        content_height = self._grid_content_height()
+        self._grid_top = max(0, min(self._grid_top, content_height - view_height))
+        columns = self._grid_columns()
+        first_row = self._grid_top // self.GRID_CELL_HEIGHT
+        last_row = (self._grid_top + view_height) // self.GRID_CELL_HEIGHT + 1
+        
+        wanted = set()
+        for index in range(first_row * columns, min(last_row * columns, len(self.visible_sprites))):
+            group, number = self.visible_sprites[index]
+            row, column = divmod(index, columns)
+            x = column * self.GRID_CELL_WIDTH
+            y = row * self.GRID_CELL_HEIGHT - self._grid_top
+            outline = 'royalblue' if (group, number) == self.current_sprite else 'gray70'
+            canvas.create_rectangle(x + 2, y + 2, x + self.GRID_CELL_WIDTH - 2, y + self.GRID_CELL_HEIGHT - 2,
+                                    outline=outline, tags='cell')
+            
+            key = self._thumbnail_key(group, number)
+            wanted.add(key)
+            photo = self._thumb_photos.get(key)
+            if photo is not None:
+                self._thumb_photos.move_to_end(key)
+                canvas.create_image(x + self.GRID_CELL_WIDTH // 2, y + 6 + self.GRID_THUMB_SIZE // 2,
+                                    image=photo, tags='cell')
+            else:
+                self._submit_job(self._pending_thumbnails, self.thumb_pool, self._thumbnail_job,
+                                 key, [self._on_thumbnail], True)
+            canvas.create_text(x + self.GRID_CELL_WIDTH // 2, y + self.GRID_CELL_HEIGHT - 12,
+                               text=f"[{group},{number}]", tags='cell')
+        
+        # Cells that scrolled out of view no longer need their thumbnails
+        self._cancel_stale_jobs(self._pending_thumbnails, wanted)
+        
+        if content_height > 0:
+            self.grid_scroll.set(self._grid_top / content_height,
+                                 min(1.0, (self._grid_top + view_height) / content_height))
+        else:
+            self.grid_scroll.set(0.0, 1.0)
+    
+    def _grid_yview(self, *args):
+        """Scrollbar command: update the pixel scroll position and repaint"""
+        view_height = max(1, self.grid_canvas.winfo_height())
+        if args[0] == 'moveto':
+            self._grid_top = int(float(args[1]) * self._grid_content_height())
+        elif args[0] == 'scroll':
+            step = view_height if args[2] == 'pages' else self.GRID_CELL_HEIGHT
+            self._grid_top += int(args[1]) * step
+        self._schedule_grid_redraw()
+    
+    def _on_grid_wheel(self, event):
+        self._grid_yview('scroll', -1 if event.delta > 0 else 1, 'units')
+    
+    def _on_grid_click(self, event):
+        """Open the clicked thumbnail in the sprite view"""
+        column = event.x // self.GRID_CELL_WIDTH
+        columns = self._grid_columns()
+        if column >= columns:
+            return
+        index = (event.y + self._grid_top) // self.GRID_CELL_HEIGHT * columns + column
+        if 0 <= index < len(self.visible_sprites):
+            self.display_sprite(*self.visible_sprites[index])
+            self.view_notebook.select(0)
+    
+    # Animation playback
+    
+    def _air_path(self):
+        """Locate the .air file next to the loaded .sff"""
+        sff_path = Path(self.file_var.get())
+        for candidate in (sff_path.with_suffix('.air'), sff_path.with_suffix('.AIR')):
+            if candidate.exists():
+                return candidate
+        # Character folders often name the .air differently from the .sff
+        matches = sorted(sff_path.parent.glob('*.air')) + sorted(sff_path.parent.glob('*.AIR'))
+        return matches[0] if len(matches) == 1 else None
+    
+    def play_animation(self):
+        """Decode every sprite of the chosen action, then start playback"""
+        self.stop_animation()
+        try:
+            action_number = int(self.action_var.get())
+        except ValueError:
+            self.status_var.set("❌ Invalid action number")
+            return
+        
+        air_path = self._air_path()
+        if air_path is None:
+            self.status_var.set("❌ No .air file found next to the SFF")
+            return
+        actions = load_air(air_path)
+        action = actions.get(action_number) if actions else None
+        if action is None or len(action) == 0:
+            self.status_var.set(f"❌ Action {action_number} not found in {air_path.name}")
+            return
+        
+        self._animation_generation += 1
+        generation = self._animation_generation
+        keys = [key for key in action.sprite_keys() if key in self.parser.sprites]
+        decoded = {}
+        remaining = set(keys)
+        self.status_var.set(f"Decoding {len(keys)} sprites for action {action_number}...")
+        
+        def on_decoded(key, img):
+            if generation != self._animation_generation:
+                return
+            _, group, number, _ = key
+            decoded[(group, number)] = img
+            remaining.discard((group, number))
+            if not remaining:
+                self._start_animation(action, decoded)
+        
+        if not keys:
+            self._start_animation(action, decoded)
+        for group, number in keys:
+            self._request_decode(self._image_key(group, number), on_decoded, cancellable=False)
+    
+    def _start_animation(self, action, decoded):
+        """Convert every frame to a positioned PhotoImage once and start the clock"""
+        photos = {}  # (group, number, flags) -> PhotoImage
+        frames = []  # Per frame: (photo or None, left, top)
+        for i in range(len(action)):
+            group, number, _, x, y, flags = action.frame(i)
+            img = decoded.get((group, number))
+            sprite = self.parser.sprites.get((group, number))
+            if img is None or sprite is None:
+                frames.append((None, 0, 0))
+                continue
+            
+            photo_key = (group, number, flags)
+            if photo_key not in photos:
+                frame_img = img
+                if flags & FLIP_H:
+                    frame_img = frame_img.transpose(Image.FLIP_LEFT_RIGHT)
+                if flags & FLIP_V:
+                    frame_img = frame_img.transpose(Image.FLIP_TOP_BOTTOM)
+                photos[photo_key] = ImageTk.PhotoImage(frame_img)
+            
+            left, top = place_frame(img.size[0], img.size[1], sprite.offset[0], sprite.offset[1], x, y, flags)
+            frames.append((photos[photo_key], left, top))
+        
+        # Shift everything so the union of frame rectangles starts at the canvas origin
+        placed = [(photo, left, top) for photo, left, top in frames if photo is not None]
+        min_left = min((left for _, left, _ in placed), default=0)
+        min_top = min((top for _, _, top in placed), default=0)
+        max_right = max((left + photo.width() for photo, left, _ in placed), default=1)
+        max_bottom = max((top + photo.height() for photo, _, top in placed), default=1)
+        frames = [(photo, left - min_left, top - min_top) for photo, left, top in frames]
+        
+        self.image_canvas.delete("all")
+        item = self.image_canvas.create_image(0, 0, anchor=tk.NW)
+        self.image_canvas.config(scrollregion=(0, 0, max_right - min_left, max_bottom - min_top))
+        self.image_canvas.image = photos  # Keep references
+        
+        self._animation = {
+            'action': action,
+            'clock': action.clock(),
+            'frames': frames,
+            'item': item,
+            'start': time.perf_counter(),
+            'frame': None,
+        }
+        self.view_notebook.select(0)
+        self.status_var.set(f"▶️ Playing action {action.number}: {len(action)} frames, "
+                            f"{action.total_time() if action.total_time() >= 0 else 'held'} ticks")
+        self._animation_tick()
+    
+    def _animation_tick(self):
+        """Show the frame for the current wall-clock tick and sleep until the next change"""
+        self._animation_after_id = None
+        animation = self._animation
+        if animation is None:
+            return
+        
+        clock = animation['clock']
+        tick = int((time.perf_counter() - animation['start']) * AnimationClock.TICKS_PER_SECOND)
+        frame = clock.frame_at(tick)
+        if frame != animation['frame']:
+            animation['frame'] = frame
+            photo, left, top = animation['frames'][frame]
+            self.image_canvas.itemconfig(animation['item'], image=photo if photo is not None else '')
+            self.image_canvas.coords(animation['item'], left, top)
+            group, number = animation['action'].frame(frame)[:2]
+            self.image_info_var.set(f"Action {animation['action'].number} frame {frame} [{group},{number}] tick {tick}")
+        
+        next_tick = clock.next_change(tick)
+        if next_tick is not None:
+            next_time = animation['start'] + next_tick / AnimationClock.TICKS_PER_SECOND
+            delay_ms = max(1, int((next_time - time.perf_counter()) * 1000))
+            self._animation_after_id = self.root.after(delay_ms, self._animation_tick)
+    
+    def stop_animation(self):
+        """Stop playback (and abandon any action still being decoded)"""
+        self._animation_generation += 1
+        self._animation = None
+        if self._animation_after_id is not None:
+            self.root.after_cancel(self._animation_after_id)
+            self._animation_after_id = None
+    
+    def on_close(self):
+        """Stop the decode workers and close the window"""
+        self.stop_animation()
+        self._reset_decodes()
+        self.decode_pool.shutdown(wait=False)
+        self.thumb_pool.shutdown(wait=False)
+        self.root.destroy()
     
     def prev_palette(self):
         """Select the previous palette in the list"""
@@ -1230,7 +2265,7 @@ class MUGENViewer:
         """Run the GUI application"""
         self.root.mainloop()
 
-def test_console_mode():
+def test_console_mode(verbose=True):
     """Test SFF parsing in console mode with comprehensive analysis"""
     print("🚀 MUGEN SFF Parser Prototype - Console Mode")
     print("=" * 60)
@@ -1240,7 +2275,7 @@ def test_console_mode():
         print(f"❌ SFF file not found: {sff_path}")
         return
     
-    parser = SFFParser()
+    parser = SFFParser(verbose=verbose)
     success = parser.parse_file(sff_path)
     
     if success:
@@ -1306,14 +2341,42 @@ def test_console_mode():
             if sample_count >= 15:
                 break
         
+        print(f"\n⏱️ Parser stats:")
+        print(parser.stats_report())
+        
         print(f"\n🔍 For detailed sprite viewing, run without --console flag")
     else:
         print("❌ Failed to parse SFF file")
 
+def benchmark_decode_many(sff_path, thread_counts=(1, 2, 4, 8), repeat=3):
+    """Time decode_many over every sprite of `sff_path` at each thread count"""
+    parser = SFFParser(verbose=False, pixel_cache_size=0)
+    if not parser.parse_file(sff_path):
+        return None
+    keys = parser.get_sprite_list()
+    formats = {}
+    for sprite in parser.sprites.values():
+        formats[sprite.rle] = formats.get(sprite.rle, 0) + 1
+    print(f"⏱️ {sff_path}: {len(keys)} sprites, v{parser.header.ver0}, formats {formats}")
+    
+    timings = {}
+    for threads in thread_counts:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parser.decode_many(keys, max_workers=threads)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[threads] = best
+        print(f"  {threads:>2} threads: {best * 1000:8.1f} ms  ({timings[thread_counts[0]] / best:.2f}x)")
+    return timings
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 1 and sys.argv[1] == "--console":
-        test_console_mode()
+        test_console_mode(verbose="--quiet" not in sys.argv)
+    elif len(sys.argv) > 2 and sys.argv[1] == "--bench-threads":
+        benchmark_decode_many(sys.argv[2])
     else:
         print("🚀 MUGEN SFF Parser Prototype - Robust Implementation")
         print("This robust parser handles both SFF v1 and v2 formats")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Roster manifest compiler
+Reads select.def and every referenced character .def once at build time and writes a single
+JSON manifest (names, resolved paths, file sizes, mtimes, sprite counts, portrait locations)
+so the game loads the whole roster with one file read instead of parsing every DEF at boot.
+Run: python mugen_roster.py assets/mugen/data/select.def --out assets/mugen/roster.json
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from mugen_def import CharacterDef, SelectDef
+
+MANIFEST_VERSION = 2
+PORTRAITS = {'small': (9000, 0), 'large': (9000, 1)}
+FILE_KEYS = ('sprite', 'anim', 'cmd', 'cns', 'sound')
+
+
+def default_chars_dir(select_path):
+    """MUGEN layout: data/select.def next to chars/; fall back to a chars/ beside select.def"""
+    data_dir = os.path.dirname(os.path.abspath(select_path))
+    for candidate in (os.path.join(os.path.dirname(data_dir), 'chars'), os.path.join(data_dir, 'chars')):
+        if os.path.isdir(candidate):
+            return candidate
+    return os.path.join(os.path.dirname(data_dir), 'chars')
+
+
+def _relative(path, root):
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def _file_entry(path, root):
+    """{'path', 'size', 'mtime_ns'} for an existing file, else None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'path': _relative(path, root), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _entry_files(entry):
+    """Every file entry recorded for a character (used for up-to-date checks)"""
+    files = [entry.get('def')]
+    for value in entry.get('files', {}).values():
+        if isinstance(value, list):
+            files.extend(value)
+        elif isinstance(value, dict) and 'path' not in value:
+            files.extend(value.values())
+        else:
+            files.append(value)
+    return [item for item in files if item]
+
+
+def _is_current(entry, root):
+    for item in _entry_files(entry):
+        current = _file_entry(os.path.join(root, item['path']), root)
+        if current != item:
+            return False
+    # A referenced file that has appeared since compiling changes the entry too
+    return not any(os.path.exists(os.path.join(root, path)) for path in entry.get('missing', []))
+
+
+def _sff_summary(sff_path):
+    """Sprite count, SFF version and portrait locations from the sprite table"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(sff_path):
+        return 0, 0, {}
+    portraits = {}
+    for size, key in PORTRAITS.items():
+        sprite = parser.sprites.get(key)
+        if sprite is not None:
+            portraits[size] = {'group': key[0], 'number': key[1], 'axis': list(sprite.offset)}
+    return len(parser.sprites), parser.header.ver0, portraits
+
+
+def compile_character(select_entry, def_path, root):
+    """Build the manifest entry for one select.def character"""
+    entry = {
+        'name': select_entry['name'],
+        'order': select_entry['order'],
+        'stage': select_entry['stage'],
+        'music': select_entry['music'],
+        'def': _file_entry(def_path, root),
+        'valid': False,
+    }
+    definition = CharacterDef()
+    if entry['def'] is None or not definition.parse_file(def_path):
+        entry['error'] = f"DEF not found: {_relative(def_path, root)}"
+        return entry
+
+    missing = []
+
+    def referenced(value):
+        path = definition.resolve(value)
+        item = _file_entry(path, root)
+        if item is None:
+            missing.append(_relative(path, root))
+        return item
+
+    files = {}
+    for key in FILE_KEYS:
+        value = definition.get('files', key)
+        if value:
+            files[key] = referenced(value)
+    files['st'] = [referenced(value) for value in definition.get_state_files()]
+    files['pal'] = {str(slot): referenced(value) for slot, value in definition.get_palette_files().items()}
+
+    entry.update({
+        'display_name': definition.get_character_name() or select_entry['name'],
+        'author': definition.get_character_author(),
+        'localcoord': list(definition.get_localcoord()),
+        'files': files,
+        'missing': missing,  # Referenced but absent; re-checked before reusing the entry
+        'sprite_count': 0,
+        'sff_version': 0,
+        'portraits': {},
+    })
+    sprite = files.get('sprite')
+    if sprite is not None:
+        count, version, portraits = _sff_summary(os.path.join(root, sprite['path']))
+        entry.update(sprite_count=count, sff_version=version, portraits=portraits)
+    entry['valid'] = bool(sprite and files.get('anim') and entry['sprite_count'])
+    return entry
+
+
+def _compile_worker(job):
+    return compile_character(*job)
+
+
+def load_manifest(path):
+    """Read a manifest written by compile_manifest, or None if missing/unreadable"""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def compile_manifest(select_path, out_path, chars_dir=None, root=None, max_workers=None,
+                     force=False, verbose=True):
+    """Compile select.def and its characters into `out_path`; returns the manifest dict
+
+    Paths are stored relative to `root` (default: the current directory, i.e. the Godot
+    project root). Characters whose files are unchanged since the previous manifest are
+    reused without reopening their DEF or SFF.
+    """
+    start = time.perf_counter()
+    root = os.path.abspath(root or os.getcwd())
+    chars_dir = chars_dir or default_chars_dir(select_path)
+
+    select = SelectDef()
+    if not select.parse_file(select_path):
+        return None
+
+    previous = {} if force else {
+        (entry['name'], entry['def']['path'] if entry.get('def') else None): entry
+        for entry in (load_manifest(out_path) or {}).get('characters', [])
+    }
+
+    characters = [None] * len(select.characters)
+    jobs = []
+    reused = 0
+    for index, select_entry in enumerate(select.characters):
+        if select_entry['type'] != 'character':
+            continue
+        def_path = os.path.join(chars_dir, select_entry['def_path'].replace('\\', '/'))
+        cached = previous.get((select_entry['name'], _relative(def_path, root)))
+        if cached is not None and cached.get('def') and _is_current(cached, root):
+            cached.update(order=select_entry['order'], stage=select_entry['stage'],
+                          music=select_entry['music'])
+            characters[index] = cached
+            reused += 1
+        else:
+            jobs.append((index, (select_entry, def_path, root)))
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_compile_worker, [job for _, job in jobs])
+            for (index, _), entry in zip(jobs, results):
+                characters[index] = entry
+    else:
+        for index, job in jobs:
+            characters[index] = _compile_worker(job)
+
+    characters = sorted((entry for entry in characters if entry is not None),
+                        key=lambda entry: entry['order'])
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'select': _file_entry(select_path, root),
+        'chars_dir': _relative(chars_dir, root),
+        'grid': {key: list(value) if isinstance(value, tuple) else value
+                 for key, value in select.grid_config.items()},
+        'stages': [dict(stage, def_path=stage['def_path'].replace('\\', '/')) for stage in select.stages],
+        'characters': characters,
+    }
+
+    directory = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{out_path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(temp_path, out_path)
+
+    if verbose:
+        invalid = sum(1 for entry in characters if not entry['valid'])
+        print(f"✅ Wrote {out_path}: {len(characters)} characters ({len(jobs)} compiled, {reused} reused, "
+              f"{invalid} invalid) in {(time.perf_counter() - start) * 1000:.0f} ms")
+        for entry in characters:
+            if 'error' in entry:
+                print(f"  ⚠️ {entry['name']}: {entry['error']}")
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Compile select.def and character DEFs into a roster manifest")
+    arg_parser.add_argument('select', help="Path to select.def")
+    arg_parser.add_argument('--out', default='roster.json', help="Manifest file to write")
+    arg_parser.add_argument('--chars', default=None, help="Characters directory (default: ../chars from select.def)")
+    arg_parser.add_argument('--root', default=None, help="Directory manifest paths are relative to (default: cwd)")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument('--force', action='store_true', help="Recompile every character")
+    args = arg_parser.parse_args()
+
+    if compile_manifest(args.select, args.out, args.chars, args.root, args.workers, args.force) is None:
+        raise SystemExit(1)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Shared-memory decoded sprite store
+Worker processes decode SFF sprites straight into one shared arena of palette indices and send
+back only SpriteHandle tuples (offset, length, width, height, palette); each file's palettes are
+written once into a shared palette bank that everyone else only reads. Nothing larger than a
+handle is pickled, and no process keeps a private copy of pixels or palettes.
+Run: python mugen_shm.py assets/mugen [--workers N] [--capacity MB] [--compare]
+"""
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value, shared_memory
+from typing import NamedTuple
+
+PALETTE_BYTES = 256 * 4  # RGBA
+ALIGNMENT = 16
+DIRECT_COLOR_FORMATS = (11, 12)  # SFF v2 PNG24/PNG32 have no palette indices to store
+
+
+class SpriteHandle(NamedTuple):
+    offset: int  # Arena offset of width * height palette indices
+    length: int
+    width: int
+    height: int
+    palette: int  # Palette bank offset of the sprite's 256 RGBA entries
+    axis_x: int
+    axis_y: int
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def arena_bytes(sff_path):
+    """Arena bytes a worker reserves for a file: every sprite's aligned width * height"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False, pixel_cache_size=0)
+    if not parser.parse_file(sff_path):
+        return 0
+    return sum(_align(sprite.size[0] * sprite.size[1]) for sprite in parser.sprites.values())
+
+
+def palette_slots(sff_path):
+    """Upper bound on the palettes parse_file() keeps for a file, from its header alone"""
+    from mugen_prototype import SFFHeader
+
+    header = SFFHeader()
+    with open(sff_path, 'rb') as f:
+        header.read(f)
+    return max(1, header.number_of_palettes)
+
+
+# Segments and allocators attached once per worker process by _attach_worker
+_worker = {}
+
+
+def _reserve(counter, size, capacity):
+    """Bump-allocate `size` bytes; returns the offset or None when the segment is full"""
+    with counter.get_lock():
+        offset = counter.value
+        if offset + size > capacity:
+            return None
+        counter.value = offset + size
+    return offset
+
+
+def _attach_worker(arena_name, palette_name, arena_next, palette_next):
+    _worker['arena'] = shared_memory.SharedMemory(name=arena_name)
+    _worker['palettes'] = shared_memory.SharedMemory(name=palette_name)
+    _worker['arena_next'] = arena_next
+    _worker['palette_next'] = palette_next
+
+
+def _decode_into_store(sff_path):
+    """Worker: decode one SFF into the shared segments; returns (path, {key: handle}, error)"""
+    from mugen_prototype import SFFParser, palette_to_rgba
+
+    arena, bank = _worker['arena'], _worker['palettes']
+    parser = SFFParser(verbose=False, pixel_cache_size=0)
+    if not parser.parse_file(sff_path):
+        return sff_path, {}, "parse failed"
+
+    palettes = parser.palette_list.palettes
+    palette_base = _reserve(_worker['palette_next'], len(palettes) * PALETTE_BYTES, bank.size)
+    if palette_base is None:
+        return sff_path, {}, "palette bank full"
+    for i, palette in enumerate(palettes):
+        start = palette_base + i * PALETTE_BYTES
+        bank.buf[start:start + PALETTE_BYTES] = palette_to_rgba(palette)
+
+    # Sprite tables carry every size, so one reservation covers the whole file
+    sprites = sorted(parser.sprites.items(), key=lambda item: getattr(item[1], 'data_offset', 0))
+    base = _reserve(_worker['arena_next'], sum(_align(s.size[0] * s.size[1]) for _, s in sprites), arena.size)
+    if base is None:
+        return sff_path, {}, "arena full"
+
+    slots = {}
+    offset = base
+    for key, sprite in sprites:
+        slots[key] = (offset, _align(sprite.size[0] * sprite.size[1]))
+        offset += slots[key][1]
+
+    handles = {}
+    skipped = []
+    for key, decoded in parser.iter_sprites(sff_path, indexed=True):
+        if decoded is None:
+            direct = parser.header.ver0 == 2 and -parser.sprites[key].rle in DIRECT_COLOR_FORMATS
+            skipped.append(f"[{key[0]},{key[1]}] {'direct color' if direct else 'decode failed'}")
+            continue
+        offset, slot = slots[key]
+        width, height, pixels = decoded
+        length = min(len(pixels), width * height, slot)
+        arena.buf[offset:offset + length] = pixels[:length]
+        sprite = parser.sprites[key]
+        palette = sprite.palette_index if 0 <= sprite.palette_index < len(palettes) else 0
+        handles[key] = SpriteHandle(offset, length, width, height, palette_base + palette * PALETTE_BYTES,
+                                    sprite.offset[0], sprite.offset[1])
+    error = f"{len(skipped)} sprites not stored: {', '.join(skipped)}" if skipped else None
+    return sff_path, handles, error
+
+
+class SharedSpriteStore:
+    """Owns the arena and palette bank segments plus the handles of every decoded sprite
+
+    Views returned by pixels()/palette()/indices() point into shared memory; release them
+    before close().
+    """
+
+    def __init__(self, capacity, palette_capacity, create=True, names=None):
+        if create:
+            self.arena = shared_memory.SharedMemory(create=True, size=max(1, capacity))
+            self.palettes = shared_memory.SharedMemory(create=True, size=max(1, palette_capacity))
+        else:
+            self.arena = shared_memory.SharedMemory(name=names[0])
+            self.palettes = shared_memory.SharedMemory(name=names[1])
+        self.owner = create
+        self.handles = {}  # (sff path, group, number) -> SpriteHandle
+        self.errors = {}  # sff path -> reason the file, or some of its sprites, were not stored
+        self._arena_next = Value('q', 0)
+        self._palette_next = Value('q', 0)
+
+    @classmethod
+    def for_files(cls, sff_paths, capacity=None):
+        """A store sized for `sff_paths`; capacity defaults to exactly what their sprite tables need"""
+        if capacity is None:
+            capacity = sum(arena_bytes(path) for path in sff_paths)
+        return cls(capacity, sum(palette_slots(path) for path in sff_paths) * PALETTE_BYTES)
+
+    @classmethod
+    def attach(cls, names):
+        """Read-only view of another process's store; handles are passed separately"""
+        return cls(0, 0, create=False, names=names)
+
+    @property
+    def names(self):
+        return self.arena.name, self.palettes.name
+
+    @property
+    def used(self):
+        return self._arena_next.value, self._palette_next.value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.handles)
+
+    def close(self):
+        """Detach; the creating store also unlinks the segments"""
+        for segment in (self.arena, self.palettes):
+            segment.close()
+            if self.owner:
+                segment.unlink()
+        self.owner = False
+
+    def decode(self, sff_paths, max_workers=None):
+        """Decode every sprite of `sff_paths` into the store; returns the number of new handles"""
+        initargs = (self.arena.name, self.palettes.name, self._arena_next, self._palette_next)
+        before = len(self.handles)
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(sff_paths)))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker, initargs=initargs) as pool:
+                results = list(pool.map(_decode_into_store, sff_paths))
+        else:
+            _attach_worker(*initargs)
+            try:
+                results = [_decode_into_store(path) for path in sff_paths]
+            finally:
+                for name in ('arena', 'palettes'):
+                    _worker.pop(name).close()
+        for path, handles, error in results:
+            if error:
+                self.errors[path] = error
+                print(f"⚠️ {path}: {error}")
+            for (group, number), handle in handles.items():
+                self.handles[(path, group, number)] = handle
+        return len(self.handles) - before
+
+    def handle(self, sff_path, group, number):
+        return self.handles.get((sff_path, group, number))
+
+    def pixels(self, handle):
+        """Zero-copy memoryview of a sprite's palette indices"""
+        return self.arena.buf[handle.offset:handle.offset + handle.length]
+
+    def palette(self, handle):
+        """Zero-copy memoryview of a sprite's 256 RGBA palette entries"""
+        return self.palettes.buf[handle.palette:handle.palette + PALETTE_BYTES]
+
+    def indices(self, handle):
+        """(height, width) uint8 NumPy view of a sprite's palette indices"""
+        import numpy as np
+
+        view = np.frombuffer(self.arena.buf, dtype=np.uint8, count=handle.length, offset=handle.offset)
+        return view.reshape(handle.height, handle.width) if handle.length == handle.width * handle.height else view
+
+    def rgba(self, handle):
+        """Colorized RGBA bytes of a sprite"""
+        from PIL import Image
+
+        img = Image.frombytes('P', (handle.width, handle.height), bytes(self.pixels(handle)).ljust(
+            handle.width * handle.height, b'\0'))
+        img.putpalette(bytes(self.palette(handle)), rawmode='RGBA')
+        return img.convert('RGBA').tobytes()
+
+    def image(self, handle):
+        """Colorized PIL image of a sprite"""
+        from PIL import Image
+
+        return Image.frombytes('RGBA', (handle.width, handle.height), self.rgba(handle))
+
+
+def _pickled_worker(sff_path):
+    """Baseline worker: decode one SFF and pickle every sprite's pixels and the palettes back"""
+    from mugen_prototype import SFFParser
+
+    parser = SFFParser(verbose=False, pixel_cache_size=0)
+    if not parser.parse_file(sff_path):
+        return sff_path, {}, []
+    decoded = {key: parser.extract_sprite_pixels(sff_path, *key) for key in parser.sprites}
+    return sff_path, {key: value for key, value in decoded.items() if value is not None}, \
+        parser.palette_list.palettes
+
+
+def compare(sff_paths, max_workers=None):
+    """Time the shared-memory store against pickling decoded pixels back to the parent"""
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(sff_paths)))
+    start = time.perf_counter()
+    with SharedSpriteStore.for_files(sff_paths) as store:
+        store.decode(sff_paths, workers)
+        shm_seconds = time.perf_counter() - start
+        handle_bytes = len(pickle.dumps(store.handles))
+        shm_count = len(store)
+        arena_used, bank_used = store.used
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_pickled_worker, sff_paths))
+    pickled_seconds = time.perf_counter() - start
+    pickled_bytes = sum(len(pickle.dumps(result)) for result in results)
+    pickled_count = sum(len(result[1]) for result in results)
+
+    print(f"⏱️ shared memory: {shm_count:,} sprites in {shm_seconds:.2f}s, {handle_bytes:,} bytes of handles "
+          f"(arena {arena_used:,} bytes, palettes {bank_used:,} bytes)")
+    print(f"⏱️ pickled:       {pickled_count:,} sprites in {pickled_seconds:.2f}s, {pickled_bytes:,} bytes pickled")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from mugen_index import find_sff_files
+
+    arg_parser = argparse.ArgumentParser(description="Decode a roster's sprites into shared memory")
+    arg_parser.add_argument('roots', nargs='+', help="Directories or SFF files")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument('--capacity', type=int, default=None, help="Arena size in MB (default: exact, from the sprite tables)")
+    arg_parser.add_argument('--compare', action='store_true', help="Also time the pickling baseline")
+    args = arg_parser.parse_args()
+
+    paths = find_sff_files(args.roots)
+    if not paths:
+        print("❌ No SFF files found")
+        raise SystemExit(1)
+    if args.compare:
+        compare(paths, args.workers)
+        raise SystemExit(0)
+
+    start = time.perf_counter()
+    capacity = args.capacity << 20 if args.capacity else None
+    with SharedSpriteStore.for_files(paths, capacity) as store:
+        count = store.decode(paths, args.workers)
+        arena_used, bank_used = store.used
+        print(f"✅ Decoded {count:,} sprites from {len(paths)} files into "
+              f"{arena_used:,} arena bytes and {bank_used:,} palette bytes in {time.perf_counter() - start:.2f}s")
+    if store.errors:
+        print(f"⚠️ {len(store.errors)}/{len(paths)} files were not fully stored")
+        raise SystemExit(1)
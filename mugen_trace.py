@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Chrome trace-event recording for the MUGEN asset pipelines
+Spans are written as trace-event JSON (one track per process/thread) that can be
+opened in chrome://tracing or https://ui.perfetto.dev
+Run: python mugen_trace.py trace.json chars/*/*.sff [--workers N] [--decode]
+     python mugen_trace.py --merge merged.json worker1.json worker2.json
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _now_us():
+    """Monotonic timestamp in microseconds, shared by all processes on the host"""
+    return time.perf_counter_ns() / 1000.0
+
+
+class Tracer:
+    """Collects complete ("X") trace events for the current process"""
+    def __init__(self, process_name=None):
+        self.pid = os.getpid()
+        self.events = []
+        self._lock = threading.Lock()
+        self._named_threads = set()
+        self.process_name = process_name or f"pid {self.pid}"
+        self.events.append({
+            'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+            'args': {'name': self.process_name},
+        })
+
+    def _thread_id(self):
+        """Return the current thread id, emitting a thread_name event the first time"""
+        tid = threading.get_ident()
+        if tid not in self._named_threads:
+            with self._lock:
+                if tid not in self._named_threads:
+                    self._named_threads.add(tid)
+                    self.events.append({
+                        'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                        'args': {'name': threading.current_thread().name},
+                    })
+        return tid
+
+    @contextmanager
+    def span(self, name, cat='sff', **args):
+        """Record the enclosed block as a complete event named `name`"""
+        tid = self._thread_id()
+        start = _now_us()
+        try:
+            yield
+        finally:
+            event = {
+                'name': name, 'cat': cat, 'ph': 'X', 'pid': self.pid, 'tid': tid,
+                'ts': start, 'dur': _now_us() - start,
+            }
+            if args:
+                event['args'] = args
+            with self._lock:
+                self.events.append(event)
+
+    def instant(self, name, cat='sff', **args):
+        """Record a zero-length marker event"""
+        event = {'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'pid': self.pid,
+                 'tid': self._thread_id(), 'ts': _now_us()}
+        if args:
+            event['args'] = args
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, path):
+        """Write the collected events as a Chrome trace-event JSON file"""
+        write_trace(path, self.events)
+
+
+def write_trace(path, events):
+    """Write a list of trace events to `path`"""
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def merge_traces(paths, out_path):
+    """Concatenate the events of several trace files into one file"""
+    events = []
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        events.extend(data['traceEvents'] if isinstance(data, dict) else data)
+    write_trace(out_path, events)
+    return len(events)
+
+
+def _trace_sff_worker(filepath, decode):
+    """Parse (and optionally decode) one SFF under a fresh tracer, returning its events"""
+    from mugen_prototype import SFFParser
+
+    tracer = Tracer(process_name=f"worker {os.getpid()}")
+    parser = SFFParser(verbose=False, tracer=tracer)
+    with tracer.span('character', cat='batch', path=filepath):
+        if parser.parse_file(filepath) and decode:
+            for group, number in sorted(parser.sprites):
+                parser.extract_sprite_image(filepath, group, number)
+    return tracer.events
+
+
+def trace_sff_batch(paths, out_path, max_workers=None, decode=False):
+    """Parse SFF files across a process pool and write one merged trace"""
+    from concurrent.futures import ProcessPoolExecutor
+
+    tracer = Tracer(process_name='main')
+    events = []
+    with tracer.span('batch', cat='batch', files=len(paths)):
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for worker_events in pool.map(_trace_sff_worker, paths, [decode] * len(paths)):
+                events.extend(worker_events)
+    # Each worker reports its metadata events once per file; keep only the first
+    seen = set()
+    merged = []
+    for event in tracer.events + events:
+        if event['ph'] == 'M':
+            key = (event['name'], event['pid'], event['tid'])
+            if key in seen:
+                continue
+            seen.add(key)
+        merged.append(event)
+    write_trace(out_path, merged)
+    return len(merged)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Record Chrome trace-event JSON for SFF parsing")
+    arg_parser.add_argument('output', help="Trace file to write")
+    arg_parser.add_argument('inputs', nargs='+', help="SFF files (or trace files with --merge)")
+    arg_parser.add_argument('--merge', action='store_true', help="Merge existing trace files instead of tracing")
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument('--decode', action='store_true', help="Also decode every sprite")
+    args = arg_parser.parse_args()
+
+    if args.merge:
+        count = merge_traces(args.inputs, args.output)
+    else:
+        count = trace_sff_batch(args.inputs, args.output, args.workers, args.decode)
+    print(f"✅ Wrote {count} trace events to {args.output}")
@@ -0,0 +1,717 @@
+#!/usr/bin/env python3
+"""
+CNS trigger expression compiler for headless state-machine evaluation
+Each trigger expression is parsed once into a tuple AST, constant folded, its && / || operands
+reordered cheapest first, and compiled into nested Python closures taking a FighterState.
+Run: python mugen_trigger.py [file.cns ...]   (compiles every controller and benchmarks evaluation)
+"""
+
+import math
+import random
+import re
+import time
+from operator import attrgetter
+
+# MUGEN bottom (e.g. division by zero, missing redirect target) evaluates as 0 here
+BOTTOM = 0
+
+# Triggers compared against bare letters/words rather than numbers
+STRING_TRIGGERS = {'statetype', 'movetype', 'physics', 'p2statetype', 'p2movetype',
+                   'name', 'p1name', 'p2name', 'p3name', 'p4name', 'authorname', 'stagevar'}
+# "pos x" style triggers become a single pos_x name
+AXIS_TRIGGERS = {'pos', 'vel', 'p2dist', 'p2bodydist', 'screenpos', 'parentdist', 'rootdist',
+                 'p1dist', 'p1bodydist', 'backedgedist', 'frontedgedist'}
+REDIRECTS = {'parent', 'root', 'helper', 'target', 'partner', 'enemy', 'enemynear', 'playerid', 'p2'}
+# Function arguments that are raw keys rather than expressions, e.g. const(size.xscale)
+KEY_FUNCTIONS = {'const', 'gethitvar', 'stagevar'}
+
+MATH_FUNCTIONS = {
+    'abs': abs,
+    'floor': lambda x: int(math.floor(x)),
+    'ceil': lambda x: int(math.ceil(x)),
+    'exp': math.exp,
+    'ln': lambda x: math.log(x) if x > 0 else BOTTOM,
+    'log': lambda b, x: math.log(x, b) if b > 0 and b != 1 and x > 0 else BOTTOM,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'asin': lambda x: math.asin(x) if -1 <= x <= 1 else BOTTOM,
+    'acos': lambda x: math.acos(x) if -1 <= x <= 1 else BOTTOM,
+    'atan': math.atan,
+    'min': min,
+    'max': max,
+}
+
+_TOKEN_RE = re.compile(r'\s*(?:(\d+\.\d*|\.\d+|\d+)|("[^"]*")|([A-Za-z_][A-Za-z0-9_.]*)|'
+                       r'(\*\*|&&|\|\||\^\^|!=|<=|>=|[-+*/%()\[\],=<>!~&|^]))')
+
+# Binary operator precedence, loosest first
+_PRECEDENCE = {
+    '||': 1, '^^': 2, '&&': 3, '|': 4, '^': 5, '&': 6,
+    '=': 7, '!=': 7, '<': 8, '<=': 8, '>': 8, '>=': 8,
+    '+': 9, '-': 9, '*': 10, '/': 10, '%': 10, '**': 11,
+}
+_COMPARISONS = ('=', '!=', '<', '<=', '>', '>=')
+
+
+class TriggerSyntaxError(ValueError):
+    pass
+
+
+def _item(values, index):
+    index = int(index)
+    return values[index] if 0 <= index < len(values) else BOTTOM
+
+
+class FighterState:
+    """Trigger-visible state of one player
+
+    Unknown trigger names evaluate to 0, so only the fields a simulation cares about need
+    to be filled in. Multi-word triggers use underscores (pos_x, p2bodydist_x).
+    """
+    time = 0
+    ctrl = 1
+    alive = 1
+    life = 1000
+    lifemax = 1000
+    power = 0
+    powermax = 3000
+    anim = 0
+    animtime = 0
+    animelem = 1
+    stateno = 0
+    prevstateno = 0
+    statetype = 'S'
+    movetype = 'I'
+    physics = 'S'
+    roundstate = 2
+    roundno = 1
+    matchno = 1
+    gametime = 0
+    hitcount = 0
+    movecontact = 0
+    movehit = 0
+    moveguarded = 0
+    movereversed = 0
+    hitshakeover = 1
+    hitover = 1
+    hitfall = 0
+    canrecover = 1
+    facing = 1
+    numenemy = 1
+    ishelper = 0
+    teamside = 1
+    pos_x = pos_y = 0
+    vel_x = vel_y = 0
+    p2dist_x = p2dist_y = 0
+    p2bodydist_x = p2bodydist_y = 0
+    p2statetype = 'S'
+    p2movetype = 'I'
+    p2life = 1000
+    p2stateno = 0
+
+    def __init__(self, **fields):
+        self.commands = set()  # Names of commands currently active
+        self.vars = [0] * 60
+        self.fvars = [0.0] * 40
+        self.sysvars = [0] * 5
+        self.sysfvars = [0.0] * 5
+        self.consts = {}  # 'size.xscale' -> value
+        self.hitdefattr_state = ''  # e.g. 'S'
+        self.hitdefattr_attrs = set()  # e.g. {'NA'}
+        self.anim_starts = [0]  # AnimationClock.starts of the current action
+        self.animtick = 0  # Ticks since the current action started
+        self.targets = {}  # Redirect name -> FighterState (p2, enemy, parent, root...)
+        self.rng = random.Random()
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    @property
+    def random(self):
+        return self.rng.randrange(1000)
+
+    def var(self, index):
+        return _item(self.vars, index)
+
+    def fvar(self, index):
+        return _item(self.fvars, index)
+
+    def sysvar(self, index):
+        return _item(self.sysvars, index)
+
+    def sysfvar(self, index):
+        return _item(self.sysfvars, index)
+
+    def const(self, key):
+        return self.consts.get(key, 0)
+
+    def animelemtime(self, element):
+        """Ticks since animation element `element` (1-based) started; negative before it"""
+        element = int(element)
+        if not 1 <= element <= len(self.anim_starts):
+            return BOTTOM
+        return self.animtick - self.anim_starts[element - 1]
+
+    def redirect(self, target, argument=None):
+        return self.targets.get(target if argument is None else (target, argument))
+
+
+# --------------------------------------------------------------------------- parsing
+
+def _lex(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None or match.end() == position:
+            raise TriggerSyntaxError(f"unexpected character {text[position:].strip()[:1]!r} in {text!r}")
+        number, string, name, op = match.groups()
+        if number is not None:
+            tokens.append(('num', float(number) if '.' in number else int(number)))
+        elif string is not None:
+            tokens.append(('str', string[1:-1]))
+        elif name is not None:
+            tokens.append(('name', name.lower()))
+        else:
+            tokens.append(('op', op))
+        position = match.end()
+    tokens.append(('end', None))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _lex(text)
+        self.index = 0
+
+    def peek(self, offset=0):
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def take(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def accept(self, op):
+        if self.peek() == ('op', op):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, op):
+        if not self.accept(op):
+            raise TriggerSyntaxError(f"expected {op!r} in {self.text!r}")
+
+    def parse(self):
+        node = self.expression(0)
+        if self.peek()[0] != 'end':
+            raise TriggerSyntaxError(f"unexpected {self.peek()[1]!r} in {self.text!r}")
+        return node
+
+    def expression(self, min_precedence):
+        left = self.unary()
+        while True:
+            kind, op = self.peek()
+            precedence = _PRECEDENCE.get(op) if kind == 'op' else None
+            if precedence is None or precedence <= min_precedence - (op == '**'):
+                return left
+            self.take()
+            if op in ('=', '!='):
+                left = self.equality(left, op)
+            else:
+                left = _binary(op, left, self.expression(precedence))
+
+    def equality(self, left, op):
+        name = _trigger_name(left)
+        if name == 'command':
+            kind, value = self.take()
+            if kind != 'str':
+                raise TriggerSyntaxError(f"command needs a quoted name in {self.text!r}")
+            return ('command', op, value)
+        if name == 'hitdefattr':
+            return self.hitdefattr(op)
+        if name in STRING_TRIGGERS and self.peek()[0] == 'name':
+            return ('binary', op, left, ('const', self.take()[1].upper()))
+        if self.peek() in (('op', '['), ('op', '(')):
+            interval = self.interval(op, left)
+            if interval is not None:
+                return interval
+        right = self.expression(_PRECEDENCE['='])
+        if name in ('animelem', 'timemod') and op == '=' and self.peek() == ('op', ','):
+            self.take()
+            return self.elem_comparison(name, right)
+        if name == 'animelem':
+            return ('animelem', right, op, ('const', 0))
+        return ('binary', op, left, right)
+
+    def interval(self, op, left):
+        """x = [a, b] / (a, b) / [a, b) / (a, b]; returns None for a parenthesized expression"""
+        start = self.index
+        low_inclusive = self.take()[1] == '['
+        low = self.expression(0)
+        if not self.accept(','):
+            if not low_inclusive:
+                self.index = start  # Plain parenthesized expression, parse normally
+                return None
+            raise TriggerSyntaxError(f"expected ',' in interval in {self.text!r}")
+        high = self.expression(0)
+        kind, close = self.take()
+        if kind != 'op' or close not in (']', ')'):
+            raise TriggerSyntaxError(f"unterminated interval in {self.text!r}")
+        return ('interval', op == '!=', left, low, high, low_inclusive, close == ']')
+
+    def elem_comparison(self, name, first):
+        """animelem = N, >= M  and the old  timemod = M, R"""
+        op = '='
+        if self.peek()[0] == 'op' and self.peek()[1] in _COMPARISONS:
+            op = self.take()[1]
+        second = self.expression(_PRECEDENCE['='])
+        if name == 'timemod':
+            return ('binary', op, _binary('%', ('name', 'time'), first), second)
+        return ('animelem', first, op, second)
+
+    def hitdefattr(self, op):
+        kind, states = self.take()
+        if kind != 'name':
+            raise TriggerSyntaxError(f"hitdefattr needs state letters in {self.text!r}")
+        attrs = []
+        while self.peek() == ('op', ',') and self.peek(1)[0] == 'name':
+            self.take()
+            attrs.append(self.take()[1].upper())
+        return ('hitdefattr', op, states.upper(), tuple(attrs))
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == 'op' and value in ('!', '-', '~', '+'):
+            self.take()
+            operand = self.unary()
+            return operand if value == '+' else ('unary', value, operand)
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind in ('num', 'str'):
+            return ('const', value)
+        if kind == 'op' and value == '(':
+            node = self.expression(0)
+            self.expect(')')
+            return node
+        if kind == 'end':
+            raise TriggerSyntaxError(f"unexpected end of expression in {self.text!r}")
+        if kind != 'name':
+            raise TriggerSyntaxError(f"unexpected {value!r} in {self.text!r}")
+
+        if value in REDIRECTS:
+            redirect = self.redirect(value)
+            if redirect is not None:
+                return redirect
+        if value in AXIS_TRIGGERS and self.peek() in (('name', 'x'), ('name', 'y')):
+            return ('name', f"{value}_{self.take()[1]}")
+        if self.peek() == ('op', '('):
+            return self.call(value)
+        return ('name', value)
+
+    def redirect(self, target):
+        start = self.index
+        argument = None
+        if self.accept('('):
+            argument = self.expression(0)
+            self.expect(')')
+        if not self.accept(','):
+            self.index = start
+            return None
+        return ('redirect', target, argument, self.unary())
+
+    def call(self, name):
+        self.expect('(')
+        if name in KEY_FUNCTIONS:
+            kind, key = self.take()
+            self.expect(')')
+            return ('call', name, (('const', str(key)),))
+        args = [self.expression(0)]
+        while self.accept(','):
+            args.append(self.expression(0))
+        self.expect(')')
+        if name in ('ifelse', 'cond'):
+            if len(args) != 3:
+                raise TriggerSyntaxError(f"{name} takes 3 arguments in {self.text!r}")
+            return ('ifelse', args[0], args[1], args[2])
+        return ('call', name, tuple(args))
+
+
+def _binary(op, left, right):
+    if op in ('&&', '||'):
+        kind = 'and' if op == '&&' else 'or'
+        items = []
+        for node in (left, right):
+            items.extend(node[1] if node[0] == kind else [node])
+        return (kind, items)
+    return ('binary', op, left, right)
+
+
+def _trigger_name(node):
+    while node[0] == 'redirect':
+        node = node[3]
+    return node[1] if node[0] == 'name' else None
+
+
+def parse_trigger(text):
+    """Parse one trigger expression into a tuple AST"""
+    return _Parser(text).parse()
+
+
+# --------------------------------------------------------------------------- folding
+
+_PURE = ('binary', 'unary', 'interval', 'ifelse')
+
+
+def _cost(node):
+    """Rough evaluation cost used to order && / || operands cheapest first"""
+    kind = node[0]
+    if kind == 'const':
+        return 0
+    if kind in ('name', 'command'):
+        return 1
+    if kind in ('and', 'or'):
+        return sum(_cost(item) for item in node[1])
+    if kind == 'binary':
+        return 1 + _cost(node[2]) + _cost(node[3])
+    if kind == 'unary':
+        return 1 + _cost(node[2])
+    if kind == 'interval':
+        return 2 + _cost(node[2]) + _cost(node[3]) + _cost(node[4])
+    if kind == 'redirect':
+        return 5 + _cost(node[3])
+    if kind == 'ifelse':
+        return 2 + _cost(node[1]) + max(_cost(node[2]), _cost(node[3]))
+    if kind == 'call':
+        return 3 + sum(_cost(arg) for arg in node[2])
+    return 4
+
+
+def fold(node):
+    """Constant fold and reorder a tuple AST"""
+    kind = node[0]
+    if kind in ('and', 'or'):
+        items = []
+        for item in map(fold, node[1]):
+            if item[0] == kind:
+                items.extend(item[1])
+            elif item[0] == 'const':
+                # true in an 'and' / false in an 'or' is neutral; the opposite decides it
+                if bool(item[1]) == (kind == 'and'):
+                    continue
+                return ('const', int(kind == 'or'))
+            else:
+                items.append(item)
+        if not items:
+            return ('const', int(kind == 'and'))
+        if len(items) == 1:
+            return ('binary', '!=', items[0], ('const', 0)) if items[0][0] not in _BOOLEAN else items[0]
+        items.sort(key=_cost)
+        return (kind, items)
+    if kind == 'binary':
+        node = ('binary', node[1], fold(node[2]), fold(node[3]))
+        constant = node[2][0] == 'const' and node[3][0] == 'const'
+    elif kind == 'unary':
+        node = ('unary', node[1], fold(node[2]))
+        constant = node[2][0] == 'const'
+    elif kind == 'interval':
+        node = ('interval', node[1], fold(node[2]), fold(node[3]), fold(node[4]), node[5], node[6])
+        constant = all(part[0] == 'const' for part in node[2:5])
+    elif kind == 'ifelse':
+        condition = fold(node[1])
+        if condition[0] == 'const':
+            return fold(node[2] if condition[1] else node[3])
+        return ('ifelse', condition, fold(node[2]), fold(node[3]))
+    elif kind == 'call':
+        node = ('call', node[1], tuple(map(fold, node[2])))
+        constant = node[1] in MATH_FUNCTIONS and all(arg[0] == 'const' for arg in node[2])
+    elif kind == 'redirect':
+        return ('redirect', node[1], fold(node[2]) if node[2] is not None else None, fold(node[3]))
+    elif kind == 'animelem':
+        return ('animelem', fold(node[1]), node[2], fold(node[3]))
+    else:
+        return node
+    if constant:
+        return ('const', compile_node(node)(None))
+    return node
+
+
+_BOOLEAN = ('and', 'or', 'command', 'interval', 'animelem', 'hitdefattr')
+
+
+# --------------------------------------------------------------------------- compiling
+
+def _div(a, b):
+    if b == 0:
+        return BOTTOM
+    if isinstance(a, int) and isinstance(b, int):
+        return int(a / b)
+    return a / b
+
+
+def _mod(a, b):
+    a, b = int(a), int(b)
+    if b == 0:
+        return BOTTOM
+    return int(math.fmod(a, b))
+
+
+def _pow(a, b):
+    try:
+        result = a ** b
+    except (OverflowError, ZeroDivisionError):
+        return BOTTOM
+    return BOTTOM if isinstance(result, complex) else result
+
+
+_OPERATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': _div,
+    '%': _mod,
+    '**': _pow,
+    '&': lambda a, b: int(a) & int(b),
+    '|': lambda a, b: int(a) | int(b),
+    '^': lambda a, b: int(a) ^ int(b),
+    '^^': lambda a, b: bool(a) != bool(b),
+}
+
+
+def _getter(name):
+    if hasattr(FighterState, name):
+        return attrgetter(name)
+    return lambda s: getattr(s, name, BOTTOM)
+
+
+def _compile_binary(op, left, right):
+    function = _OPERATORS[op]
+    if op in _COMPARISONS and right[0] == 'const':
+        # Specialised paths for the very common "trigger op constant" shape
+        constant = right[1]
+        if left[0] == 'name':
+            get = _getter(left[1])
+            if op == '=':
+                return lambda s: get(s) == constant
+            if op == '!=':
+                return lambda s: get(s) != constant
+            return lambda s: function(get(s), constant)
+        f = compile_node(left)
+        if op == '=':
+            return lambda s: f(s) == constant
+        return lambda s: function(f(s), constant)
+    f, g = compile_node(left), compile_node(right)
+    return lambda s: function(f(s), g(s))
+
+
+def _compile_and(items):
+    fs = [compile_node(item) for item in items]
+    if len(fs) == 2:
+        a, b = fs
+        return lambda s: bool(a(s) and b(s))
+    if len(fs) == 3:
+        a, b, c = fs
+        return lambda s: bool(a(s) and b(s) and c(s))
+
+    def evaluate(s):
+        for f in fs:
+            if not f(s):
+                return False
+        return True
+    return evaluate
+
+
+def _compile_or(items):
+    fs = [compile_node(item) for item in items]
+    if len(fs) == 2:
+        a, b = fs
+        return lambda s: bool(a(s) or b(s))
+
+    def evaluate(s):
+        for f in fs:
+            if f(s):
+                return True
+        return False
+    return evaluate
+
+
+def _bottom(*args):
+    return BOTTOM
+
+
+def _compile_call(name, args):
+    fs = [compile_node(arg) for arg in args]
+    if name in MATH_FUNCTIONS:
+        function = MATH_FUNCTIONS[name]
+        if len(fs) == 1:
+            f = fs[0]
+            return lambda s: function(f(s))
+        return lambda s: function(*[f(s) for f in fs])
+    if not hasattr(FighterState, name):
+        return lambda s: getattr(s, name, _bottom)(*[f(s) for f in fs])
+    method = attrgetter(name)
+    if len(fs) == 1:
+        if args[0][0] == 'const':
+            argument = args[0][1]
+            return lambda s: method(s)(argument)
+        f = fs[0]
+        return lambda s: method(s)(f(s))
+    return lambda s: method(s)(*[f(s) for f in fs])
+
+
+def compile_node(node):
+    """Compile a (folded) tuple AST into a closure f(state)"""
+    kind = node[0]
+    if kind == 'const':
+        value = node[1]
+        return lambda s: value
+    if kind == 'name':
+        return _getter(node[1])
+    if kind == 'binary':
+        return _compile_binary(node[1], node[2], node[3])
+    if kind == 'unary':
+        f = compile_node(node[2])
+        if node[1] == '!':
+            return lambda s: not f(s)
+        if node[1] == '-':
+            return lambda s: -f(s)
+        return lambda s: ~int(f(s))
+    if kind == 'and':
+        return _compile_and(node[1])
+    if kind == 'or':
+        return _compile_or(node[1])
+    if kind == 'command':
+        name, negate = node[2], node[1] == '!='
+        if negate:
+            return lambda s: name not in s.commands
+        return lambda s: name in s.commands
+    if kind == 'interval':
+        negate, f, low, high, low_inclusive, high_inclusive = node[1:]
+        f, low, high = compile_node(f), compile_node(low), compile_node(high)
+        above = _OPERATORS['>=' if low_inclusive else '>']
+        below = _OPERATORS['<=' if high_inclusive else '<']
+
+        def interval(s):
+            value = f(s)
+            return (above(value, low(s)) and below(value, high(s))) != negate
+        return interval
+    if kind == 'animelem':
+        element, op, offset = compile_node(node[1]), _OPERATORS[node[2]], compile_node(node[3])
+        return lambda s: op(s.animelemtime(element(s)), offset(s))
+    if kind == 'hitdefattr':
+        negate, states, attrs = node[1] == '!=', node[2], set(node[3])
+
+        def hitdefattr(s):
+            matched = bool(s.hitdefattr_state) and s.hitdefattr_state in states \
+                and not attrs.isdisjoint(s.hitdefattr_attrs)
+            return matched != negate
+        return hitdefattr
+    if kind == 'ifelse':
+        condition, then, otherwise = compile_node(node[1]), compile_node(node[2]), compile_node(node[3])
+        return lambda s: then(s) if condition(s) else otherwise(s)
+    if kind == 'call':
+        return _compile_call(node[1], node[2])
+    if kind == 'redirect':
+        target, argument, inner = node[1], node[2], compile_node(node[3])
+        if argument is None:
+            def redirect(s):
+                other = s.redirect(target)
+                return inner(other) if other is not None else BOTTOM
+        else:
+            argument = compile_node(argument)
+
+            def redirect(s):
+                other = s.redirect(target, argument(s))
+                return inner(other) if other is not None else BOTTOM
+        return redirect
+    raise TriggerSyntaxError(f"cannot compile {kind!r}")
+
+
+def compile_trigger(text):
+    """Compile one trigger expression into f(state) -> value"""
+    return compile_node(fold(parse_trigger(text)))
+
+
+def compile_conditions(triggerall, groups):
+    """Compile a controller's trigger lines: every triggerall and all lines of any one group"""
+    group_nodes = [('and', [parse_trigger(text) for text in group]) for group in groups]
+    if not group_nodes:
+        return lambda s: False
+    node = ('and', [parse_trigger(text) for text in triggerall] + [('or', group_nodes)])
+    f = compile_node(fold(node))
+    return lambda s: bool(f(s))
+
+
+SAMPLE_TRIGGERS = [
+    'time = 0',
+    'animelem = 3',
+    'animelem = 2, >= 1',
+    'command = "QCF_x" && statetype != A && ctrl',
+    'p2bodydist x = [0, 40] && p2statetype != L',
+    'var(10) > 2 || life < 300 && power >= 1000',
+    'ifelse(facing = 1, vel x > 0, vel x < 0)',
+    'hitdefattr = SC, NA, SA',
+    '(time % 4) = 0 && random < 500',
+    'p2, life < 200',
+    'abs(pos y) < 2 * 5 + 1',
+]
+
+
+def benchmark(triggers, evaluations=200000, state=None):
+    """Compile `triggers`, evaluate them round-robin, and return (compile seconds, evaluations/s)"""
+    start = time.perf_counter()
+    compiled = [compile_trigger(text) for text in triggers]
+    compile_seconds = time.perf_counter() - start
+
+    state = state or FighterState(time=4, ctrl=1, life=250, power=1200, vel_x=1, p2bodydist_x=20,
+                                  anim_starts=[0, 3, 6, 10], animtick=6)
+    state.commands.add('QCF_x')
+    state.targets['p2'] = FighterState(life=150)
+    rounds = max(1, evaluations // max(1, len(compiled)))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for f in compiled:
+            f(state)
+    elapsed = time.perf_counter() - start
+    return compile_seconds, rounds * len(compiled) / elapsed if elapsed > 0 else float('inf')
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        from mugen_cns import CNSParser
+
+        triggers = []
+        failures = 0
+        for path in sys.argv[1:]:
+            parser = CNSParser()
+            if not parser.parse_file(path):
+                continue
+            for state in parser.states.values():
+                for controller in state.controllers:
+                    for _, text, lineno in controller.triggers:
+                        try:
+                            parse_trigger(text)
+                            triggers.append(text)
+                        except TriggerSyntaxError as e:
+                            failures += 1
+                            print(f"⚠️ {path}:{lineno}: {e}")
+        print(f"📋 {len(triggers)} triggers compiled, {failures} rejected")
+    else:
+        triggers = SAMPLE_TRIGGERS
+
+    if triggers:
+        compile_seconds, rate = benchmark(triggers)
+        print(f"✅ Compiled {len(triggers)} triggers in {compile_seconds * 1000:.1f} ms; "
+              f"{rate:,.0f} trigger evaluations/s")
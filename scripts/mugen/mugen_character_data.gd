@@ -12,6 +12,7 @@ signal loading_error(error: String)
 var character_name: String = ""
 var character_path: String = ""
 var def_file_path: String = ""
+var manifest_files: Dictionary = {}  # FILES key -> path, when loaded from a roster manifest
 
 # Parser instances
 var def_parser
@@ -49,11 +50,49 @@ func load_character_async(def_path: String) -> bool:
 	def_file_path = def_path
 	character_path = def_path.get_base_dir()
 	character_name = def_path.get_file().get_basename()
+	manifest_files.clear()
 	
 	# Start loading process
 	_load_next_step()
 	return true
 
+func load_from_manifest_async(entry: Dictionary, root_path: String = "") -> bool:
+	"""Load a character from a roster manifest entry (mugen_roster.py) without parsing its DEF"""
+	if is_loading:
+		emit_signal("loading_error", "Character is already loading")
+		return false
+	
+	var def_entry = entry.get("def")
+	if typeof(def_entry) != TYPE_DICTIONARY:
+		emit_signal("loading_error", "Manifest entry has no DEF: " + str(entry.get("name", "")))
+		return false
+	
+	is_loading = true
+	is_loaded = false
+	current_step = loading_steps.find("DEF") + 1  # Manifest fields stand in for the DEF
+	def_file_path = _manifest_path(def_entry.path, root_path)
+	character_path = def_file_path.get_base_dir()
+	character_name = def_file_path.get_file().get_basename()
+	character_info = {
+		"name": entry.get("name", character_name),
+		"displayname": entry.get("display_name", character_name),
+		"author": entry.get("author", "Unknown"),
+		"localcoord": entry.get("localcoord", []),
+	}
+	manifest_files.clear()
+	var files = entry.get("files", {})
+	for key in ["sprite", "anim", "cmd", "cns"]:
+		var file_entry = files.get(key)
+		if typeof(file_entry) == TYPE_DICTIONARY:
+			manifest_files[key] = _manifest_path(file_entry.path, root_path)
+	
+	_load_next_step()
+	return true
+
+func _manifest_path(path: String, root_path: String) -> String:
+	"""Manifest paths are relative to the project root"""
+	return path if root_path.is_empty() else root_path.path_join(path)
+
 func _load_next_step():
 	"""Load the next step in the character loading process"""
 	if current_step >= loading_steps.size():
@@ -91,8 +130,8 @@ func _load_def_file():
 
 func _load_sff_file():
 	"""Load sprite file"""
-	var sff_path = ""
-	if def_parser:
+	var sff_path = manifest_files.get("sprite", "")
+	if sff_path == "" and def_parser:
 		sff_path = _resolve_file_path(def_parser.get_sprite_file())
 	
 	if sff_path != "":
@@ -112,8 +151,8 @@ func _load_sff_file():
 
 func _load_air_file():
 	"""Load animation file"""
-	var air_path = ""
-	if def_parser:
+	var air_path = manifest_files.get("anim", "")
+	if air_path == "" and def_parser:
 		air_path = _resolve_file_path(def_parser.get_animation_file())
 	
 	if air_path != "":
@@ -128,8 +167,8 @@ func _load_air_file():
 
 func _load_cmd_file():
 	"""Load command file"""
-	var cmd_path = ""
-	if def_parser:
+	var cmd_path = manifest_files.get("cmd", "")
+	if cmd_path == "" and def_parser:
 		cmd_path = _resolve_file_path(def_parser.get_command_file())
 	
 	if cmd_path != "":
@@ -144,8 +183,8 @@ func _load_cmd_file():
 
 func _load_cns_file():
 	"""Load constants/state file"""
-	var cns_path = ""
-	if def_parser:
+	var cns_path = manifest_files.get("cns", "")
+	if cns_path == "" and def_parser:
 		cns_path = _resolve_file_path(def_parser.get_constants_file())
 	
 	if cns_path != "":
@@ -31,7 +31,14 @@ func load_character(def_path: String):
 		print("Character loaded from cache: ", character_name)
 		return loaded_characters[character_name]
 	
-	# Create new character data container
+	# Start loading
+	var character_data = _new_character_data(character_name)
+	character_data.load_character_async(def_path)
+	
+	return character_data
+
+func _new_character_data(character_name: String):
+	"""Create a character data container wired to the manager's signals"""
 	var character_data = preload("res://scripts/mugen/mugen_character_data.gd").new()
 	
 	# Connect signals with proper parameter mapping
@@ -41,10 +48,7 @@ func load_character(def_path: String):
 	character_data.loading_complete.connect(func(success: bool): _on_character_loading_complete(captured_name, captured_data, success))
 	character_data.loading_error.connect(func(error: String): _on_character_loading_error(captured_name, error))
 	
-	# Start loading
 	currently_loading = character_name
-	character_data.load_character_async(def_path)
-	
 	return character_data
 
 func load_character_from_select(character_select_data: Dictionary):
@@ -130,6 +134,38 @@ func load_characters_from_select_def(select_parser: SelectDefParser):
 		if character.type == "character":  # Skip random slots
 			load_character_from_select(character)
 
+func load_roster_manifest(manifest_path: String) -> Array:
+	"""Read the roster manifest compiled by mugen_roster.py (one file read, no DEF parsing)"""
+	var file = FileAccess.open(manifest_path, FileAccess.READ)
+	if not file:
+		push_error("Failed to open roster manifest: " + manifest_path)
+		return []
+
+	var manifest = JSON.parse_string(file.get_as_text())
+	file.close()
+	if typeof(manifest) != TYPE_DICTIONARY or not manifest.has("characters"):
+		push_error("Invalid roster manifest: " + manifest_path)
+		return []
+
+	return manifest.characters
+
+func load_character_from_manifest(entry: Dictionary, root_path: String = ""):
+	"""Load a character from its roster manifest entry; paths are relative to the project root"""
+	var def_path = entry.def.path if root_path.is_empty() else root_path.path_join(entry.def.path)
+	var character_name = def_path.get_file().get_basename()
+	if loaded_characters.has(character_name):
+		return loaded_characters[character_name]
+	
+	var character_data = _new_character_data(character_name)
+	character_data.load_from_manifest_async(entry, root_path)
+	return character_data
+
+func load_characters_from_manifest(manifest_path: String, root_path: String = ""):
+	"""Load all valid characters listed in a roster manifest"""
+	for character in load_roster_manifest(manifest_path):
+		if character.get("valid", false):
+			load_character_from_manifest(character, root_path)
+
 func preload_common_characters():
 	"""Preload commonly used characters (can be customized)"""
 	var common_chars = [
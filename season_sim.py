@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Tournament season simulator
+Reproduces the bracket, fight and prize rules of scripts/management/tournament_system.gd together
+with the fight bookkeeping of fighter_manager.gd (record_fight_result, levels, condition decay)
+and plays whole seasons of templated tournaments many times over in a process pool.
+Double elimination events stall after round 1 as in the GDScript; --full-double-elimination
+plays them to a winner instead.
+Seasons are seeded independently and only running totals are kept, so memory does not grow
+with the number of seasons and results do not depend on the worker count.
+Run: python season_sim.py [--seasons N] [--fighters N] [--workers N] [--seed S] [--full-double-elimination]
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SINGLE_ELIMINATION, DOUBLE_ELIMINATION, ROUND_ROBIN = 0, 1, 2
+LOCAL, REGIONAL, NATIONAL, INTERNATIONAL, EXHIBITION = 0, 1, 2, 3, 4
+
+# TournamentSystem._setup_tournament_templates
+TEMPLATES = {
+    "local_weekly": {"type": SINGLE_ELIMINATION, "tier": LOCAL, "max_participants": 8, "entry_fee": 25},
+    "regional_monthly": {"type": DOUBLE_ELIMINATION, "tier": REGIONAL, "max_participants": 16, "entry_fee": 100},
+    "national_quarterly": {"type": SINGLE_ELIMINATION, "tier": NATIONAL, "max_participants": 32, "entry_fee": 500},
+}
+# (template, every N weeks, first week); events in the same week run in this order
+DEFAULT_SCHEDULE = (("local_weekly", 1, 0), ("regional_monthly", 4, 3), ("national_quarterly", 13, 12))
+SEASON_WEEKS = 52
+HOURS_BETWEEN_WEEKS = 24 * 7
+
+PRIZE_POOL_MULTIPLIER = 8.0
+FATIGUE_RECOVERY_RATE = 0.1  # per hour
+MOTIVATION_DECAY_RATE = 0.05  # per hour (applied by _process_hourly_updates)
+LEVEL_THRESHOLDS = (100, 500, 1500, 3500, 7000)  # ROOKIE .. LEGEND
+LEVEL_NAMES = ("Rookie", "Amateur", "Semi-Pro", "Professional", "Champion", "Legend")
+ATTRIBUTES = ("strength", "speed", "technique", "defense", "stamina", "mental")
+# Seasons per task; fixed so the split (and float summation order) never depends on --workers
+CHUNK_SEASONS = 64
+
+
+def _clamp(value, low, high):
+    return low if value < low else high if value > high else value
+
+
+def _calculate_level(experience):
+    level = 0
+    while level < len(LEVEL_THRESHOLDS) and experience >= LEVEL_THRESHOLDS[level]:
+        level += 1
+    return level
+
+
+class Fighter:
+    """The FighterData fields the tournament rules read or write"""
+    __slots__ = ('attributes', 'health', 'motivation', 'fatigue', 'confidence', 'level', 'experience')
+
+    def __init__(self, attributes, health=100.0, motivation=80.0, fatigue=0.0, confidence=50.0,
+                 level=0, experience=0):
+        self.attributes = list(attributes)
+        self.health = health
+        self.motivation = motivation
+        self.fatigue = fatigue
+        self.confidence = confidence
+        self.level = level
+        self.experience = experience
+
+    def copy(self):
+        return Fighter(self.attributes, self.health, self.motivation, self.fatigue, self.confidence,
+                       self.level, self.experience)
+
+    def overall_rating(self):
+        """FighterData.get_overall_rating"""
+        return int(sum(self.attributes) / len(self.attributes))
+
+    def fight_rating(self):
+        """TournamentSystem._calculate_fight_rating"""
+        condition_modifier = (self.health / 100.0 + self.motivation / 100.0
+                              + (100.0 - self.fatigue) / 100.0 + self.confidence / 100.0) / 4.0
+        return self.overall_rating() * condition_modifier
+
+    def add_experience(self, amount, rng):
+        """FighterManager.add_experience with _apply_level_up_bonuses"""
+        self.experience += amount
+        new_level = _calculate_level(self.experience)
+        if new_level > self.level:
+            self.level = new_level
+            for _ in range(int(rng.uniform(2, 5))):
+                index = rng.randrange(len(self.attributes))
+                self.attributes[index] = _clamp(self.attributes[index] + 1, 0, 100)
+            self.motivation = _clamp(self.motivation + rng.uniform(5, 15), 0.0, 100.0)
+            self.confidence = _clamp(self.confidence + rng.uniform(3, 8), 0.0, 100.0)
+
+    def record_fight_result(self, won, rng):
+        """FighterManager.record_fight_result (career stats are kept by SeasonStats)"""
+        if won:
+            self.confidence = _clamp(self.confidence + rng.uniform(5, 15), 0.0, 100.0)
+            self.add_experience(int(rng.uniform(50, 100)), rng)
+        else:
+            self.confidence = _clamp(self.confidence + rng.uniform(-10, -5), 0.0, 100.0)
+            self.add_experience(int(rng.uniform(20, 50)), rng)
+        self.fatigue = _clamp(self.fatigue + rng.uniform(10, 25), 0.0, 100.0)
+        self.motivation = _clamp(self.motivation + rng.uniform(-5, -2), 0.0, 100.0)
+
+    def rest(self, hours):
+        """FighterManager._process_fighter_condition_updates for `hours` hours without training"""
+        self.fatigue = max(0.0, self.fatigue - FATIGUE_RECOVERY_RATE * hours)
+        self.motivation = max(0.0, self.motivation - MOTIVATION_DECAY_RATE * hours)
+
+
+def generate_roster(count, seed=0):
+    """Fighters as FighterManager.create_fighter makes them"""
+    rng = random.Random(f"{seed}:roster")
+    roster = []
+    for _ in range(count):
+        attributes = [rng.uniform(20, 40) for _ in ATTRIBUTES]
+        roster.append(Fighter(attributes, motivation=rng.uniform(70, 90), fatigue=rng.uniform(0, 20)))
+    return roster
+
+
+def simulate_fight(fighter_a, fighter_b, rng):
+    """TournamentSystem._simulate_fight; returns (a won, ko)"""
+    rating_a = fighter_a.fight_rating()
+    rating_b = fighter_b.fight_rating()
+    random_factor = rng.uniform(0.8, 1.2)
+    rating_a *= random_factor
+    rating_b *= (2.0 - random_factor)
+    ko_chance = _clamp(abs(rating_a - rating_b) / 50.0, 0.1, 0.7)
+    return rating_a > rating_b, rng.random() < ko_chance
+
+
+def _play_match(roster, a, b, rng, stats):
+    a_won, ko = simulate_fight(roster[a], roster[b], rng)
+    upset = roster[a].overall_rating() < roster[b].overall_rating() if a_won \
+        else roster[b].overall_rating() < roster[a].overall_rating()
+    roster[a].record_fight_result(a_won, rng)
+    roster[b].record_fight_result(not a_won, rng)
+    stats.record_match(a, b, a_won, ko, upset)
+    return a if a_won else b
+
+
+def run_tournament(roster, participants, tournament_type, rng, stats, full_double_elimination=False):
+    """Play one bracket; returns the winner index or None
+
+    Elimination mirrors _generate_single_elimination_bracket/_create_next_elimination_round:
+    an odd fighter out of a round gets no match and drops out, and a round without matches
+    leaves the tournament without a winner. Double elimination uses the single elimination
+    bracket, but _advance_tournament_round only creates later rounds for single elimination,
+    so it stalls after round 1 without a winner unless that round was the final.
+    `full_double_elimination` plays it to a winner instead, a deliberate deviation from the GDScript.
+    """
+    if tournament_type == ROUND_ROBIN:
+        wins = dict.fromkeys(participants, 0)
+        for i in range(len(participants)):
+            for j in range(i + 1, len(participants)):
+                wins[_play_match(roster, participants[i], participants[j], rng, stats)] += 1
+        # Strict > keeps the earliest registered fighter on ties
+        winner, best = None, -1
+        for index in participants:
+            if wins[index] > best:
+                winner, best = index, wins[index]
+        return winner
+
+    fighters = list(participants)
+    rng.shuffle(fighters)
+    total_rounds = math.ceil(math.log2(len(fighters))) if len(fighters) > 1 else 0
+    winners = None
+    for round_number in range(total_rounds):
+        if round_number and tournament_type == DOUBLE_ELIMINATION and not full_double_elimination:
+            return None
+        winners = [_play_match(roster, fighters[i], fighters[i + 1], rng, stats)
+                   for i in range(0, len(fighters) - 1, 2)]
+        if not winners:
+            return None
+        fighters = winners
+    return winners[0] if winners else None
+
+
+class SeasonStats:
+    """Running totals over any number of seasons; chunks combine with merge()"""
+
+    def __init__(self, fighter_count, templates):
+        self.fighter_count = fighter_count
+        self.seasons = 0
+        self.fights = [0] * fighter_count
+        self.wins = [0] * fighter_count
+        self.ko_wins = [0] * fighter_count
+        self.prize_money = [0] * fighter_count
+        self.prize_money_sq = [0] * fighter_count  # Sum of squared per-season earnings
+        self.season_champions = [0] * fighter_count  # Seasons finished as top earner
+        self.final_levels = [0] * len(LEVEL_NAMES)
+        self.titles = {name: [0] * fighter_count for name in templates}
+        self.tournaments = dict.fromkeys(templates, 0)
+        self.no_winner = dict.fromkeys(templates, 0)
+        self.favourite_wins = dict.fromkeys(templates, 0)  # Winner had the best fight rating at entry
+        self.matches = 0
+        self.kos = 0
+        self.upsets = 0  # Lower overall rating beat higher
+
+    def record_match(self, a, b, a_won, ko, upset):
+        winner = a if a_won else b
+        self.fights[a] += 1
+        self.fights[b] += 1
+        self.wins[winner] += 1
+        self.matches += 1
+        if ko:
+            self.ko_wins[winner] += 1
+            self.kos += 1
+        if upset:
+            self.upsets += 1
+
+    def record_season(self, earnings, roster):
+        self.seasons += 1
+        for index, amount in enumerate(earnings):
+            self.prize_money[index] += amount
+            self.prize_money_sq[index] += amount * amount
+        top = max(earnings)
+        if top > 0:
+            self.season_champions[earnings.index(top)] += 1
+        for fighter in roster:
+            self.final_levels[fighter.level] += 1
+
+    def merge(self, other):
+        self.seasons += other.seasons
+        for name in ('fights', 'wins', 'ko_wins', 'prize_money', 'prize_money_sq', 'season_champions',
+                     'final_levels'):
+            mine = getattr(self, name)
+            for index, value in enumerate(getattr(other, name)):
+                mine[index] += value
+        for name, counts in other.titles.items():
+            for index, value in enumerate(counts):
+                self.titles[name][index] += value
+        for name in ('tournaments', 'no_winner', 'favourite_wins'):
+            mine = getattr(self, name)
+            for key, value in getattr(other, name).items():
+                mine[key] += value
+        self.matches += other.matches
+        self.kos += other.kos
+        self.upsets += other.upsets
+        return self
+
+    def prize_money_mean_std(self, index):
+        if not self.seasons:
+            return 0.0, 0.0
+        mean = self.prize_money[index] / self.seasons
+        variance = max(0.0, self.prize_money_sq[index] / self.seasons - mean * mean)
+        return mean, math.sqrt(variance)
+
+    def report(self, top=10):
+        lines = [f"Seasons: {self.seasons:,}  matches: {self.matches:,}"]
+        if self.matches:
+            lines.append(f"KO rate: {self.kos / self.matches:.3f}  upset rate: {self.upsets / self.matches:.3f}")
+        for name, count in self.tournaments.items():
+            if count:
+                lines.append(f"{name}: {count:,} played, favourite won {self.favourite_wins[name] / count:.3f}"
+                             + (f", {self.no_winner[name]:,} without a winner" if self.no_winner[name] else ""))
+        levels = sum(self.final_levels)
+        if levels:
+            lines.append("Level at season end: " + ", ".join(
+                f"{name} {count / levels:.3f}" for name, count in zip(LEVEL_NAMES, self.final_levels) if count))
+        ranked = sorted(range(self.fighter_count), key=lambda i: -self.prize_money[i])[:top]
+        lines.append(f"{'fighter':>8} {'win%':>6} {'ko%':>6} {'prize/season':>13} {'std':>9} {'champ%':>7} titles")
+        for index in ranked:
+            mean, std = self.prize_money_mean_std(index)
+            fights = self.fights[index] or 1
+            titles = "/".join(str(self.titles[name][index]) for name in self.titles)
+            lines.append(f"{index:>8} {self.wins[index] / fights:>6.3f} {self.ko_wins[index] / fights:>6.3f} "
+                         f"{mean:>13,.0f} {std:>9,.0f} {self.season_champions[index] / max(self.seasons, 1):>7.3f} "
+                         f"{titles}")
+        return "\n".join(lines)
+
+
+def simulate_season(roster, season, seed, schedule=DEFAULT_SCHEDULE, weeks=SEASON_WEEKS,
+                    templates=TEMPLATES, stats=None, full_double_elimination=False):
+    """Play one season on a copy of `roster`; adds it to `stats` (created if None) and returns it"""
+    rng = random.Random(f"{seed}:{season}")
+    roster = [fighter.copy() for fighter in roster]
+    stats = stats or SeasonStats(len(roster), templates)
+    earnings = [0] * len(roster)
+    everyone = range(len(roster))
+
+    for week in range(weeks):
+        if week:
+            for fighter in roster:
+                fighter.rest(HOURS_BETWEEN_WEEKS)
+        for name, every, first in schedule:
+            if week < first or (week - first) % every:
+                continue
+            template = templates[name]
+            size = min(template['max_participants'], len(roster))
+            if size < 2:
+                continue  # _cancel_tournament: insufficient participants
+            participants = rng.sample(everyone, size)
+            fight_ratings = [roster[index].fight_rating() for index in participants]
+            winner = run_tournament(roster, participants, template['type'], rng, stats, full_double_elimination)
+            stats.tournaments[name] += 1
+            if winner is None:
+                stats.no_winner[name] += 1
+                continue
+            stats.titles[name][winner] += 1
+            if fight_ratings[participants.index(winner)] == max(fight_ratings):
+                stats.favourite_wins[name] += 1
+            # _calculate_prize_structure + _distribute_prizes: winner takes all
+            earnings[winner] += int(template['entry_fee'] * size * PRIZE_POOL_MULTIPLIER)
+
+    stats.record_season(earnings, roster)
+    return stats
+
+
+def _season_chunk_worker(job):
+    roster, first, count, seed, schedule, weeks, full_double_elimination = job
+    stats = SeasonStats(len(roster), TEMPLATES)
+    for season in range(first, first + count):
+        simulate_season(roster, season, seed, schedule, weeks, stats=stats,
+                        full_double_elimination=full_double_elimination)
+    return stats
+
+
+def simulate_seasons(roster, seasons, seed=0, schedule=DEFAULT_SCHEDULE, weeks=SEASON_WEEKS,
+                     max_workers=None, verbose=True, full_double_elimination=False):
+    """Simulate `seasons` independent seasons from the same starting roster
+
+    Season i always uses the same random stream, and chunks are merged in season order,
+    so the totals are identical for any worker count.
+    """
+    start = time.perf_counter()
+    jobs = [(roster, first, min(CHUNK_SEASONS, seasons - first), seed, schedule, weeks, full_double_elimination)
+            for first in range(0, seasons, CHUNK_SEASONS)]
+    total = SeasonStats(len(roster), TEMPLATES)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for stats in pool.map(_season_chunk_worker, jobs):
+                total.merge(stats)
+    else:
+        for job in jobs:
+            total.merge(_season_chunk_worker(job))
+    if verbose:
+        elapsed = time.perf_counter() - start
+        print(f"⏱️ {seasons:,} seasons / {total.matches:,} matches in {elapsed:.2f}s "
+              f"({seasons / elapsed:,.1f} seasons/s, {workers} workers)")
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Monte Carlo TournamentSystem seasons")
+    arg_parser.add_argument('--seasons', type=int, default=1000)
+    arg_parser.add_argument('--fighters', type=int, default=64)
+    arg_parser.add_argument('--weeks', type=int, default=SEASON_WEEKS)
+    arg_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--top', type=int, default=10, help="Fighters to list, by prize money")
+    arg_parser.add_argument('--full-double-elimination', action='store_true',
+                            help="Play double elimination events to a winner (the GDScript stalls after round 1)")
+    args = arg_parser.parse_args()
+
+    results = simulate_seasons(generate_roster(args.fighters, args.seed), args.seasons, args.seed,
+                               weeks=args.weeks, max_workers=args.workers,
+                               full_double_elimination=args.full_double_elimination)
+    print(results.report(args.top))
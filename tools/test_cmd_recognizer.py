@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the CMD command recognizer (mugen_cmd.py)
+Feeds scripted input sequences through InputBuffer/CommandRecognizer and checks which
+commands complete: motions, command.time limits, charge (~30$B), holds (/) and strict (>) steps.
+Run: python tools/test_cmd_recognizer.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mugen_cmd import CMDParser, CommandRecognizer, InputBuffer, compile_commands, input_mask
+
+COMMANDS = """
+[Command]
+name = "QCF_x"
+command = ~D, DF, F, x
+time = 15
+
+[Command]
+name = "charge_x"
+command = ~30$B, F, x
+time = 10
+
+[Command]
+name = "hold_fwd_x"
+command = /F+x
+time = 1
+
+[Command]
+name = "a_then_b"
+command = a, >b
+time = 15
+
+[Command]
+name = "xy"
+command = x+y
+time = 1
+buffer.time = 3
+"""
+
+# (description, [(symbols held, ticks)], command, should complete)
+SEQUENCES = [
+    ("quarter circle", [((), 2), (('D',), 3), (('DF',), 3), (('F',), 2), (('F', 'x'), 1)], 'QCF_x', True),
+    ("rolled quarter circle", [((), 2), (('D',), 2), (('DF',), 1), (('F',), 1), (('x',), 1)], 'QCF_x', True),
+    ("quarter circle too slow", [((), 2), (('D',), 3), (('DF',), 20), (('F',), 2), (('F', 'x'), 1)], 'QCF_x', False),
+    ("quarter circle without down", [((), 2), (('DF',), 3), (('F',), 2), (('F', 'x'), 1)], 'QCF_x', False),
+    ("charged back, forward", [((), 1), (('B',), 40), (('F',), 2), (('F', 'x'), 1)], 'charge_x', True),
+    ("down-back charges back too", [((), 1), (('DB',), 40), (('F',), 2), (('F', 'x'), 1)], 'charge_x', True),
+    ("short charge", [((), 1), (('B',), 10), (('F',), 2), (('F', 'x'), 1)], 'charge_x', False),
+    ("x while holding forward", [((), 1), (('F',), 5), (('F', 'x'), 1)], 'hold_fwd_x', True),
+    ("x without forward", [((), 1), (('x',), 1)], 'hold_fwd_x', False),
+    ("a then b", [((), 1), (('a',), 2), (('a', 'b'), 1)], 'a_then_b', True),
+    # '>' allows no other change in between, including a release
+    ("a, release, then b", [((), 1), (('a',), 2), ((), 2), (('b',), 1)], 'a_then_b', False),
+    ("a, x, then b", [((), 1), (('a',), 2), (('a', 'x'), 2), (('a', 'x', 'b'), 1)], 'a_then_b', False),
+    ("x and y together", [((), 1), (('x', 'y'), 1)], 'xy', True),
+    ("x and y apart", [((), 1), (('x',), 1), ((), 1), (('y',), 1)], 'xy', False),
+]
+
+
+def command_set():
+    parser = CMDParser()
+    parser.parse_text(COMMANDS)
+    return compile_commands(parser)
+
+
+def run(commands, frames):
+    """Push `frames` tick by tick; returns (buffer, recognizer, {command: completion ticks})"""
+    buffer = InputBuffer()
+    recognizer = CommandRecognizer(commands)
+    completed = {}
+    for symbols, ticks in frames:
+        held = input_mask(*symbols)
+        for _ in range(ticks):
+            buffer.push(held)
+            for name in recognizer.update(buffer):
+                completed.setdefault(name, []).append(buffer.tick)
+    return buffer, recognizer, completed
+
+
+def test_sequences():
+    """Every scripted sequence completes its command or not, as expected"""
+    print("🧪 Testing command recognition...")
+    commands = command_set()
+    failures = []
+    for description, frames, name, expected in SEQUENCES:
+        _, _, completed = run(commands, frames)
+        if (name in completed) != expected:
+            failures.append(description)
+            print(f"  ❌ FAIL {description}: {name} {'not ' if expected else ''}recognized")
+    print(f"Sequences: {'✅ PASS' if not failures else '❌ FAIL'} ({len(SEQUENCES) - len(failures)}/{len(SEQUENCES)})")
+    assert not failures
+
+
+def test_buffer_time():
+    """A completed command stays active for buffer.time ticks"""
+    buffer, recognizer, completed = run(command_set(), [((), 1), (('x', 'y'), 1), ((), 4)])
+    tick = completed['xy'][0]
+    active = [recognizer.is_active('xy', t) for t in range(tick, tick + 4)]
+    ok = active == [True, True, True, False] and 'xy' not in recognizer.active_commands(buffer.tick)
+    print(f"Buffer time: {'✅ PASS' if ok else '❌ FAIL'} ({active})")
+    assert ok
+
+
+def test_independent_players():
+    """Recognizers sharing one CommandSet keep separate partial matches"""
+    commands = command_set()
+    first, second = InputBuffer(), InputBuffer()
+    first_recognizer, second_recognizer = CommandRecognizer(commands), CommandRecognizer(commands)
+    results = []
+    for symbols in [(), ('D',), ('DF',), ('F',), ('F', 'x')]:
+        first.push(input_mask(*symbols))
+        second.push(input_mask('x') if symbols == ('F', 'x') else 0)
+        results.append(('QCF_x' in first_recognizer.update(first), 'QCF_x' in second_recognizer.update(second)))
+    ok = results[-1] == (True, False)
+    print(f"Independent players: {'✅ PASS' if ok else '❌ FAIL'}")
+    assert ok
+
+
+if __name__ == "__main__":
+    failed = 0
+    for check in (test_sequences, test_buffer_time, test_independent_players):
+        try:
+            check()
+        except AssertionError:
+            failed += 1
+    print(f"\n📋 Command recognizer checks complete{f': {failed} failed' if failed else ''}")
+    if failed:
+        raise SystemExit(1)
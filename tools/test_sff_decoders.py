@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Round-trip regression checks for the SFF sprite decoders (mugen_prototype.py)
+Writes small synthetic SFF v1 (PCX) and v2 (raw, RLE8, PNG8, PNG32) files, then checks that every
+decode path gives back the exact pixels that were encoded.
+Run: python tools/test_sff_decoders.py
+"""
+
+import io
+import os
+import struct
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from mugen_prototype import SFFParser
+
+SIGNATURE = b'ElecbyteSpr\0'
+# (group, number, width, height, axis x, axis y)
+SPRITES = [
+    (0, 0, 31, 40, 15, 40),
+    (0, 1, 8, 8, -4, -20),  # Negative axes are signed in both versions
+    (5, 2, 64, 17, 32, 17),
+    (9000, 0, 25, 25, 0, 0),
+]
+
+
+def sample_pixels(width, height, seed):
+    """Indices with runs, lone pixels and values that look like RLE control bytes"""
+    return bytes(((x // 5) * 37 + y * 11 + seed) % 256 if (x + y) % 9 else 0xC5
+                 for y in range(height) for x in range(width))
+
+
+def sample_palette(seed):
+    return bytes((i * 3 + seed) % 256 for i in range(768))
+
+
+def encode_pcx_rle(pixels, width, height):
+    """PCX RLE: 11nnnnnn repeats the next byte n times; bytes >= 0xC0 always go in a run"""
+    out = bytearray()
+    for y in range(height):
+        row = pixels[y * width:(y + 1) * width]
+        x = 0
+        while x < width:
+            value, count = row[x], 1
+            while x + count < width and row[x + count] == value and count < 63:
+                count += 1
+            if count > 1 or value >= 0xC0:
+                out += bytes((0xC0 | count, value))
+            else:
+                out.append(value)
+            x += count
+    return bytes(out)
+
+
+def encode_rle8(pixels):
+    """SFF v2 RLE8: 01nnnnnn repeats the next byte n times; other bytes are literal pixels"""
+    out = bytearray()
+    i = 0
+    while i < len(pixels):
+        value, count = pixels[i], 1
+        while i + count < len(pixels) and pixels[i + count] == value and count < 63:
+            count += 1
+        if count > 1 or value & 0xC0 == 0x40:
+            out += bytes((0x40 | count, value))
+        else:
+            out.append(value)
+        i += count
+    return bytes(out)
+
+
+def png_bytes(img):
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def write_sff_v1(path, palettes):
+    """SFF v1 with PCX sprites; returns {key: (width, height, pixels, axis)}"""
+    palette_offset = 40
+    header_offset = palette_offset + 768 * len(palettes)
+    data_offset = header_offset + 32 * len(SPRITES)
+    headers, blobs, expected = bytearray(), bytearray(), {}
+    for i, (group, number, width, height, axis_x, axis_y) in enumerate(SPRITES):
+        pixels = sample_pixels(width, height, i)
+        pcx = bytearray(128)
+        pcx[0:4] = bytes((10, 5, 1, 8))  # Manufacturer, version, RLE encoding, 8 bpp
+        struct.pack_into('<HHHH', pcx, 4, 0, 0, width - 1, height - 1)
+        pcx[65] = 1  # One plane
+        struct.pack_into('<H', pcx, 66, width)
+        body = bytes(pcx) + encode_pcx_rle(pixels, width, height) + palettes[0]
+        headers += struct.pack('<IIhhHHHB', data_offset + len(blobs), len(body), axis_x, axis_y,
+                               group, number, 0, 0).ljust(32, b'\0')
+        blobs += body
+        expected[(group, number)] = (width, height, pixels, [axis_x, axis_y])
+    header = SIGNATURE + bytes((0, 1, 0, 1)) + bytes(4)
+    header += struct.pack('<IIIII', palette_offset, len(palettes), len(SPRITES), header_offset, 32)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(palette_offset, b'\0') + b''.join(palettes) + headers + blobs)
+    return expected
+
+
+def write_sff_v2(path, palettes, formats):
+    """SFF v2 with one sprite per format in `formats`; returns {key: (width, height, pixels or RGBA image, axis)}
+
+    An int in `palettes` is a linked palette slot pointing at that index.
+    Sprite i uses palette slot i % len(palettes).
+    """
+    ldata, palette_headers = bytearray(), bytearray()
+    for i, palette in enumerate(palettes):
+        if isinstance(palette, int):
+            palette_headers += struct.pack('<HHHHII', 1, i, 256, palette, 0, 0)
+            continue
+        colors = b''.join(palette[c * 3:c * 3 + 3] + b'\0' for c in range(256))
+        palette_headers += struct.pack('<HHHHII', 1, i, 256, 0, len(ldata), len(colors))
+        ldata += colors
+
+    sprite_headers, expected = bytearray(), {}
+    for i, fmt in enumerate(formats):
+        group, number, width, height, axis_x, axis_y = SPRITES[i % len(SPRITES)]
+        group += 100 * (i // len(SPRITES))
+        pixels = sample_pixels(width, height, i)
+        if fmt == 0:
+            body = pixels
+        elif fmt == 2:
+            body = struct.pack('<I', len(pixels)) + encode_rle8(pixels)
+        elif fmt == 10:
+            img = Image.frombytes('P', (width, height), pixels)
+            img.putpalette(next(p for p in palettes if not isinstance(p, int)))
+            body = struct.pack('<I', len(pixels)) + png_bytes(img)
+        else:  # 12: PNG32, direct color
+            rgba = b''.join(bytes((p, 255 - p, p * 7 % 256, 255 if p else 0)) for p in pixels)
+            img = Image.frombytes('RGBA', (width, height), rgba)
+            body = struct.pack('<I', width * height * 4) + png_bytes(img)
+            pixels = img
+        palette_index = i % len(palettes)
+        sprite_headers += struct.pack('<HHHHhhHBBIIHH', group, number, width, height, axis_x, axis_y, 0, fmt, 8,
+                                      len(ldata), len(body), palette_index, 0)
+        ldata += body
+        expected[(group, number)] = (width, height, pixels, [axis_x, axis_y])
+
+    sprite_offset = 512
+    palette_offset = sprite_offset + len(sprite_headers)
+    data_offset = palette_offset + len(palette_headers)
+    header = SIGNATURE + bytes((0, 1, 0, 2)) + bytes(4) + bytes(16)
+    header += struct.pack('<IIIIIIII', sprite_offset, len(formats), palette_offset, len(palettes),
+                          data_offset, len(ldata), data_offset + len(ldata), 0)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(sprite_offset, b'\0') + sprite_headers + palette_headers + ldata)
+    return expected
+
+
+def _report(name, failures):
+    print(f"{name}: {'✅ PASS' if not failures else '❌ FAIL'}")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    assert not failures
+
+
+def check_round_trip(path, expected):
+    """Every decode path returns the encoded pixels; returns a list of failure messages"""
+    failures = []
+    parser = SFFParser(verbose=False)
+    if not parser.parse_file(path):
+        return [f"{os.path.basename(path)} did not parse"]
+    if set(parser.sprites) != set(expected):
+        failures.append(f"sprite keys {sorted(parser.sprites)} != {sorted(expected)}")
+
+    keys = [key for key in expected if key in parser.sprites]
+    batch = parser.extract_sprites(path, keys)
+    threaded = parser.decode_many(keys, max_workers=4, filepath=path)
+    streamed = dict(parser.iter_sprites(path))
+    for key in keys:
+        width, height, pixels, axis = expected[key]
+        sprite = parser.sprites[key]
+        if list(sprite.size) != [width, height] or list(sprite.offset) != axis:
+            failures.append(f"{key}: size {sprite.size} axis {sprite.offset}, expected {[width, height]} {axis}")
+        single = parser.extract_sprite_image(path, *key)
+        if isinstance(pixels, Image.Image):
+            if parser.extract_sprite_pixels(path, *key) is not None:
+                failures.append(f"{key}: direct-color sprite returned palette indices")
+            wanted = pixels.tobytes()
+        else:
+            decoded = parser.extract_sprite_pixels(path, *key)
+            if decoded != (width, height, pixels):
+                failures.append(f"{key}: decoded pixels differ")
+            wanted = parser._colorize(sprite, key[0], key[1], width, height, pixels).tobytes()
+        for name, img in (('extract_sprite_image', single), ('extract_sprites', batch[key]),
+                          ('decode_many', threaded[key]), ('iter_sprites', streamed[key])):
+            if img is None or img.size != (width, height) or img.tobytes() != wanted:
+                failures.append(f"{key}: {name} image differs")
+    return failures
+
+
+def test_rle8():
+    """decode_rle8 on hand-written runs, literals and control-looking values"""
+    parser = SFFParser(verbose=False)
+    cases = [
+        (bytes((0x45, 7)), 5, bytes((7,) * 5)),
+        (bytes((1, 2, 3)), 3, bytes((1, 2, 3))),
+        (bytes((0x42, 0x41, 0xC8, 0x03, 0x3F)), 5, bytes((0x41, 0x41, 0xC8, 0x03, 0x3F))),
+        (bytes((0x7F, 9)), 63, bytes((9,) * 63)),
+        (bytes((0x43, 1)), 2, bytes((1, 1))),  # Runs are clipped to the sprite
+    ]
+    failures = [f"{data.hex()} -> {parser.decode_rle8(data, size, 1).hex()}"
+                for data, size, wanted in cases if parser.decode_rle8(data, size, 1) != wanted]
+    pixels = sample_pixels(37, 11, 3)
+    if parser.decode_rle8(encode_rle8(pixels), 37, 11) != pixels:
+        failures.append("encoded sample does not round-trip")
+    _report("RLE8", failures)
+
+
+def test_sff_v1():
+    """PCX sprites in an SFF v1 file"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'v1.sff')
+        expected = write_sff_v1(path, [sample_palette(0), sample_palette(1)])
+        _report("SFF v1 PCX", check_round_trip(path, expected))
+
+
+def test_sff_v2():
+    """Raw, RLE8, PNG8 and PNG32 sprites in an SFF v2 file"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'v2.sff')
+        expected = write_sff_v2(path, [sample_palette(0), sample_palette(1)], [0, 2, 10, 12, 2, 10, 0, 2])
+        _report("SFF v2 raw/RLE8/PNG8/PNG32", check_round_trip(path, expected))
+
+
+def test_transparency():
+    """Palette index 0 colorizes as fully transparent"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'v2.sff')
+        write_sff_v2(path, [sample_palette(0)], [0])
+        parser = SFFParser(verbose=False)
+        parser.parse_file(path)
+        group, number = SPRITES[0][:2]
+        width, height, pixels = parser.extract_sprite_pixels(path, group, number)
+        alpha = parser.extract_sprite_image(path, group, number).getchannel('A').tobytes()
+        failures = [] if all((a == 0) == (p == 0) for p, a in zip(pixels, alpha)) else ["alpha does not follow index 0"]
+        _report("Transparency", failures)
+
+
+def test_linked_palettes():
+    """Linked v2 palettes keep their header slot, so later slots are not shifted down"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'v2.sff')
+        palettes = [sample_palette(0), 0, sample_palette(2), 7]  # Slot 3 links out of range
+        expected = write_sff_v2(path, palettes, [0, 0, 0])
+        parser = SFFParser(verbose=False)
+        parser.parse_file(path)
+        failures = []
+        if len(parser.palette_list.palettes) != len(palettes):
+            failures.append(f"{len(parser.palette_list.palettes)} palettes loaded, expected {len(palettes)}")
+        elif parser.palette_list.get_palette(1) != parser.palette_list.get_palette(0):
+            failures.append("linked slot 1 does not match slot 0")
+        for i, key in enumerate(expected):
+            width, height, pixels, _ = expected[key]
+            source = palettes[i]
+            source = palettes[source] if isinstance(source, int) else source
+            wanted = b''.join(source[p * 3:p * 3 + 3] + bytes((255 if p else 0,)) for p in pixels)
+            img = parser.extract_sprite_image(path, *key)
+            if img is None or img.tobytes() != wanted:
+                failures.append(f"{key}: not drawn in palette slot {i}")
+        _report("Linked palettes", failures)
+
+
+def test_unsupported_format():
+    """An unsupported v2 format decodes to None in batch paths, a placeholder only on request"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'v2.sff')
+        write_sff_v2(path, [sample_palette(0)], [0, 2])
+        with open(path, 'r+b') as f:
+            f.seek(512 + 28 + 14)  # Second sprite's format byte
+            f.write(bytes((4,)))  # LZ5
+        parser = SFFParser(verbose=False)
+        parser.parse_file(path)
+        key = SPRITES[1][:2]
+        failures = []
+        if parser.extract_sprites(path, [key])[key] is not None:
+            failures.append("extract_sprites returned an image")
+        if parser.decode_many([key], filepath=path)[key] is not None:
+            failures.append("decode_many returned an image")
+        if parser.extract_sprite_image(path, *key, placeholder=False) is not None:
+            failures.append("extract_sprite_image(placeholder=False) returned an image")
+        if parser.extract_sprite_image(path, *key) is None:
+            failures.append("extract_sprite_image gave no placeholder")
+        _report("Unsupported format", failures)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for check in (test_rle8, test_sff_v1, test_sff_v2, test_transparency, test_linked_palettes,
+                  test_unsupported_format):
+        try:
+            check()
+        except AssertionError:
+            failed += 1
+    print(f"\n📋 SFF decoder checks complete{f': {failed} failed' if failed else ''}")
+    if failed:
+        raise SystemExit(1)
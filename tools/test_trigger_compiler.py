@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the CNS trigger compiler (mugen_trigger.py)
+Evaluates known expressions against a fixed FighterState and checks syntax errors are raised.
+Run: python tools/test_trigger_compiler.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mugen_trigger import FighterState, TriggerSyntaxError, compile_conditions, compile_trigger, fold, parse_trigger
+
+# (expression, expected value) against sample_state()
+EXPRESSIONS = [
+    # Arithmetic: integer division truncates, bottom (division by zero) is 0
+    ('1 + 2 * 3', 7),
+    ('(1 + 2) * 3', 9),
+    ('7 / 2', 3),
+    ('-7 / 2', -3),
+    ('7.0 / 2', 3.5),
+    ('5 / 0', 0),
+    ('-7 % 3', -1),
+    ('2 ** 10', 1024),
+    ('-(3 - 5)', 2),
+    ('~0', -1),
+    ('!0', True),
+    ('6 & 3', 2),
+    ('6 | 3', 7),
+    ('1 ^^ 1', False),
+    ('2 < 3 = 1', True),
+    # Short circuits skip the bottom operand
+    ('1 || (5 / 0)', True),
+    ('0 && (5 / 0)', False),
+    # Trigger names, axis triggers, vars and constants
+    ('time = 8', True),
+    ('life < 300 || power >= 1000 && ctrl', True),
+    ('var(10) = 3', True),
+    ('abs(pos y) < 2 * 5 + 1', True),
+    ('const(size.xscale)', 1.5),
+    ('floor(3.7)', 3),
+    ('ceil(-3.7)', -3),
+    ('ifelse(facing = 1, 10, 20)', 10),
+    # Letters compare case-insensitively
+    ('statetype != A', True),
+    ('statetype = s', True),
+    ('command = "QCF_x"', True),
+    ('command = "DP_x"', False),
+    # Intervals
+    ('p2bodydist x = [0, 40]', True),
+    ('p2bodydist x = [0, 20]', True),
+    ('p2bodydist x = [0, 20)', False),
+    ('p2bodydist x = (0, 20)', False),
+    ('p2bodydist x != [0, 40]', False),
+    # animelem / timemod comparisons (element 3 starts at tick 6)
+    ('animelem = 3', True),
+    ('animelem = 2', False),
+    ('animelem = 2, >= 1', True),
+    ('animelem = 2, > 3', False),
+    ('timemod = 4, 0', True),
+    ('timemod = 3, 0', False),
+    ('hitdefattr = SC, NA, SA', True),
+    ('hitdefattr = A, NA', False),
+    # Redirects; a missing target is bottom
+    ('p2, life < 200', True),
+    ('enemy, life', 0),
+]
+
+SYNTAX_ERRORS = ['time = ', '(1 + 2', 'ifelse(1, 2)', '1 +* 2', 'var(']
+
+
+def sample_state():
+    state = FighterState(time=8, ctrl=1, life=250, power=1200, vel_x=1, p2bodydist_x=20, pos_y=-10,
+                         anim_starts=[0, 3, 6, 10], animtick=6, hitdefattr_state='S')
+    state.hitdefattr_attrs = {'NA'}
+    state.commands.add('QCF_x')
+    state.targets['p2'] = FighterState(life=150)
+    state.vars[10] = 3
+    state.consts['size.xscale'] = 1.5
+    return state
+
+
+def test_expressions():
+    """Every expression evaluates to its expected value"""
+    print("🧪 Testing trigger expression evaluation...")
+    state = sample_state()
+    failures = []
+    for text, expected in EXPRESSIONS:
+        result = compile_trigger(text)(state)
+        if result != expected or isinstance(expected, float) != isinstance(result, float):
+            failures.append(text)
+            print(f"  ❌ FAIL {text!r}: {result!r}, expected {expected!r}")
+    print(f"Expressions: {'✅ PASS' if not failures else '❌ FAIL'} ({len(EXPRESSIONS) - len(failures)}/{len(EXPRESSIONS)})")
+    assert not failures
+
+
+def test_constant_folding():
+    """Constant subexpressions fold to a single constant"""
+    folded = fold(parse_trigger('2 * 3 + 1'))
+    print(f"Constant folding: {'✅ PASS' if folded == ('const', 7) else '❌ FAIL'} ({folded!r})")
+    assert folded == ('const', 7)
+
+
+def test_conditions():
+    """Every triggerall plus any one trigger group"""
+    conditions = compile_conditions(['ctrl'], [['time > 5'], ['life < 100']])
+    cases = [
+        (sample_state(), True),  # triggerall and group 1
+        (FighterState(ctrl=0, time=9), False),  # triggerall fails
+        (FighterState(time=1, life=50), True),  # group 2 only
+        (FighterState(time=1), False),  # no group
+    ]
+    results = [conditions(state) == expected for state, expected in cases]
+    print(f"Trigger groups: {'✅ PASS' if all(results) else '❌ FAIL'}")
+    assert all(results)
+
+
+def test_syntax_errors():
+    """Malformed expressions raise TriggerSyntaxError"""
+    failures = []
+    for text in SYNTAX_ERRORS:
+        try:
+            compile_trigger(text)
+            failures.append(text)
+            print(f"  ❌ FAIL {text!r} compiled")
+        except TriggerSyntaxError:
+            pass
+    print(f"Syntax errors: {'✅ PASS' if not failures else '❌ FAIL'}")
+    assert not failures
+
+
+if __name__ == "__main__":
+    failed = 0
+    for check in (test_expressions, test_constant_folding, test_conditions, test_syntax_errors):
+        try:
+            check()
+        except AssertionError:
+            failed += 1
+    print(f"\n📋 Trigger compiler checks complete{f': {failed} failed' if failed else ''}")
+    if failed:
+        raise SystemExit(1)